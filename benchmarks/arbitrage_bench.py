@@ -0,0 +1,52 @@
+"""
+Arbitrage scanner throughput: random top-of-book updates over a universe of
+symbol/venue cells, with spatial and triangular detection on every update.
+Also checks the incremental results against a full rescan.
+
+    python -m benchmarks.arbitrage_bench [currencies] [venues] [updates]
+"""
+import sys
+import time
+
+import numpy as np
+
+from bot.strategies.arbitrage import ArbitrageScanner
+
+
+def main() -> None:
+    currencies = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    venues = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    updates = int(sys.argv[3]) if len(sys.argv) > 3 else 200_000
+
+    rng = np.random.default_rng(11)
+    names = ["USDT", "BTC", "ETH"] + [f"C{i}" for i in range(currencies - 3)]
+    price = dict(zip(names, np.r_[1.0, rng.uniform(1, 1000, currencies - 1)]))
+    # Every coin trades against the three majors, as on most venues
+    symbols = [f"{base}/{quote}" for b, base in enumerate(names) for quote in names[:min(b, 3)]]
+    mids = np.array([price[s.split("/")[0]] / price[s.split("/")[1]] for s in symbols])
+
+    scanner = ArbitrageScanner(min_profit=0.001)
+    for v in range(venues):
+        for i, symbol in enumerate(symbols):
+            scanner.update(f"venue{v}", symbol, mids[i] * 0.9999, mids[i] * 1.0001, 1.0, 1.0)
+    cells = len(symbols) * venues
+    print(f"{len(symbols)} symbols x {venues} venues = {cells} cells, {scanner.stats()['triangles']} triangles")
+
+    venue_ids = rng.integers(venues, size=updates)
+    symbol_ids = rng.integers(len(symbols), size=updates)
+    noise = 1 + rng.normal(0, 0.001, updates)
+    found = 0
+    started = time.perf_counter()
+    for k in range(updates):
+        mid = mids[symbol_ids[k]] * noise[k]
+        found += len(scanner.update(f"venue{venue_ids[k]}", symbols[symbol_ids[k]], mid * 0.9999, mid * 1.0001, 1.0, 1.0, k))
+    elapsed = time.perf_counter() - started
+    print(f"{updates} updates in {elapsed:.2f}s: {updates / elapsed:,.0f} updates/s, {found} opportunities reported")
+
+    started = time.perf_counter()
+    full = scanner.scan()
+    print(f"full rescan: {time.perf_counter() - started:.3f}s, {len(full)} opportunities currently open")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+DCA backtester throughput: a grid of configs swept over synthetic 1m pairs
+written to CSV, run through the process pool.
+
+    python -m benchmarks.backtest_bench [configs] [pairs] [bars] [processes]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bot.backtest.dca import DCAConfig
+from bot.backtest.runner import run_backtests, summarize
+
+
+def write_pairs(directory: Path, pairs: int, bars: int) -> None:
+    rng = np.random.default_rng(7)
+    for i in range(pairs):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+        wick = np.abs(rng.normal(0, 0.001, (2, bars)))
+        pd.DataFrame({
+            "timestamp": 1_600_000_000_000 + np.arange(bars) * 60_000,
+            "open": close,
+            "high": close * (1 + wick[0]),
+            "low": close * (1 - wick[1]),
+            "close": close,
+            "volume": 1.0,
+        }).to_csv(directory / f"USDT_PAIR{i}.csv", index=False)
+
+
+def main() -> None:
+    n_configs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pairs = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    bars = int(sys.argv[3]) if len(sys.argv) > 3 else 100_000
+    processes = int(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    rng = np.random.default_rng(1)
+    configs = [
+        DCAConfig(
+            base_order_volume=10,
+            safety_order_volume=20,
+            max_safety_orders=int(rng.integers(1, 10)),
+            safety_order_step_percentage=float(rng.uniform(0.5, 3.0)),
+            martingale_volume_coefficient=float(rng.uniform(1.0, 2.0)),
+            martingale_step_coefficient=float(rng.uniform(1.0, 1.5)),
+            take_profit=float(rng.uniform(0.5, 3.0)),
+            stop_loss_percentage=float(rng.uniform(5, 20)),
+        )
+        for _ in range(n_configs)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_pairs(Path(directory), pairs, bars)
+        started = time.perf_counter()
+        results = run_backtests(configs, [directory], processes=processes)
+        elapsed = time.perf_counter() - started
+
+    runs = len(results)
+    print(f"{n_configs} configs x {pairs} pairs x {bars} bars in {elapsed:.2f}s")
+    print(f"  {runs / elapsed:,.1f} runs/s, {runs * bars / elapsed:,.0f} bars/s, {results['deals'].sum():,} deals")
+    print(summarize(results).head(5).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Throughput of the incremental indicator engine behind the RSI/EMA scalping
+strategy, plus a parity check against the `ta` batch computation.
+
+    python -m benchmarks.indicators_bench [pairs] [ticks]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from bot.strategies.scalping import RSIEMAScalpingStrategy
+
+
+def main() -> None:
+    pairs = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    rng = np.random.default_rng(42)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, (ticks, pairs)), axis=0))
+    strategy = RSIEMAScalpingStrategy([f"PAIR{i}" for i in range(pairs)])
+
+    signals = np.empty((ticks, pairs), dtype=np.int8)
+    started = time.perf_counter()
+    for t in range(ticks):
+        signals[t] = strategy.update(close[t])
+    elapsed = time.perf_counter() - started
+    print(f"{pairs} pairs x {ticks} ticks in {elapsed:.3f}s")
+    print(f"  {ticks / elapsed:,.0f} ticks/s, {pairs * ticks / elapsed:,.0f} pair evaluations/s")
+
+    for pair in (0, pairs - 1):
+        batch = strategy.evaluate_batch(pd.DataFrame({"close": close[:, pair]}))
+        mismatches = int((batch.to_numpy() != signals[:, pair]).sum())
+        print(f"  pair {pair}: {mismatches} signal mismatches vs ta batch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Load test for the 3Commas call paths: the async gateway (make_3commas_request)
+and the sync ThreeCommasAPIClient, run against the local mock server at a
+fixed concurrency. Reports throughput, errors and p50/p95/p99 latency.
+
+    python -m benchmarks.load_bench [--target gateway|client|both] [--concurrency 32]
+                                    [--requests 2000] [--path /ver1/bots/1003/show]
+                                    [--latency 0.02] [--jitter 0.01] [--error-rate 0.0]
+                                    [--rate-limit 600/60] [--retry-delay 0.1]
+                                    [--hedge] [--client-limits] [--url URL]
+
+Without --url an in-process mock (benchmarks.mock_3commas) is started on a
+free port with the given latency/error/rate-limit settings. The client-side
+rate limiter is opened up unless --client-limits is passed, so the numbers
+show the HTTP path rather than the configured budgets. --hedge turns on hedged
+GETs; the circuit breaker is reset before each target runs.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.mock_3commas import MockConfig, create_app, parse_rate_limit
+
+# config.py refuses to import without credentials; the mock only checks they are present
+os.environ.setdefault("THREE_COMMAS_API_KEY", "bench-key")
+os.environ.setdefault("THREE_COMMAS_API_SECRET", "bench-secret")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock(config: MockConfig) -> Tuple[str, Callable[[], None]]:
+    """Serve the mock from a background thread; returns its base URL and a stop function"""
+    import uvicorn
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(create_app(config), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="mock-3commas", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError("mock 3Commas server did not start")
+        time.sleep(0.01)
+
+    def stop() -> None:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+    return f"http://127.0.0.1:{port}", stop
+
+
+def open_client_limits() -> None:
+    """Give every rate-limiter bucket a budget far above what the benchmark can send"""
+    from bot.api_client.rate_limiter import rate_limiter
+
+    unlimited = (1e9, 1.0)
+    rate_limiter.key_limit = unlimited
+    rate_limiter.family_limits = {family: unlimited for family in rate_limiter.family_limits}
+    rate_limiter.DEFAULT_FAMILY_LIMIT = unlimited
+    rate_limiter._buckets.clear()
+
+
+def report(name: str, latencies: List[float], errors: int, elapsed: float) -> None:
+    from bot.api_client.circuit_breaker import circuit_breaker
+
+    total = len(latencies) + errors
+    print(f"{name}: {total} requests in {elapsed:.2f}s = {total / elapsed:,.0f} req/s, {errors} errors")
+    if latencies:
+        p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+        print(f"  latency ms  p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {max(latencies) * 1000:.2f}")
+    breaker = circuit_breaker.stats()
+    print(f"  circuits opened {breaker['opened']}, calls rejected {breaker['rejected']}, hedges {breaker['hedges']}")
+
+
+async def run_gateway(url: str, method: str, path: str, requests: int, concurrency: int, hedge: bool = False) -> None:
+    from bot.api_client.circuit_breaker import circuit_breaker
+    from bot.dca_bot import gateway
+
+    gateway.THREE_COMMAS_BASE_URL = url
+    gateway.HEDGE_GETS = hedge
+    circuit_breaker.reset()
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                await gateway.make_3commas_request(method, f"/public/api{path}")
+            except Exception:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    await gateway.gateway_pool.start()
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await gateway.gateway_pool.close()
+    report(f"gateway (concurrency {concurrency})", latencies, errors, elapsed)
+
+
+def run_client(
+    url: str,
+    method: str,
+    path: str,
+    requests: int,
+    concurrency: int,
+    retry_delay: Optional[float] = None,
+    hedge: bool = False,
+) -> None:
+    from bot.api_client.circuit_breaker import circuit_breaker
+    from bot.api_client.client import ThreeCommasAPIClient
+
+    circuit_breaker.reset()
+
+    class BenchClient(ThreeCommasAPIClient):
+        BASE_URL = f"{url}/public/api"
+        RETRY_DELAY = ThreeCommasAPIClient.RETRY_DELAY if retry_delay is None else retry_delay
+
+    # requests.Session is not thread-safe to share, so one client per worker thread
+    local = threading.local()
+
+    def call(_: int) -> Optional[float]:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = BenchClient(
+                os.environ["THREE_COMMAS_API_KEY"], os.environ["THREE_COMMAS_API_SECRET"], hedge_gets=hedge
+            )
+        started = time.perf_counter()
+        try:
+            if method == "GET":
+                client.get(path)
+            else:
+                client._request_with_retry(method, path)
+        except Exception:
+            return None
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        results = list(pool.map(call, range(requests)))
+        elapsed = time.perf_counter() - started
+    latencies = [r for r in results if r is not None]
+    report(f"sync client (concurrency {concurrency})", latencies, len(results) - len(latencies), elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("gateway", "client", "both"), default="both")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--path", default="/ver1/bots/1003/show", help="endpoint below /public/api; mock bots are 1003-1052")
+    parser.add_argument("--url", default=None, help="use an already running mock instead of starting one")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", default=None, help="server-side requests/window, e.g. 600/60")
+    parser.add_argument("--retry-delay", type=float, default=None, help="override the sync client's RETRY_DELAY")
+    parser.add_argument("--hedge", action="store_true", help="hedge GETs after the endpoint's p95")
+    parser.add_argument("--client-limits", action="store_true", help="keep the client-side rate limiter budgets")
+    args = parser.parse_args()
+
+    stop: Optional[Callable[[], Any]] = None
+    url = args.url
+    if url is None:
+        config = MockConfig(args.latency, args.jitter, args.error_rate, parse_rate_limit(args.rate_limit))
+        url, stop = start_mock(config)
+    if not args.client_limits:
+        open_client_limits()
+
+    method = args.method.upper()
+    print(f"{method} {args.path} against {url}, {args.requests} requests")
+    try:
+        if args.target in ("gateway", "both"):
+            asyncio.run(run_gateway(url, method, args.path, args.requests, args.concurrency, args.hedge))
+        if args.target in ("client", "both"):
+            run_client(url, method, args.path, args.requests, args.concurrency, args.retry_delay, args.hedge)
+    finally:
+        if stop is not None:
+            stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Local stand-in for the 3Commas REST API, for load tests and offline runs.
+
+Implements the bots, accounts, grid_bots and deals routes used by the
+gateway, the API clients and AccountsService, backed by in-memory state, with
+configurable latency, error rate and a per-API-key rate limit that answers
+429 + Retry-After and advertises X-RateLimit-* headers.
+
+    python -m benchmarks.mock_3commas [--port 8900] [--latency 0.02] [--jitter 0.01]
+                                      [--error-rate 0.01] [--rate-limit 120/60]
+
+Point the bot at it with THREE_COMMAS_BASE_URL=http://127.0.0.1:8900 (gateway)
+and THREE_COMMAS_API_BASE_URL=http://127.0.0.1:8900/public/api (clients).
+"""
+import argparse
+import asyncio
+import calendar
+import itertools
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse
+
+DAY = 86400
+
+
+class MockConfig:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[Tuple[int, float]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit  # (requests, window seconds) per API key
+        self.random = random.Random(seed)
+
+
+class MockState:
+    """In-memory bots, grid bots, deals and accounts"""
+
+    def __init__(self, accounts: int = 3, bots: int = 50):
+        self._ids = itertools.count(1000)
+        self.accounts: Dict[int, Dict[str, Any]] = {}
+        self.bots: Dict[int, Dict[str, Any]] = {}
+        self.grid_bots: Dict[int, Dict[str, Any]] = {}
+        self.deals: Dict[int, Dict[str, Any]] = {}
+        for _ in range(accounts):
+            self.add_account({"name": "mock", "type": "binance"})
+        account_ids = list(self.accounts)
+        for i in range(bots):
+            self.add_bot({"name": f"bot-{i}", "account_id": account_ids[i % len(account_ids)], "pairs": ["USDT_BTC"]})
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add_account(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        account = {"id": self.next_id(), "name": payload.get("name", ""), "market_code": payload.get("type", "binance"),
+                   "usd_amount": "1000.0", "btc_amount": "0.01", "created_at": time.time()}
+        self.accounts[account["id"]] = account
+        return account
+
+    def add_bot(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        bot = {**payload, "id": self.next_id(), "is_enabled": False, "active_deals_count": 0, "created_at": time.time()}
+        self.bots[bot["id"]] = bot
+        return bot
+
+
+class TokenWindow:
+    """Fixed-window request counter per API key"""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._windows: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str) -> Tuple[bool, int, float]:
+        """(allowed, remaining, seconds until reset)"""
+        now = time.monotonic()
+        with self._lock:
+            started, used = self._windows.get(key, (now, 0))
+            if now - started >= self.window:
+                started, used = now, 0
+            reset = self.window - (now - started)
+            if used >= self.limit:
+                return False, 0, reset
+            self._windows[key] = (started, used + 1)
+            return True, self.limit - used - 1, reset
+
+
+def create_app(config: Optional[MockConfig] = None, state: Optional[MockState] = None) -> FastAPI:
+    config = config or MockConfig()
+    state = state or MockState()
+    limiter = TokenWindow(*config.rate_limit) if config.rate_limit else None
+    app = FastAPI()
+    app.state.mock = state
+    app.state.counters = {"requests": 0, "errors": 0, "rate_limited": 0}
+
+    @app.middleware("http")
+    async def behave(request: Request, call_next: Any) -> Any:
+        counters = app.state.counters
+        counters["requests"] += 1
+        api_key = request.headers.get("apikey")
+        if not api_key or not request.headers.get("signature"):
+            return JSONResponse({"error": "signature_invalid"}, status_code=401)
+        headers: Dict[str, str] = {}
+        if limiter is not None:
+            allowed, remaining, reset = limiter.take(api_key)
+            headers = {"X-RateLimit-Limit": str(limiter.limit), "X-RateLimit-Remaining": str(remaining),
+                       "X-RateLimit-Reset": f"{reset:.3f}"}
+            if not allowed:
+                counters["rate_limited"] += 1
+                return JSONResponse({"error": "rate_limit"}, status_code=429,
+                                    headers={**headers, "Retry-After": f"{reset:.3f}"})
+        delay = config.latency + (config.random.uniform(0, config.jitter) if config.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if config.error_rate and config.random.random() < config.error_rate:
+            counters["errors"] += 1
+            return JSONResponse({"error": "internal"}, status_code=503, headers=headers)
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
+
+    router = APIRouter(prefix="/public/api/ver1")
+
+    def not_found(what: str) -> JSONResponse:
+        return JSONResponse({"error": "record_not_found", "error_description": f"{what} not found"}, status_code=404)
+
+    async def body(request: Request) -> Dict[str, Any]:
+        raw = await request.body()
+        return await request.json() if raw else {}
+
+    # -- bots ------------------------------------------------------------
+
+    @router.get("/bots")
+    async def list_bots(limit: int = 50, offset: int = 0, account_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        bots = [b for b in state.bots.values() if account_id is None or b.get("account_id") == account_id]
+        return bots[offset:offset + limit]
+
+    @router.get("/bots/strategy_list")
+    async def strategy_list() -> Dict[str, Any]:
+        return {"nonstop": {"name": "Start ASAP"}, "rsi": {"name": "RSI"}, "manual": {"name": "Manual"}}
+
+    @router.post("/bots/create_bot")
+    async def create_bot(request: Request) -> Dict[str, Any]:
+        return state.add_bot(await body(request))
+
+    @router.get("/bots/{bot_id}/show")
+    async def show_bot(bot_id: int) -> Any:
+        return state.bots.get(bot_id) or not_found("Bot")
+
+    @router.patch("/bots/{bot_id}/update")
+    async def update_bot(bot_id: int, request: Request) -> Any:
+        if bot_id not in state.bots:
+            return not_found("Bot")
+        state.bots[bot_id].update(await body(request))
+        return state.bots[bot_id]
+
+    @router.post("/bots/{bot_id}/{action}")
+    async def bot_action(bot_id: int, action: str, request: Request) -> Any:
+        bot = state.bots.get(bot_id)
+        if bot is None:
+            return not_found("Bot")
+        if action in ("enable", "disable"):
+            bot["is_enabled"] = action == "enable"
+        elif action == "delete":
+            del state.bots[bot_id]
+        elif action == "update":
+            bot.update(await body(request))
+        elif action == "start_new_deal":
+            payload = await body(request)
+            deal = {"id": state.next_id(), "bot_id": bot_id, "account_id": bot.get("account_id"),
+                    "pair": payload.get("pair") or (bot.get("pairs") or ["USDT_BTC"])[0], "status": "bought",
+                    "finished?": False, "created_at": time.time()}
+            state.deals[deal["id"]] = deal
+            return deal
+        elif action not in ("panic_sell_all_deals", "cancel_all_deals"):
+            return not_found("Action")
+        return bot
+
+    # -- deals -----------------------------------------------------------
+
+    @router.get("/deals")
+    async def list_deals(limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        return list(state.deals.values())[offset:offset + limit]
+
+    @router.get("/deals/{deal_id}/show")
+    async def show_deal(deal_id: int) -> Any:
+        return state.deals.get(deal_id) or not_found("Deal")
+
+    @router.post("/deals/{deal_id}/{action}")
+    async def deal_action(deal_id: int, action: str) -> Any:
+        deal = state.deals.get(deal_id)
+        if deal is None:
+            return not_found("Deal")
+        if action in ("cancel", "panic_sell"):
+            deal.update({"status": "cancelled" if action == "cancel" else "panic_sold", "finished?": True})
+        return deal
+
+    # -- accounts --------------------------------------------------------
+
+    @router.get("/accounts")
+    async def list_accounts() -> List[Dict[str, Any]]:
+        return list(state.accounts.values())
+
+    @router.post("/accounts/new")
+    async def new_account(request: Request) -> Dict[str, Any]:
+        return state.add_account(await body(request))
+
+    @router.get("/accounts/types_to_connect")
+    async def types_to_connect() -> List[Dict[str, Any]]:
+        return [{"market_code": "binance", "name": "Binance"}, {"market_code": "okex", "name": "OKX"}]
+
+    @router.get("/accounts/summary/balance_chart_data")
+    async def summary_chart(date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+        return _chart(len(state.accounts), date_from, date_to)
+
+    @router.get("/accounts/{account_id}")
+    async def show_account(account_id: int) -> Any:
+        return state.accounts.get(account_id) or not_found("Account")
+
+    @router.get("/accounts/{account_id}/balance_chart_data")
+    async def balance_chart(account_id: int, date_from: Optional[str] = None, date_to: Optional[str] = None) -> Any:
+        if account_id not in state.accounts:
+            return not_found("Account")
+        return _chart(1, date_from, date_to)
+
+    @router.get("/accounts/{account_id}/active_trading_entities")
+    async def active_entities(account_id: int) -> Any:
+        if account_id not in state.accounts:
+            return not_found("Account")
+        bots = [b["id"] for b in state.bots.values() if b.get("account_id") == account_id]
+        return {"bots": bots, "deals": [d["id"] for d in state.deals.values() if d.get("account_id") == account_id]}
+
+    @router.post("/accounts/{account_id}/load_balances")
+    async def load_balances(account_id: int) -> Any:
+        return state.accounts.get(account_id) or not_found("Account")
+
+    # -- grid bots -------------------------------------------------------
+
+    @router.get("/grid_bots")
+    async def list_grid_bots(limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        return list(state.grid_bots.values())[offset:offset + limit]
+
+    @router.post("/grid_bots/{kind}")
+    async def create_grid_bot(kind: str, request: Request) -> Dict[str, Any]:
+        bot = {**await body(request), "id": state.next_id(), "strategy_type": kind, "is_enabled": True}
+        state.grid_bots[bot["id"]] = bot
+        return bot
+
+    @router.get("/grid_bots/{bot_id}")
+    async def show_grid_bot(bot_id: int) -> Any:
+        return state.grid_bots.get(bot_id) or not_found("Grid bot")
+
+    @router.get("/grid_bots/{bot_id}/events")
+    async def grid_events(bot_id: int) -> Any:
+        return [] if bot_id in state.grid_bots else not_found("Grid bot")
+
+    @router.get("/grid_bots/{bot_id}/market_orders")
+    async def grid_orders(bot_id: int) -> Any:
+        return {"grid_lines_orders": []} if bot_id in state.grid_bots else not_found("Grid bot")
+
+    app.include_router(router)
+    return app
+
+
+def _day(value: Optional[str], default: int) -> int:
+    return calendar.timegm(time.strptime(value, "%Y-%m-%d")) if value else default
+
+
+def _chart(scale: int, date_from: Optional[str], date_to: Optional[str]) -> List[Dict[str, Any]]:
+    """Deterministic daily balance points between two YYYY-MM-DD dates"""
+    end = _day(date_to, int(time.time()))
+    start = _day(date_from, end - 30 * DAY)
+    return [
+        {"date": t, "usd": f"{scale * (1000 + (t // DAY) % 97):.2f}", "btc": f"{scale * 0.01:.4f}"}
+        for t in range(start - start % DAY, end + 1, DAY)
+    ]
+
+
+def parse_rate_limit(value: Optional[str]) -> Optional[Tuple[int, float]]:
+    """'120/60' -> (120, 60.0)"""
+    if not value:
+        return None
+    limit, _, window = value.partition("/")
+    return int(limit), float(window or 60)
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.0, help="fixed response delay, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random delay, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--rate-limit", default=None, help="requests/window per API key, e.g. 120/60")
+    args = parser.parse_args()
+    config = MockConfig(args.latency, args.jitter, args.error_rate, parse_rate_limit(args.rate_limit))
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark for the per-request signing overhead.
+
+Compares the previous hot path (secret re-encoded and HMAC re-keyed on every
+call, JSON body serialized once to sign and again to send) against
+bot.api_client.signing (pre-keyed HMAC copied per request, body serialized once).
+
+    python -m benchmarks.signing_bench [iterations]
+"""
+import hashlib
+import hmac
+import json
+import sys
+import timeit
+
+from bot.api_client.signing import RequestSigner
+
+SECRET = "f" * 64
+PATH = "/public/api/ver1/bots/create_bot"
+PAYLOAD = {
+    "account_id": 123456,
+    "name": "ETH USDT DCA Bot",
+    "pairs": ["USDT_ETH"],
+    "base_order_volume": "10",
+    "safety_order_volume": "20",
+    "martingale_volume_coefficient": "1.2",
+    "martingale_step_coefficient": "1.1",
+    "max_safety_orders": 5,
+    "active_safety_orders_count": 2,
+    "safety_order_step_percentage": "1.0",
+    "take_profit_type": "total",
+    "strategy_list": [{"strategy": "nonstop", "options": {}}],
+}
+
+
+def legacy() -> bytes:
+    body = json.dumps(PAYLOAD, separators=(",", ":"), sort_keys=True)
+    hmac.new(SECRET.encode("utf-8"), (PATH + body).encode("utf-8"), hashlib.sha256).hexdigest()
+    # httpx/requests serialize the payload a second time for the wire
+    return json.dumps(PAYLOAD).encode("utf-8")
+
+
+signer = RequestSigner(SECRET)
+
+
+def fast_path() -> bytes:
+    return signer.prepare("POST", PATH, PAYLOAD).body
+
+
+def legacy_sign_only() -> str:
+    return hmac.new(SECRET.encode("utf-8"), PATH.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def fast_sign_only() -> str:
+    return signer.sign_request(PATH)
+
+
+def bench(label: str, func, iterations: int) -> float:
+    best = min(timeit.repeat(func, number=iterations, repeat=5)) / iterations * 1e6
+    print(f"{label:<32} {best:8.2f} us/request")
+    return best
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    before = bench("POST legacy (sign + send)", legacy, iterations)
+    after = bench("POST signing.prepare", fast_path, iterations)
+    print(f"{'':<32} {before / after:8.2f}x faster")
+    before = bench("GET legacy hmac.new", legacy_sign_only, iterations)
+    after = bench("GET pre-keyed hmac copy", fast_sign_only, iterations)
+    print(f"{'':<32} {before / after:8.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+# api_client/async_client.py
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Dict, Optional, Tuple, Type
+
+import httpx
+
+from ..config.settings import settings
+from ..utils.logger import get_logger
+from .cache import response_cache
+from .circuit_breaker import circuit_breaker, is_failure_status
+from .client import (
+    IDEMPOTENT_METHODS,
+    APIError,
+    AuthenticationError,
+    CircuitOpenError,
+    RateLimitError,
+    UnconfirmedRequestError,
+)
+from .hedging import hedged_async
+from .instrumentation import Attempt, observe_error, observe_retry
+from .rate_limiter import parse_retry_after, rate_limiter
+from .signing import RequestSigner, SignedRequest
+
+logger = get_logger("AsyncAPIClient")
+
+
+class AsyncThreeCommasAPIClient:
+    """
+    asyncio counterpart of ThreeCommasAPIClient.
+
+    Network waits and retry delays never block the event loop, so a single
+    process can drive many concurrent account/bot operations. Pass a shared
+    `http_client` (e.g. HTTPPool.client) to reuse an existing connection pool.
+    Both clients and the gateway share the per-endpoint circuit breaker.
+
+    Only idempotent methods are retried after a failure 3Commas may have acted
+    on (a 5xx, a timeout, an unreadable body); a POST or PATCH that fails that
+    way raises UnconfirmedRequestError instead of being sent again.
+    """
+
+    BASE_URL = settings.THREE_COMMAS_API_BASE_URL
+    MAX_RETRIES = 3
+    RETRY_DELAY = 1.0
+    MAX_RETRY_DELAY = 30.0
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    # Failures that prove 3Commas never acted on the request, so any method may retry them
+    UNSENT_ERRORS: Tuple[Type[BaseException], ...] = (
+        RateLimitError, httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout,
+    )
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_connections: int = 100,
+        hedge_gets: bool = False,
+    ):
+        if not api_key or not api_secret:
+            raise AuthenticationError("API key and secret must be provided")
+        self.api_key = api_key
+        self.api_secret = api_secret.encode('utf-8')
+        self.signer = RequestSigner(self.api_secret)
+        self.max_connections = max_connections
+        # Re-send slow GETs once they pass the endpoint's recent p95 (see hedging.py)
+        self.hedge_gets = hedge_gets
+        self._owns_client = http_client is None
+        self._client = http_client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers={"Accept": "application/json"},
+                limits=httpx.Limits(max_connections=self.max_connections),
+            )
+            self._owns_client = True
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncThreeCommasAPIClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def _sign(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> SignedRequest:
+        """Serialize params once and sign exactly the bytes that are sent"""
+        try:
+            return self.signer.prepare(method, f"/public/api{endpoint}", params)
+        except Exception as e:
+            logger.error(f"Signing failed: {str(e)}")
+            raise APIError("Failed to sign request") from e
+
+    def _get_headers(self, signature: str) -> dict:
+        return {
+            "Apikey": self.api_key,
+            "Signature": signature,
+            "Content-Type": "application/json",
+        }
+
+    def _handle_response(self, response: httpx.Response) -> Any:
+        if response.status_code == 401:
+            raise AuthenticationError("Invalid API credentials", status_code=401)
+        if response.status_code == 429:
+            raise RateLimitError("Rate limit exceeded", status_code=429)
+        if response.is_error:
+            error_msg = self._extract_error_message(response)
+            raise APIError(f"API request failed: {error_msg}", status_code=response.status_code)
+        if response.status_code == 204 or not response.content:
+            return None
+        try:
+            return response.json()
+        except ValueError as json_err:
+            raise APIError("Invalid JSON response") from json_err
+
+    def _extract_error_message(self, response: httpx.Response) -> str:
+        try:
+            error_data = response.json()
+            if isinstance(error_data, dict):
+                error = error_data.get("error", {})
+                if isinstance(error, dict):
+                    return error.get("message", response.text)
+                return str(error)
+            return str(error_data)
+        except ValueError:
+            return response.text
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Exponential backoff with full jitter, never shorter than the server's Retry-After"""
+        delay = random.uniform(0, min(self.MAX_RETRY_DELAY, self.RETRY_DELAY * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def _send(
+        self, method: str, endpoint: str, url: str, headers: dict, body: Optional[bytes], attempt: int
+    ) -> httpx.Response:
+        """One HTTP attempt; its outcome is reported to the endpoint's circuit"""
+        await rate_limiter.acquire_async(self.api_key, endpoint)
+        started = time.perf_counter()
+        try:
+            with Attempt("async", endpoint, method, attempt) as timing:
+                response = await self.client.request(method, url, headers=headers, content=body)
+                timing.status = response.status_code
+        except httpx.TransportError:
+            circuit_breaker.record(endpoint, failed=True)
+            raise
+        circuit_breaker.record(endpoint, is_failure_status(response.status_code), time.perf_counter() - started)
+        rate_limiter.update_from_headers(self.api_key, endpoint, response.headers)
+        return response
+
+    async def _request_with_retry(
+        self, method: str, endpoint: str, params: Optional[Dict] = None
+    ) -> Any:
+        method = method.upper()
+        signed = self._sign(method, endpoint, params)
+        headers = self._get_headers(signed.signature)
+        url = self.BASE_URL + endpoint
+        if signed.query:
+            url = f"{url}?{signed.query}"
+
+        last_exception: Optional[Exception] = None
+        for attempt in range(self.MAX_RETRIES):
+            wait = circuit_breaker.allow(endpoint)
+            if wait is not None:
+                error = CircuitOpenError(endpoint, wait)
+                observe_error(endpoint, error)
+                raise error from last_exception
+
+            response = None
+            try:
+                def send() -> Awaitable[httpx.Response]:
+                    return self._send(method, endpoint, url, headers, signed.body, attempt + 1)
+
+                if method == "GET" and self.hedge_gets:
+                    response = await hedged_async(endpoint, send)
+                else:
+                    response = await send()
+                return self._handle_response(response)
+
+            except AuthenticationError as e:
+                observe_error(endpoint, e)
+                raise
+
+            except APIError as e:
+                if e.status_code is not None and e.status_code not in self.RETRY_STATUSES:
+                    observe_error(endpoint, e)
+                    raise
+                last_exception = e
+
+            except httpx.TransportError as e:
+                last_exception = e
+
+            if method not in IDEMPOTENT_METHODS and not isinstance(last_exception, self.UNSENT_ERRORS):
+                # 3Commas may already have acted on it (e.g. opened the deal); a resend could do it twice
+                observe_error(endpoint, last_exception)
+                raise UnconfirmedRequestError(
+                    f"{method} {endpoint} failed and was not retried: {last_exception}",
+                    status_code=getattr(last_exception, "status_code", None),
+                ) from last_exception
+            if attempt == self.MAX_RETRIES - 1:
+                break
+            observe_retry(endpoint, str(response.status_code) if response is not None else type(last_exception).__name__)
+            retry_after = parse_retry_after(response.headers.get("Retry-After")) if response else None
+            delay = self._backoff_delay(attempt, retry_after)
+            logger.warning(
+                f"{method} {endpoint} attempt {attempt + 1} failed ({last_exception}), "
+                f"retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+        logger.error(f"Request failed after {self.MAX_RETRIES} attempts")
+        if last_exception is not None:
+            observe_error(endpoint, last_exception)
+        if isinstance(last_exception, RateLimitError):
+            raise last_exception
+        raise APIError("Max retries exceeded") from last_exception
+
+    async def get(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        try:
+            return await response_cache.get_or_fetch_async(
+                self.api_key, "GET", endpoint, params,
+                lambda: self._request_with_retry("GET", endpoint, params),
+            )
+        except Exception as e:
+            logger.error(f"GET request failed: {str(e)}")
+            raise
+
+    async def post(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        try:
+            result = await self._request_with_retry("POST", endpoint, params)
+            response_cache.invalidate(self.api_key, endpoint)
+            return result
+        except Exception as e:
+            logger.error(f"POST request failed: {str(e)}")
+            raise
+
+    async def patch(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        try:
+            result = await self._request_with_retry("PATCH", endpoint, params)
+            response_cache.invalidate(self.api_key, endpoint)
+            return result
+        except Exception as e:
+            logger.error(f"PATCH request failed: {str(e)}")
+            raise
+
+    async def delete(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        try:
+            result = await self._request_with_retry("DELETE", endpoint, params)
+            response_cache.invalidate(self.api_key, endpoint)
+            return result
+        except Exception as e:
+            logger.error(f"DELETE request failed: {str(e)}")
+            raise
@@ -0,0 +1,239 @@
+# api_client/cache.py
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Pattern, Tuple
+
+from ..utils.logger import get_logger
+
+logger = get_logger("ResponseCache")
+
+_RESOURCE_RE = re.compile(r"^(/ver\d+/[a-z_]+)(?:/(\d+))?")
+
+CacheKey = Tuple[str, str, str, Tuple[Tuple[str, Hashable], ...]]
+
+
+def normalize_path(path: str) -> str:
+    """Strip the /public/api prefix and any query string so gateway and client paths match"""
+    path = path.split("?", 1)[0]
+    if path.startswith("/public/api"):
+        path = path[len("/public/api"):]
+    return path
+
+
+class _Call:
+    """An in-flight upstream request that concurrent sync callers wait on"""
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def _retrieve_exception(task: "asyncio.Future[Any]") -> None:
+    """Keep a shared fetch that failed after all its waiters left from logging 'never retrieved'"""
+    if not task.cancelled():
+        task.exception()
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache for read-only 3Commas endpoints with single-flight coalescing.
+
+    Only paths matching an entry of `TTLS` are cached. Concurrent identical
+    requests share one upstream call, and a successful mutating request drops
+    every cached entry for the resource it touched (e.g. POST /ver1/bots/42/enable
+    evicts /ver1/bots/42/show and the /ver1/bots listing).
+    """
+
+    MAX_ENTRIES = 1024
+    TTLS: List[Tuple[str, float]] = [
+        (r"^/ver1/bots/strategy_list$", 300.0),
+        (r"^/ver1/bots$", 15.0),
+        (r"^/ver1/accounts$", 60.0),
+        (r"^/ver1/accounts/types_to_connect$", 3600.0),
+        (r"^/ver1/accounts/\d+$", 30.0),
+    ]
+
+    def __init__(self, max_entries: Optional[int] = None, ttls: Optional[List[Tuple[str, float]]] = None):
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self._ttls: List[Tuple[Pattern[str], float]] = [
+            (re.compile(pattern), ttl) for pattern, ttl in (ttls if ttls is not None else self.TTLS)
+        ]
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._async_calls: Dict[CacheKey, "asyncio.Future[Any]"] = {}
+        self._sync_calls: Dict[CacheKey, _Call] = {}
+        # Bumped on every invalidation so a fetch that started earlier doesn't store stale data
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def ttl_for(self, path: str) -> Optional[float]:
+        path = normalize_path(path)
+        for pattern, ttl in self._ttls:
+            if pattern.match(path):
+                return ttl
+        return None
+
+    @staticmethod
+    def make_key(api_key: str, method: str, path: str, params: Optional[Dict[str, Any]] = None) -> CacheKey:
+        items = tuple(sorted(
+            (k, tuple(v) if isinstance(v, list) else v)
+            for k, v in (params or {}).items() if v is not None
+        ))
+        return (api_key, method.upper(), normalize_path(path), items)
+
+    def _get(self, key: CacheKey) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def _set(self, key: CacheKey, value: Any, ttl: float, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_or_fetch_async(
+        self,
+        api_key: str,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Serve from cache, join an identical in-flight request, or call `fetch` once"""
+        ttl = self.ttl_for(path)
+        if ttl is None:
+            return await fetch()
+
+        key = self.make_key(api_key, method, path, params)
+        hit, value = self._get(key)
+        if hit:
+            return value
+
+        pending = self._async_calls.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        # The fetch runs in its own task that every waiter shields, so a
+        # cancelled caller (e.g. a client that disconnected) never cancels
+        # the request the other waiters are sharing
+        task = asyncio.ensure_future(self._fetch_and_store(key, ttl, fetch, self._generation))
+        task.add_done_callback(_retrieve_exception)
+        self._async_calls[key] = task
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(
+        self, key: CacheKey, ttl: float, fetch: Callable[[], Awaitable[Any]], generation: int
+    ) -> Any:
+        try:
+            value = await fetch()
+            self._set(key, value, ttl, generation)
+            return value
+        finally:
+            self._async_calls.pop(key, None)
+
+    def get_or_fetch(
+        self,
+        api_key: str,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        fetch: Callable[[], Any],
+    ) -> Any:
+        """Thread-safe counterpart of get_or_fetch_async for the blocking client"""
+        ttl = self.ttl_for(path)
+        if ttl is None:
+            return fetch()
+
+        key = self.make_key(api_key, method, path, params)
+        hit, value = self._get(key)
+        if hit:
+            return value
+
+        with self._lock:
+            existing = self._sync_calls.get(key)
+            leader = existing is None
+            call: _Call = _Call() if existing is None else existing
+            if leader:
+                self._sync_calls[key] = call
+            generation = self._generation
+
+        if not leader:
+            self.coalesced += 1
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        self.misses += 1
+        try:
+            call.value = fetch()
+            self._set(key, call.value, ttl, generation)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._sync_calls.pop(key, None)
+            call.event.set()
+
+    def invalidate(self, api_key: str, path: str) -> int:
+        """Drop cached entries for the resource a mutating request touched"""
+        match = _RESOURCE_RE.match(normalize_path(path))
+        if not match:
+            return 0
+        family, resource_id = match.groups()
+        prefix = f"{family}/{resource_id}" if resource_id else None
+
+        with self._lock:
+            self._generation += 1
+            stale = [
+                key for key in self._entries
+                if key[0] == api_key and (
+                    key[2] == family
+                    or (prefix is not None and (key[2] == prefix or key[2].startswith(prefix + "/")))
+                )
+            ]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            logger.debug("Invalidated %d cached responses for %s", len(stale), path)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
+# Process-wide cache shared by the clients and the gateway
+response_cache = ResponseCache()
@@ -0,0 +1,248 @@
+# api_client/circuit_breaker.py
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from ..utils.logger import get_logger
+from .instrumentation import CIRCUIT_REJECTED, CIRCUIT_STATE, endpoint_family
+
+logger = get_logger("CircuitBreaker")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def is_failure_status(status: int) -> bool:
+    """Server-side trouble counts against the circuit; 4xx (including 429) means 3Commas answered"""
+    return status >= 500
+
+
+class Circuit:
+    """
+    Breaker for one endpoint family.
+
+    While closed, every call goes through and its outcome lands in a sliding
+    window of `window` seconds. Once the window holds `min_calls` calls and
+    at least `failure_rate` of them failed, the circuit opens and calls fail
+    fast for `open_seconds`. After that it is half-open: `probes` calls go
+    through, and the circuit closes if they all succeed or reopens on the
+    first failure. Probes that never report back are reissued after another
+    `open_seconds`.
+
+    Latencies of recent successful calls are kept to estimate the p95 used as
+    the hedge delay.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: float,
+        min_calls: int,
+        failure_rate: float,
+        open_seconds: float,
+        probes: int,
+        latency_samples: int = 512,
+    ):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.probes = probes
+        self.state = CLOSED
+        self._events: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._changed_at = time.monotonic()
+        self._probes_left = 0
+        self._probe_successes = 0
+        self._latencies: Deque[float] = deque(maxlen=latency_samples)
+        self._p95: Optional[float] = None
+        self._p95_at = 0.0
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedges = 0
+        self.opened = 0
+        self.rejected = 0
+
+    def _set_state(self, state: str, now: float) -> None:
+        self.state = state
+        self._changed_at = now
+        CIRCUIT_STATE.labels(self.name).set(_STATE_VALUES[state])
+
+    def _open(self, now: float) -> None:
+        self._set_state(OPEN, now)
+        self._events.clear()
+        self._failures = 0
+        self.opened += 1
+        logger.warning(f"Circuit for {self.name} opened for {self.open_seconds:g}s")
+
+    def _half_open(self, now: float) -> None:
+        self._set_state(HALF_OPEN, now)
+        self._probes_left = self.probes
+        self._probe_successes = 0
+
+    def allow(self) -> Optional[float]:
+        """None if a call may go ahead, otherwise roughly how long until it might"""
+        with self._lock:
+            if self.state == CLOSED:
+                return None
+            now = time.monotonic()
+            if self.state == OPEN:
+                wait = self._changed_at + self.open_seconds - now
+                if wait > 0:
+                    self.rejected += 1
+                    CIRCUIT_REJECTED.labels(self.name).inc()
+                    return wait
+                self._half_open(now)
+            elif not self._probes_left and now - self._changed_at > self.open_seconds:
+                # The probes were lost (e.g. their callers were cancelled)
+                self._half_open(now)
+            if self._probes_left:
+                self._probes_left -= 1
+                return None
+            self.rejected += 1
+            CIRCUIT_REJECTED.labels(self.name).inc()
+            return max(0.0, self._changed_at + self.open_seconds - now)
+
+    def record(self, failed: bool, seconds: Optional[float] = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.calls += 1
+            if not failed and seconds is not None:
+                self._latencies.append(seconds)
+            if self.state == HALF_OPEN:
+                if failed:
+                    self._open(now)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.probes:
+                        self._set_state(CLOSED, now)
+                        logger.info(f"Circuit for {self.name} closed")
+                return
+            if self.state == OPEN:
+                # A call that started before the circuit opened
+                return
+            self._events.append((now, failed))
+            self._failures += failed
+            cutoff = now - self.window
+            while self._events[0][0] < cutoff:
+                self._failures -= self._events.popleft()[1]
+            if failed and len(self._events) >= self.min_calls and self._failures >= self.failure_rate * len(self._events):
+                self._open(now)
+
+    def hedged(self) -> None:
+        with self._lock:
+            self.hedges += 1
+
+    def p95(self, min_samples: int) -> Optional[float]:
+        """p95 of recent successful latencies, recomputed at most once a second"""
+        with self._lock:
+            if len(self._latencies) < min_samples:
+                return None
+            now = time.monotonic()
+            if self._p95 is None or now - self._p95_at > 1.0:
+                ordered = sorted(self._latencies)
+                self._p95 = ordered[int(0.95 * (len(ordered) - 1))]
+                self._p95_at = now
+            return self._p95
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "window_calls": len(self._events),
+                "window_failures": self._failures,
+                "calls": self.calls,
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "hedges": self.hedges,
+            }
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breakers shared by the sync/async clients and the gateway.
+
+    Circuits are keyed by endpoint family ('/ver1/bots/:id/show'), so a
+    failing route fails fast without taking healthy ones down with it. The
+    same circuits supply the hedge delay for idempotent GETs: the family's
+    recent p95, once HEDGE_MIN_SAMPLES latencies are known, with at most
+    HEDGE_RATIO of its calls hedged.
+    """
+
+    WINDOW = 30.0
+    MIN_CALLS = 20
+    FAILURE_RATE = 0.5
+    OPEN_SECONDS = 15.0
+    PROBES = 3
+    HEDGE_MIN_SAMPLES = 50
+    HEDGE_MIN_DELAY = 0.05
+    HEDGE_RATIO = 0.1
+
+    def __init__(
+        self,
+        window: Optional[float] = None,
+        min_calls: Optional[int] = None,
+        failure_rate: Optional[float] = None,
+        open_seconds: Optional[float] = None,
+        probes: Optional[int] = None,
+    ):
+        self.window = window or self.WINDOW
+        self.min_calls = min_calls or self.MIN_CALLS
+        self.failure_rate = failure_rate or self.FAILURE_RATE
+        self.open_seconds = open_seconds or self.OPEN_SECONDS
+        self.probes = probes or self.PROBES
+        self._circuits: Dict[str, Circuit] = {}
+        self._lock = threading.Lock()
+
+    def circuit(self, endpoint: str) -> Circuit:
+        family = endpoint_family(endpoint)
+        circuit = self._circuits.get(family)
+        if circuit is None:
+            with self._lock:
+                circuit = self._circuits.get(family)
+                if circuit is None:
+                    circuit = Circuit(
+                        family, self.window, self.min_calls, self.failure_rate, self.open_seconds, self.probes
+                    )
+                    self._circuits[family] = circuit
+        return circuit
+
+    def allow(self, endpoint: str) -> Optional[float]:
+        return self.circuit(endpoint).allow()
+
+    def record(self, endpoint: str, failed: bool, seconds: Optional[float] = None) -> None:
+        self.circuit(endpoint).record(failed, seconds)
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """How long to wait before hedging a GET, or None to send it once"""
+        circuit = self.circuit(endpoint)
+        if circuit.state != CLOSED or circuit.hedges >= self.HEDGE_RATIO * circuit.calls:
+            return None
+        p95 = circuit.p95(self.HEDGE_MIN_SAMPLES)
+        return None if p95 is None else max(p95, self.HEDGE_MIN_DELAY)
+
+    def hedged(self, endpoint: str) -> None:
+        self.circuit(endpoint).hedged()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._circuits.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        circuits = list(self._circuits.values())
+        return {
+            "circuits": len(circuits),
+            "open": sum(circuit.state == OPEN for circuit in circuits),
+            "half_open": sum(circuit.state == HALF_OPEN for circuit in circuits),
+            "rejected": sum(circuit.rejected for circuit in circuits),
+            "opened": sum(circuit.opened for circuit in circuits),
+            "hedges": sum(circuit.hedges for circuit in circuits),
+        }
+
+
+# Process-wide breaker shared by every client instance and the gateway
+circuit_breaker = CircuitBreaker()
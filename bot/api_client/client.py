@@ -1,18 +1,27 @@
 import os
+import random
+import threading
 import time
 import requests
-import hmac
-import hashlib
-import json
-from urllib.parse import urlencode
-from typing import Optional, Dict, Any
+from typing import Any, Dict, Optional, Tuple, Type
 from ..config.settings import settings
 from ..utils.logger import get_logger
+from .cache import response_cache
+from .circuit_breaker import circuit_breaker, is_failure_status
+from .hedging import hedged_sync
+from .instrumentation import Attempt, endpoint_family, observe_error, observe_retry
+from .rate_limiter import parse_retry_after, rate_limiter
+from .signing import RequestSigner, SignedRequest
 
 logger = get_logger("APIClient")
 
+# Methods that can be sent again after an unclear failure without doing their work twice
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
 class APIError(Exception):
-    pass
+    def __init__(self, message: str = "", status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 class AuthenticationError(APIError):
     pass
@@ -20,38 +29,43 @@ class AuthenticationError(APIError):
 class RateLimitError(APIError):
     pass
 
+class UnconfirmedRequestError(APIError):
+    """A request that isn't safe to repeat failed after it may have reached 3Commas; it was not re-sent"""
+
+class CircuitOpenError(APIError):
+    """The endpoint's circuit is open; the call was not sent"""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(
+            f"Circuit open for {endpoint_family(endpoint)}, retry in {retry_after:.1f}s", status_code=503
+        )
+        self.retry_after = retry_after
+
 class ThreeCommasAPIClient:
     BASE_URL = settings.THREE_COMMAS_API_BASE_URL
     MAX_RETRIES = 3
     RETRY_DELAY = 5
+    MAX_RETRY_DELAY = 30.0
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    # Failures that prove 3Commas never acted on the request, so any method may retry them
+    UNSENT_ERRORS: Tuple[Type[BaseException], ...] = (RateLimitError, requests.exceptions.ConnectTimeout)
 
-    def __init__(self, api_key: str, api_secret: str):
+    def __init__(self, api_key: str, api_secret: str, hedge_gets: bool = False):
         if not api_key or not api_secret:
             raise AuthenticationError("API key and secret must be provided")
         self.api_key = api_key
         self.api_secret = api_secret.encode('utf-8')
+        self.signer = RequestSigner(self.api_secret)
         self.session = requests.Session()
         self.session.headers.update({"Accept": "application/json"})
+        # Re-send slow GETs once they pass the endpoint's recent p95 (see hedging.py)
+        self.hedge_gets = hedge_gets
+        self._hedge_sessions = threading.local()
 
-    def _sign(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    def _sign(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> SignedRequest:
+        """Serialize params once and sign exactly the bytes that are sent"""
         try:
-            path = f"/public/api{endpoint}"
-            method = method.upper()
-
-            if method == "GET":
-                query = urlencode(sorted(params.items())) if params else ""
-                total_params = f"{path}?{query}" if query else path
-            else:  
-                body = json.dumps(params or {}, separators=(',', ':'))
-                total_params = f"{path}{body}"
-
-            signature = hmac.new(
-                self.api_secret,
-                total_params.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
-
-            return signature
+            return self.signer.prepare(method, f"/public/api{endpoint}", params)
         except Exception as e:
             logger.error(f"Signing failed: {str(e)}")
             raise APIError("Failed to sign request") from e
@@ -69,12 +83,14 @@ class ThreeCommasAPIClient:
             return response.json()
         except requests.exceptions.HTTPError as http_err:
             if response.status_code == 401:
-                raise AuthenticationError("Invalid API credentials") from http_err
+                raise AuthenticationError("Invalid API credentials", status_code=401) from http_err
             elif response.status_code == 429:
-                raise RateLimitError("Rate limit exceeded") from http_err
+                raise RateLimitError("Rate limit exceeded", status_code=429) from http_err
             else:
                 error_msg = self._extract_error_message(response)
-                raise APIError(f"API request failed: {error_msg}") from http_err
+                raise APIError(
+                    f"API request failed: {error_msg}", status_code=response.status_code
+                ) from http_err
         except ValueError as json_err:
             raise APIError("Invalid JSON response") from json_err
 
@@ -88,54 +104,131 @@ class ThreeCommasAPIClient:
         except ValueError:
             return response.text
 
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, so failing callers don't retry in lockstep"""
+        return random.uniform(0, min(self.MAX_RETRY_DELAY, self.RETRY_DELAY * 2 ** attempt))
+
+    def _hedge_session(self) -> requests.Session:
+        """Session of the current hedge thread; concurrent hedged attempts never share one"""
+        session = getattr(self._hedge_sessions, "session", None)
+        if session is None:
+            session = self._hedge_sessions.session = requests.Session()
+            session.headers.update(self.session.headers)
+        return session
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        headers: dict,
+        body: Optional[bytes],
+        attempt: int,
+        session: Optional[requests.Session] = None,
+    ) -> requests.Response:
+        """One HTTP attempt; its outcome is reported to the endpoint's circuit"""
+        rate_limiter.acquire(self.api_key, endpoint)
+        started = time.perf_counter()
+        try:
+            with Attempt("sync", endpoint, method, attempt) as timing:
+                response = (session or self.session).request(method, url, headers=headers, data=body)
+                timing.status = response.status_code
+        except requests.exceptions.RequestException:
+            circuit_breaker.record(endpoint, failed=True)
+            raise
+        circuit_breaker.record(endpoint, is_failure_status(response.status_code), time.perf_counter() - started)
+        rate_limiter.update_from_headers(self.api_key, endpoint, response.headers)
+        return response
+
     def _request_with_retry(self, method: str, endpoint: str, params: Optional[Dict] = None) -> Any:
-        last_exception = None
+        method = method.upper()
+        last_exception: Optional[Exception] = None
+        signed = self._sign(method, endpoint, params)
+        headers = self._get_headers(signed.signature)
+        url = self.BASE_URL + endpoint
+        if signed.query:
+            url = f"{url}?{signed.query}"
+
         for attempt in range(self.MAX_RETRIES):
+            wait = circuit_breaker.allow(endpoint)
+            if wait is not None:
+                error = CircuitOpenError(endpoint, wait)
+                observe_error(endpoint, error)
+                raise error from last_exception
+
+            response = None
             try:
-                signature = self._sign(method, endpoint, params)
-                headers = self._get_headers(signature)
-                url = self.BASE_URL + endpoint
+                logger.debug("%s %s headers=%s payload=%s", method, url, headers, params)
 
-                logger.debug(f"{method.upper()} {url}")
-                logger.debug(f"Headers: {headers}")
-                logger.debug(f"Payload: {json.dumps(params, indent=2)}")
+                def send() -> requests.Response:
+                    return self._send(method, endpoint, url, headers, signed.body, attempt + 1)
 
-                if method.upper() == "GET":
-                    response = self.session.get(url, headers=headers, params=params)
-                else:
-                    response = self.session.post(url, headers=headers, json=params)
+                def send_hedged() -> requests.Response:
+                    return self._send(
+                        method, endpoint, url, headers, signed.body, attempt + 1, session=self._hedge_session()
+                    )
 
+                response = hedged_sync(endpoint, send_hedged) if method == "GET" and self.hedge_gets else send()
                 return self._handle_response(response)
 
             except RateLimitError as e:
                 if attempt == self.MAX_RETRIES - 1:
+                    observe_error(endpoint, e)
                     raise
-                retry_after = int(response.headers.get('Retry-After', self.RETRY_DELAY))
+                observe_retry(endpoint, "rate_limited")
+                retry_after = (
+                    parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+                ) or self.RETRY_DELAY
                 logger.warning(f"Rate limited, retrying in {retry_after} seconds...")
-                time.sleep(retry_after)
+                # The shared limiter holds this and every other queued request back
+                rate_limiter.penalize(self.api_key, endpoint, retry_after)
+                continue
+
+            except APIError as e:
+                if e.status_code is not None and e.status_code not in self.RETRY_STATUSES:
+                    observe_error(endpoint, e)
+                    raise
+                last_exception = e
 
             except Exception as e:
                 last_exception = e
-                if attempt == self.MAX_RETRIES - 1:
-                    break
-                logger.warning(f"Attempt {attempt + 1} failed, retrying...")
-                time.sleep(self.RETRY_DELAY)
+
+            if method not in IDEMPOTENT_METHODS and not isinstance(last_exception, self.UNSENT_ERRORS):
+                # 3Commas may already have acted on it (e.g. opened the deal); a resend could do it twice
+                observe_error(endpoint, last_exception)
+                raise UnconfirmedRequestError(
+                    f"{method} {endpoint} failed and was not retried: {last_exception}",
+                    status_code=getattr(last_exception, "status_code", None),
+                ) from last_exception
+            if attempt == self.MAX_RETRIES - 1:
+                break
+            observe_retry(endpoint, type(last_exception).__name__)
+            delay = self._backoff_delay(attempt)
+            logger.warning(f"Attempt {attempt + 1} failed, retrying in {delay:.2f}s...")
+            time.sleep(delay)
 
         logger.error(f"Request failed after {self.MAX_RETRIES} attempts")
+        if last_exception is not None:
+            observe_error(endpoint, last_exception)
         raise APIError("Max retries exceeded") from last_exception
 
     def get(self, endpoint: str, params: Optional[Dict] = None) -> Any:
         try:
-            logger.debug(f"GET {endpoint} with params: {params}")
-            return self._request_with_retry("GET", endpoint, params)
+            logger.debug("GET %s with params: %s", endpoint, params)
+            return response_cache.get_or_fetch(
+                self.api_key, "GET", endpoint, params,
+                lambda: self._request_with_retry("GET", endpoint, params),
+            )
         except Exception as e:
             logger.error(f"GET request failed: {str(e)}")
             raise
 
     def post(self, endpoint: str, params: Optional[Dict] = None) -> Any:
         try:
-            logger.debug(f"POST {endpoint} with payload: {params}")
-            return self._request_with_retry("POST", endpoint, params)
+            logger.debug("POST %s with payload: %s", endpoint, params)
+            result = self._request_with_retry("POST", endpoint, params)
+            response_cache.invalidate(self.api_key, endpoint)
+            return result
         except Exception as e:
             logger.error(f"POST request failed: {str(e)}")
             raise
@@ -1,4 +1,5 @@
 # accounts_endpoints.py
+from typing import Any, Dict, Optional
 
 BASE_URL = "/ver1/accounts"
 
@@ -8,20 +9,24 @@ def get_account_active_trading_entities(account_id: int) -> tuple[str, dict]:
     params = {"account_id": account_id}
     return endpoint, params
 
-def get_account_balance_chart_data(account_id: int, date_from: str = None, date_to: str = None) -> tuple[str, dict]:
+def get_account_balance_chart_data(
+    account_id: int, date_from: Optional[str] = None, date_to: Optional[str] = None
+) -> tuple[str, dict]:
     """Returns endpoint and parameters for balance chart data"""
     endpoint = f"{BASE_URL}/{account_id}/balance_chart_data"
-    params = {"account_id": account_id}
+    params: Dict[str, Any] = {"account_id": account_id}
     if date_from:
         params["date_from"] = date_from
     if date_to:
         params["date_to"] = date_to
     return endpoint, params
 
-def get_account_balance_chart_data_summary(date_from: str = None, date_to: str = None) -> tuple[str, dict]:
+def get_account_balance_chart_data_summary(
+    date_from: Optional[str] = None, date_to: Optional[str] = None
+) -> tuple[str, dict]:
     """Returns endpoint and parameters for balance chart summary"""
     endpoint = f"{BASE_URL}/summary/balance_chart_data"
-    params = {}
+    params: Dict[str, Any] = {}
     if date_from:
         params["date_from"] = date_from
     if date_to:
@@ -39,7 +44,9 @@ def get_account_types_to_connect() -> tuple[str, dict]:
     endpoint = f"{BASE_URL}/types_to_connect"
     return endpoint, {}
 
-def post_add_exchange_account(type: str, name: str, api_key: str, secret: str, **kwargs) -> tuple[str, dict]:
+def post_add_exchange_account(
+    type: str, name: str, api_key: str, secret: str, **kwargs: Any
+) -> tuple[str, dict]:
     """Returns endpoint and payload for adding exchange account"""
     endpoint = f"{BASE_URL}/new"
     payload = {
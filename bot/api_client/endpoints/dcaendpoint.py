@@ -49,3 +49,6 @@ def get_profit_by_day(bot_id: int) -> str:
 
 def get_deals_stats(bot_id: int) -> str:
     return f"{BASE_URL}/{bot_id}/deals_stats"
+
+def start_new_deal(bot_id: int) -> str:
+    return f"{BASE_URL}/{bot_id}/start_new_deal"
@@ -0,0 +1,24 @@
+# deals_endpoints.py
+
+BASE_URL = "/ver1/deals"
+
+def list_deals() -> str:
+    return f"{BASE_URL}"
+
+def get_deal(deal_id: int) -> str:
+    return f"{BASE_URL}/{deal_id}/show"
+
+def update_deal(deal_id: int) -> str:
+    return f"{BASE_URL}/{deal_id}/update_deal"
+
+def panic_sell_deal(deal_id: int) -> str:
+    return f"{BASE_URL}/{deal_id}/panic_sell"
+
+def cancel_deal(deal_id: int) -> str:
+    return f"{BASE_URL}/{deal_id}/cancel"
+
+def add_funds(deal_id: int) -> str:
+    return f"{BASE_URL}/{deal_id}/add_funds"
+
+def cancel_order(deal_id: int) -> str:
+    return f"{BASE_URL}/{deal_id}/cancel_order"
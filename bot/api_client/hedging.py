@@ -0,0 +1,92 @@
+# api_client/hedging.py
+import asyncio
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from typing import Awaitable, Callable, Optional, Set, TypeVar
+
+from .circuit_breaker import circuit_breaker
+from .instrumentation import HEDGES, endpoint_family
+
+T = TypeVar("T")
+
+# Worker threads for hedged sync GETs; both attempts run here so either can answer first
+HEDGE_THREADS = 32
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(HEDGE_THREADS, thread_name_prefix="hedge")
+    return _executor
+
+
+def _won(endpoint: str, winner: str) -> None:
+    HEDGES.labels(endpoint_family(endpoint), winner).inc()
+
+
+async def hedged_async(endpoint: str, send: Callable[[], Awaitable[T]]) -> T:
+    """
+    Await `send()`; if it hasn't answered within the endpoint's hedge delay,
+    start a second identical attempt and return whichever succeeds first.
+    The other attempt is cancelled. Only use for idempotent requests.
+    """
+    delay = circuit_breaker.hedge_delay(endpoint)
+    if delay is None:
+        return await send()
+    primary = asyncio.ensure_future(send())
+    pending: Set["asyncio.Future[T]"] = {primary}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return primary.result()
+
+        circuit_breaker.hedged(endpoint)
+        hedge = asyncio.ensure_future(send())
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is None:
+                    _won(endpoint, "primary" if attempt is primary else "hedge")
+                    return attempt.result()
+        _won(endpoint, "none")
+        return primary.result()
+    finally:
+        # Also reached when the caller is cancelled while waiting on the primary
+        for attempt in pending:
+            attempt.cancel()
+
+
+def hedged_sync(endpoint: str, send: Callable[[], T]) -> T:
+    """
+    Blocking counterpart of `hedged_async`. A losing attempt can't be
+    interrupted; it finishes in the background and its result is dropped.
+    Both attempts run on hedge threads at the same time, so `send` must not
+    share a connection object such as a requests.Session between them.
+    """
+    delay = circuit_breaker.hedge_delay(endpoint)
+    if delay is None:
+        return send()
+    executor = _hedge_executor()
+    primary = executor.submit(send)
+    try:
+        return primary.result(timeout=delay)
+    except FutureTimeout:
+        pass
+
+    circuit_breaker.hedged(endpoint)
+    hedge = executor.submit(send)
+    pending: Set["Future[T]"] = {primary, hedge}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for attempt in done:
+            if attempt.exception() is None:
+                _won(endpoint, "primary" if attempt is primary else "hedge")
+                return attempt.result()
+    _won(endpoint, "none")
+    return primary.result()
@@ -0,0 +1,141 @@
+# api_client/http_pool.py
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from ..utils.logger import get_logger
+
+logger = get_logger("HTTPPool")
+
+# HTTP/2 needs the optional `h2` package (installed with `httpx[http2]`)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class HTTPPool:
+    """
+    Shared, lazily created httpx.AsyncClient with bounded keep-alive connections.
+
+    One instance is meant to live for the whole lifetime of a FastAPI app
+    (see `lifespan`) so every route reuses warm TCP/TLS connections instead of
+    opening a new client per request.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        http2: bool = True,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but 'h2' is not installed, falling back to HTTP/1.1")
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests_total = 0
+        self.errors_total = 0
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client; created on first use if the pool was not started explicitly"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    async def start(self) -> httpx.AsyncClient:
+        logger.info(
+            f"Starting HTTP pool (http2={self.http2}, max_connections={self.max_connections}, "
+            f"max_keepalive={self.max_keepalive_connections})"
+        )
+        return self.client
+
+    async def close(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    @asynccontextmanager
+    async def lifespan(self, app: Any) -> AsyncIterator[None]:
+        """FastAPI lifespan handler: `FastAPI(lifespan=pool.lifespan)`"""
+        await self.start()
+        try:
+            yield
+        finally:
+            await self.close()
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        client = self.client
+        self.in_flight += 1
+        self.requests_total += 1
+        if self.in_flight > self.peak_in_flight:
+            self.peak_in_flight = self.in_flight
+        try:
+            return await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors_total += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def _connections(self) -> Optional[List[Any]]:
+        """
+        Open connections of the client's pool, or None when they can't be read.
+
+        httpx has no public API for this, so it peeks at httpcore's pool and
+        gives up on anything unexpected rather than break stats().
+        """
+        if self._client is None:
+            return []
+        try:
+            pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+            connections = getattr(pool, "connections", None)
+            if connections is None:
+                return None
+            return [conn for conn in connections if callable(getattr(conn, "is_idle", None))]
+        except Exception:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool utilization snapshot; connection counts are None if the pool can't be inspected"""
+        connections = self._connections()
+        open_, idle, active = None, None, None
+        if connections is not None:
+            open_ = len(connections)
+            idle = sum(1 for conn in connections if conn.is_idle())
+            active = open_ - idle
+        return {
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "keepalive_expiry": self.keepalive_expiry,
+            "connections_open": open_,
+            "connections_idle": idle,
+            "connections_active": active,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "utilization": self.in_flight / self.max_connections if self.max_connections else 0.0,
+            "requests_total": self.requests_total,
+            "errors_total": self.errors_total,
+        }
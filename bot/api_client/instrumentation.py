@@ -0,0 +1,111 @@
+# api_client/instrumentation.py
+import re
+import time
+from functools import lru_cache
+from types import TracebackType
+from typing import Optional, Type, Union
+
+from ..utils.metrics import REGISTRY
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+REQUESTS = REGISTRY.counter(
+    "threecommas_requests_total",
+    "3Commas HTTP attempts by endpoint family, method, status and attempt number",
+    ("endpoint", "method", "status", "attempt"),
+)
+LATENCY = REGISTRY.histogram(
+    "threecommas_request_duration_seconds",
+    "Duration of a single 3Commas HTTP attempt",
+    ("endpoint", "method"),
+)
+RETRIES = REGISTRY.counter(
+    "threecommas_retries_total",
+    "3Commas attempts that were retried, by reason",
+    ("endpoint", "reason"),
+)
+ERRORS = REGISTRY.counter(
+    "threecommas_errors_total",
+    "3Commas calls that failed after all attempts, by error type",
+    ("endpoint", "error"),
+)
+IN_FLIGHT = REGISTRY.gauge(
+    "threecommas_requests_in_flight",
+    "3Commas HTTP attempts currently waiting for a response",
+    ("client",),
+)
+CIRCUIT_STATE = REGISTRY.gauge(
+    "threecommas_circuit_state",
+    "Circuit breaker state per endpoint family: 0 closed, 1 half-open, 2 open",
+    ("endpoint",),
+)
+CIRCUIT_REJECTED = REGISTRY.counter(
+    "threecommas_circuit_rejected_total",
+    "3Commas calls failed fast because their circuit was open",
+    ("endpoint",),
+)
+HEDGES = REGISTRY.counter(
+    "threecommas_hedged_requests_total",
+    "GETs that sent a second attempt after the hedge delay, by which attempt answered first",
+    ("endpoint", "winner"),
+)
+
+
+@lru_cache(maxsize=4096)
+def endpoint_family(path: str) -> str:
+    """'/public/api/ver1/bots/123/show?x=1' -> '/ver1/bots/:id/show'"""
+    path = path.split("?", 1)[0]
+    if path.startswith("/public/api"):
+        path = path[len("/public/api"):]
+    return _NUMERIC_SEGMENT.sub("/:id", path)
+
+
+def observe_attempt(path: str, method: str, status: Union[int, str], attempt: int, seconds: float) -> None:
+    """Record one HTTP attempt; `status` is the HTTP status or the transport error's name"""
+    family = endpoint_family(path)
+    REQUESTS.labels(family, method, status, attempt).inc()
+    LATENCY.labels(family, method).observe(seconds)
+
+
+def observe_retry(path: str, reason: str) -> None:
+    RETRIES.labels(endpoint_family(path), reason).inc()
+
+
+def observe_error(path: str, error: BaseException) -> None:
+    ERRORS.labels(endpoint_family(path), type(error).__name__).inc()
+
+
+class Attempt:
+    """
+    Times one HTTP attempt and records it on exit. Set `status` to the
+    response status; if the block raises first, the exception's name is used.
+
+        with Attempt("sync", endpoint, "GET", attempt) as timing:
+            response = session.request(...)
+            timing.status = response.status_code
+    """
+
+    __slots__ = ("client", "path", "method", "attempt", "status", "_started", "_in_flight")
+
+    def __init__(self, client: str, path: str, method: str, attempt: int):
+        self.client = client
+        self.path = path
+        self.method = method
+        self.attempt = attempt
+        self.status: Union[int, str, None] = None
+
+    def __enter__(self) -> "Attempt":
+        self._in_flight = IN_FLIGHT.labels(self.client)
+        self._in_flight.inc()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self._in_flight.dec()
+        status = self.status if self.status is not None else (exc_type.__name__ if exc_type else "unknown")
+        observe_attempt(self.path, self.method, status, self.attempt, time.perf_counter() - self._started)
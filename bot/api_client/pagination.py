@@ -0,0 +1,89 @@
+# api_client/pagination.py
+import asyncio
+import math
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, List, Optional
+
+# Keys under which 3Commas wraps list payloads and pagination totals
+ITEM_KEYS = ("data", "items", "bots", "events", "orders", "market_orders")
+TOTAL_KEYS = ("total", "total_count", "count")
+
+
+def default_items(page: Any) -> List[Any]:
+    if page is None:
+        return []
+    if isinstance(page, list):
+        return page
+    if isinstance(page, dict):
+        for key in ITEM_KEYS:
+            if isinstance(page.get(key), list):
+                return page[key]
+    return []
+
+
+def default_total(page: Any) -> Optional[int]:
+    if not isinstance(page, dict):
+        return None
+    for container in (page, page.get("meta"), page.get("pagination")):
+        if isinstance(container, dict):
+            for key in TOTAL_KEYS:
+                if isinstance(container.get(key), int):
+                    return container[key]
+    return None
+
+
+async def paginate(
+    fetch_page: Callable[[int], Awaitable[Any]],
+    page_size: int,
+    prefetch: int = 4,
+    items_of: Callable[[Any], List[Any]] = default_items,
+    total_of: Callable[[Any], Optional[int]] = default_total,
+) -> AsyncIterator[Any]:
+    """
+    Stream every item of a paginated endpoint.
+
+    `fetch_page(i)` fetches the zero-based page `i`. Once the first page reveals
+    the total, up to `prefetch` of the remaining pages are requested concurrently;
+    without a total the next page is fetched while the current one is consumed,
+    and iteration stops at the first short page. Items are yielded as soon as
+    their page arrives, so at most `prefetch` pages are held in memory.
+    """
+    first = await fetch_page(0)
+    items = items_of(first)
+    total = total_of(first)
+
+    if total is not None:
+        last_page: Optional[int] = max(0, math.ceil(total / page_size) - 1)
+        window = max(1, prefetch)
+    else:
+        last_page = None if len(items) >= page_size else 0
+        window = 1
+
+    pending: Deque["asyncio.Task[Any]"] = deque()
+    next_index = 1
+
+    def schedule() -> None:
+        nonlocal next_index
+        while len(pending) < window and (last_page is None or next_index <= last_page):
+            pending.append(asyncio.ensure_future(fetch_page(next_index)))
+            next_index += 1
+
+    try:
+        schedule()
+        for item in items:
+            yield item
+
+        while pending:
+            page = await pending.popleft()
+            items = items_of(page)
+            if last_page is None and len(items) < page_size:
+                last_page = next_index - 1
+            schedule()
+            for item in items:
+                yield item
+    finally:
+        # Wait for the cancelled prefetches so none outlives the iterator or
+        # leaves an exception unretrieved
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,244 @@
+# api_client/rate_limiter.py
+import asyncio
+import hashlib
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+logger = get_logger("RateLimiter")
+
+_FAMILY_RE = re.compile(r"^(?:/public/api)?(/ver\d+/[a-z_]+)")
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Group an endpoint into its rate-limit family, e.g. /public/api/ver1/bots/1/show -> /ver1/bots"""
+    match = _FAMILY_RE.match(endpoint.split("?", 1)[0])
+    return match.group(1) if match else "default"
+
+
+def key_id(api_key: str) -> str:
+    """Short, non-reversible label for an API key in stats and logs"""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:8]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as delta-seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _header(headers: Mapping[str, str], *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                continue
+    return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that queues callers instead of rejecting them.
+
+    `reserve` takes tokens immediately (the balance may go negative) and returns
+    how long the caller has to wait for its turn, so concurrent callers are
+    served in arrival order at exactly `rate` requests per second.
+
+    A server-imposed pause (`penalize`, or an exhausted budget in `update`)
+    also sets `blocked_until`; callers that were already sleeping on an
+    earlier reservation check it again when they wake up.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def blocked_for(self) -> float:
+        """Seconds left of a pause imposed after the caller's reservation was made"""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        waited = 0.0
+        delay = self.reserve(tokens)
+        while delay > 0:
+            time.sleep(delay)
+            waited += delay
+            delay = self.blocked_for()
+        return waited
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        waited = 0.0
+        delay = self.reserve(tokens)
+        while delay > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+            delay = self.blocked_for()
+        return waited
+
+    def update(
+        self,
+        limit: Optional[float] = None,
+        remaining: Optional[float] = None,
+        reset_after: Optional[float] = None,
+    ) -> None:
+        """Adopt the budget advertised by the server, keeping the configured window length"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit:
+                window = self.capacity / self.rate
+                self.capacity = limit
+                self.rate = limit / window
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+                if remaining <= 0 and reset_after:
+                    self._tokens = min(self._tokens, -reset_after * self.rate)
+                    self._blocked_until = max(self._blocked_until, now + reset_after)
+
+    def penalize(self, retry_after: float) -> None:
+        """Hold every queued and future caller back for at least `retry_after` seconds"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, -retry_after * self.rate)
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {"rate": self.rate, "capacity": self.capacity, "tokens": self._tokens}
+
+
+class RateLimiter:
+    """
+    Proactive client-side limiter shared by the sync/async clients and the gateway.
+
+    Every request takes a token from its API key's bucket and from the bucket of
+    its endpoint family; the caller waits for whichever is further behind.
+    Budgets are (requests, window seconds) and get replaced by whatever the
+    server advertises in its rate-limit headers.
+    """
+
+    KEY_LIMIT: Tuple[float, float] = (300, 60)
+    FAMILY_LIMITS: Dict[str, Tuple[float, float]] = {
+        "/ver1/bots": (120, 60),
+        "/ver1/accounts": (120, 60),
+        "/ver1/grid_bots": (120, 60),
+        "/ver1/deals": (120, 60),
+    }
+    DEFAULT_FAMILY_LIMIT: Tuple[float, float] = (60, 60)
+
+    def __init__(
+        self,
+        key_limit: Optional[Tuple[float, float]] = None,
+        family_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+    ):
+        self.key_limit = key_limit or self.KEY_LIMIT
+        self.family_limits = {**self.FAMILY_LIMITS, **(family_limits or {})}
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, api_key: str, family: str) -> TokenBucket:
+        key = (api_key, family)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    if family == "*":
+                        limit, window = self.key_limit
+                    else:
+                        limit, window = self.family_limits.get(family, self.DEFAULT_FAMILY_LIMIT)
+                    bucket = TokenBucket(rate=limit / window, capacity=limit)
+                    self._buckets[key] = bucket
+        return bucket
+
+    def _reserve(self, api_key: str, endpoint: str) -> float:
+        family = endpoint_family(endpoint)
+        return max(self._bucket(api_key, "*").reserve(), self._bucket(api_key, family).reserve())
+
+    def _blocked_for(self, api_key: str, endpoint: str) -> float:
+        family = endpoint_family(endpoint)
+        return max(self._bucket(api_key, "*").blocked_for(), self._bucket(api_key, family).blocked_for())
+
+    def acquire(self, api_key: str, endpoint: str) -> float:
+        """Block until the request may be sent; returns the time spent queued"""
+        waited = 0.0
+        delay = self._reserve(api_key, endpoint)
+        while delay > 0:
+            logger.debug("Rate limiter queued %s for %.3fs", endpoint, delay)
+            time.sleep(delay)
+            waited += delay
+            # A 429 seen while we slept pushes us behind its Retry-After
+            delay = self._blocked_for(api_key, endpoint)
+        return waited
+
+    async def acquire_async(self, api_key: str, endpoint: str) -> float:
+        waited = 0.0
+        delay = self._reserve(api_key, endpoint)
+        while delay > 0:
+            logger.debug("Rate limiter queued %s for %.3fs", endpoint, delay)
+            await asyncio.sleep(delay)
+            waited += delay
+            delay = self._blocked_for(api_key, endpoint)
+        return waited
+
+    def update_from_headers(self, api_key: str, endpoint: str, headers: Mapping[str, str]) -> None:
+        """Learn the endpoint family's budget from X-RateLimit-* / RateLimit-* / Retry-After headers"""
+        bucket = self._bucket(api_key, endpoint_family(endpoint))
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None:
+            bucket.penalize(retry_after)
+
+        limit = _header(headers, "X-RateLimit-Limit", "RateLimit-Limit")
+        remaining = _header(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        reset = _header(headers, "X-RateLimit-Reset", "RateLimit-Reset")
+        if limit is None and remaining is None:
+            return
+        # Reset is either seconds-until-reset or an epoch timestamp
+        if reset is not None and reset > 1e9:
+            reset = max(0.0, reset - time.time())
+        bucket.update(limit=limit, remaining=remaining, reset_after=reset)
+
+    def penalize(self, api_key: str, endpoint: str, retry_after: float) -> None:
+        self._bucket(api_key, endpoint_family(endpoint)).penalize(retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            f"{family}@{key_id(api_key)}": bucket.stats()
+            for (api_key, family), bucket in list(self._buckets.items())
+        }
+
+
+# Process-wide limiter shared by every client instance and the gateway
+rate_limiter = RateLimiter()
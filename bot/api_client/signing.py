@@ -0,0 +1,83 @@
+# api_client/signing.py
+import hashlib
+import hmac
+import json
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Union
+from urllib.parse import urlencode
+
+
+class SignedRequest(NamedTuple):
+    path: str
+    query: str              # encoded query string, exactly as signed
+    body: Optional[bytes]   # serialized JSON body, exactly as signed (None for GET/DELETE)
+    signature: str
+
+    @property
+    def target(self) -> str:
+        return f"{self.path}?{self.query}" if self.query else self.path
+
+
+def encode_query(params: Optional[Dict[str, Any]]) -> str:
+    """Deterministic query string: keys sorted, None values dropped, lists repeated"""
+    if not params:
+        return ""
+    return urlencode(sorted((k, v) for k, v in params.items() if v is not None), doseq=True)
+
+
+def encode_body(payload: Any) -> bytes:
+    """Compact JSON, serialized once and used both for the signature and the request body"""
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+class RequestSigner:
+    """
+    HMAC-SHA256 signer for the 3Commas API.
+
+    The secret is keyed into an HMAC object once; each signature copies that
+    pre-keyed state instead of re-encoding the secret and re-deriving the
+    inner/outer pads on every request.
+    """
+
+    def __init__(self, api_secret: Union[str, bytes]):
+        key = api_secret.encode("utf-8") if isinstance(api_secret, str) else api_secret
+        self._mac = hmac.new(key, digestmod=hashlib.sha256)
+
+    def sign(self, message: Union[str, bytes]) -> str:
+        mac = self._mac.copy()
+        mac.update(message.encode("utf-8") if isinstance(message, str) else message)
+        return mac.hexdigest()
+
+    def sign_request(self, request_path: str, query_string: str = "", request_body: bytes = b"") -> str:
+        target = f"{request_path}?{query_string}" if query_string else request_path
+        mac = self._mac.copy()
+        mac.update(target.encode("utf-8"))
+        if request_body:
+            mac.update(request_body)
+        return mac.hexdigest()
+
+    def prepare(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        empty_body: bytes = b"{}",
+    ) -> SignedRequest:
+        """
+        Serialize and sign a request in one pass.
+
+        GET/DELETE parameters go into the query string; other methods send
+        `params` as the JSON body (or `empty_body` when there is none).
+        """
+        if method.upper() in ("GET", "DELETE"):
+            query = encode_query(params)
+            return SignedRequest(path, query, None, self.sign_request(path, query))
+
+        body = encode_body(params) if params else empty_body
+        return SignedRequest(path, "", body, self.sign_request(path, request_body=body))
+
+
+@lru_cache(maxsize=32)
+def get_signer(api_secret: str) -> RequestSigner:
+    """Process-wide signer per secret"""
+    return RequestSigner(api_secret)
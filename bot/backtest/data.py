@@ -0,0 +1,88 @@
+# backtest/data.py
+from pathlib import Path
+from typing import Dict, Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+SUPPORTED_SUFFIXES = (".csv", ".parquet", ".pq", ".npy")
+NPY_COLUMNS = ["timestamp", "open", "high", "low", "close"]
+
+
+def load_ohlcv(path: Union[str, Path]) -> pd.DataFrame:
+    """
+    Load one OHLCV file (CSV or Parquet).
+
+    Expects timestamp/open/high/low/close/volume columns (ccxt's fetch_ohlcv
+    layout); timestamps may be epoch milliseconds, epoch seconds or ISO dates
+    and are normalized to epoch seconds. Rows are sorted by time.
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        return pd.DataFrame(load_npy(path), columns=NPY_COLUMNS).assign(volume=0.0)[OHLCV_COLUMNS]
+    if path.suffix in (".parquet", ".pq"):
+        # Needs pyarrow or fastparquet
+        df = pd.read_parquet(path)
+    elif path.suffix == ".csv":
+        df = pd.read_csv(path)
+    else:
+        raise ValueError(f"Unsupported OHLCV file type: {path}")
+
+    df.columns = [str(c).lower() for c in df.columns]
+    missing = [c for c in ("timestamp", "high", "low", "close") if c not in df.columns]
+    if missing:
+        raise ValueError(f"{path} is missing columns: {', '.join(missing)}")
+
+    timestamps = df["timestamp"]
+    if pd.api.types.is_numeric_dtype(timestamps):
+        # Epoch milliseconds (ccxt) vs seconds
+        seconds = timestamps.astype("float64")
+        if seconds.max() > 1e11:
+            seconds = seconds / 1000.0
+    else:
+        seconds = pd.to_datetime(timestamps, utc=True).astype("int64") / 1e9
+    df["timestamp"] = seconds
+
+    for column in ("open", "volume"):
+        if column not in df.columns:
+            df[column] = df["close"] if column == "open" else 0.0
+    return df[OHLCV_COLUMNS].sort_values("timestamp").reset_index(drop=True)
+
+
+def pair_name(path: Union[str, Path]) -> str:
+    """File name to pair, e.g. USDT_BTC.csv -> USDT_BTC"""
+    return Path(path).stem
+
+
+def discover(paths: Iterable[Union[str, Path]]) -> Dict[str, Path]:
+    """Map pair name -> file for the given files and directories"""
+    found: Dict[str, Path] = {}
+    for path in map(Path, paths):
+        files = sorted(path.iterdir()) if path.is_dir() else [path]
+        for file in files:
+            if file.suffix in SUPPORTED_SUFFIXES:
+                found[pair_name(file)] = file
+    return found
+
+
+def load_npy(path: Union[str, Path]) -> np.ndarray:
+    """
+    Memory-map a dataset written by write_dataset: an (n, 5) float64 array of
+    timestamp/open/high/low/close. Worker processes mapping the same file
+    share its pages through the OS cache instead of each holding a copy.
+    """
+    return np.load(path, mmap_mode="r")
+
+
+def write_dataset(paths: Iterable[Union[str, Path]], out_dir: Union[str, Path]) -> Dict[str, Path]:
+    """Convert OHLCV files to .npy once; returns pair -> .npy path"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written: Dict[str, Path] = {}
+    for pair, source in discover(paths).items():
+        target = out_dir / f"{pair}.npy"
+        if source != target and (not target.exists() or target.stat().st_mtime < source.stat().st_mtime):
+            np.save(target, load_ohlcv(source)[NPY_COLUMNS].to_numpy(dtype=np.float64))
+        written[pair] = target
+    return written
@@ -0,0 +1,345 @@
+# backtest/dca.py
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+DEFAULT_FEE = 0.001  # 0.1% taker per fill
+SCAN_CHUNK = 64      # bars examined per vectorized step; doubles while a deal stays open
+
+
+class DCAConfig(BaseModel):
+    """
+    Numeric view of a DCA bot's deal parameters.
+
+    Percentages are in percent (1.5 == 1.5%) like the 3Commas payload; volumes
+    are in quote currency. Only long deals are simulated.
+    """
+    base_order_volume: float
+    safety_order_volume: float
+    max_safety_orders: int
+    safety_order_step_percentage: float
+    martingale_volume_coefficient: float = 1.0
+    martingale_step_coefficient: float = 1.0
+    take_profit: float = 1.0
+    stop_loss_percentage: Optional[float] = None
+    trailing_enabled: bool = False
+    trailing_deviation: Optional[float] = None
+    take_profit_steps: List[Tuple[float, float]] = []  # (amount %, profit %)
+    cooldown: float = 0.0  # seconds between a close and the next deal
+    fee: float = DEFAULT_FEE
+
+    @classmethod
+    def from_payload(cls, payload: Any, fee: float = DEFAULT_FEE) -> "DCAConfig":
+        """
+        Build from a CreateDCABotPayload (either schema) or its dict form.
+        String numbers from bot/dca_bot/schemas.py are converted here.
+        """
+        data = payload if isinstance(payload, dict) else payload.dict()
+        if (data.get("strategy") or "long") != "long":
+            raise ValueError("Only long DCA bots can be backtested")
+
+        def optional(key: str) -> Optional[float]:
+            value = data.get(key)
+            return None if value in (None, "") else float(value)
+
+        def number(key: str, default: Optional[float] = None) -> float:
+            value = optional(key)
+            if value is not None:
+                return value
+            if default is None:
+                raise ValueError(f"{key} is required")
+            return default
+
+        steps = [
+            (float(step["amount_percentage"]), float(step["profit_percentage"]))
+            for step in (data.get("take_profit_steps") or [])
+        ]
+        return cls(
+            base_order_volume=number("base_order_volume"),
+            safety_order_volume=number("safety_order_volume"),
+            max_safety_orders=int(data["max_safety_orders"]),
+            safety_order_step_percentage=number("safety_order_step_percentage"),
+            martingale_volume_coefficient=number("martingale_volume_coefficient", 1.0),
+            martingale_step_coefficient=number("martingale_step_coefficient", 1.0),
+            take_profit=number("take_profit", 1.0),
+            stop_loss_percentage=optional("stop_loss_percentage") or None,
+            trailing_enabled=bool(data.get("trailing_enabled")),
+            trailing_deviation=optional("trailing_deviation"),
+            take_profit_steps=steps,
+            cooldown=number("cooldown", 0.0),
+            fee=fee,
+        )
+
+    def safety_orders(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Cumulative price deviation (fraction) and quote volume of each safety order"""
+        k = np.arange(self.max_safety_orders)
+        steps = self.safety_order_step_percentage / 100.0 * self.martingale_step_coefficient ** k
+        volumes = self.safety_order_volume * self.martingale_volume_coefficient ** k
+        return np.cumsum(steps), volumes
+
+    def required_capital(self) -> float:
+        return self.base_order_volume + float(self.safety_orders()[1].sum())
+
+
+class DCAResult(NamedTuple):
+    deals: int
+    wins: int
+    pnl: float                 # realized, quote currency, net of fees
+    pnl_percentage: float      # realized pnl over required capital
+    unrealized_pnl: float      # mark-to-market of a deal still open at the end
+    max_drawdown: float        # quote currency, on the marked-to-market equity curve
+    max_drawdown_percentage: float
+    avg_deal_duration: float   # seconds, closed deals
+    max_deal_duration: float
+    max_safety_orders_used: int
+    required_capital: float
+
+
+def entry_signals(strategy_list: Optional[List[Any]], df: pd.DataFrame) -> Optional[np.ndarray]:
+    """
+    Deal start conditions as a boolean array (None means nonstop).
+
+    Supports `nonstop`, `rsi` (options: points, period) and the local
+    `rsi_ema_scalping` strategy; any listed condition may start a deal.
+    """
+    conditions = []
+    for item in strategy_list or []:
+        item = item if isinstance(item, dict) else item.dict()
+        name, options = item.get("strategy"), item.get("options") or {}
+        if name == "nonstop":
+            return None
+        if name == "rsi":
+            from ta.momentum import RSIIndicator
+            rsi = RSIIndicator(df["close"].astype(float), window=int(options.get("period", 14))).rsi()
+            conditions.append((rsi < float(options.get("points", 30))).to_numpy())
+        elif name == "rsi_ema_scalping":
+            from ..strategies.scalping import BUY, RSIEMAScalpingStrategy
+            signals = RSIEMAScalpingStrategy(["backtest"], options).evaluate_batch(df)
+            conditions.append((signals == BUY).to_numpy())
+        else:
+            raise ValueError(f"Unsupported deal start condition: {name}")
+    if not conditions:
+        return None
+    return np.logical_or.reduce(conditions)
+
+
+def _chunks(start: int, n: int) -> Iterator[Tuple[int, int]]:
+    chunk = SCAN_CHUNK
+    while start < n:
+        end = min(n, start + chunk)
+        yield start, end
+        start, chunk = end, chunk * 2
+
+
+def simulate_dca(
+    config: DCAConfig,
+    timestamps: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    entries: Optional[np.ndarray] = None,
+) -> DCAResult:
+    """
+    Simulate a DCA bot over one pair's bars.
+
+    Deals open at a bar's close. Inside a deal everything is vectorized over
+    blocks of bars: a running minimum of the lows gives the number of safety
+    orders filled at each bar, which indexes precomputed average / take-profit /
+    stop-loss ladders, and the first bar hitting either side closes the deal.
+    When a bar reaches both a new safety order and the take profit, the fill
+    is assumed to come first; when it reaches both the stop loss and the take
+    profit, the stop loss wins.
+    """
+    n = len(close)
+    fee = config.fee
+    deviations, so_volumes = config.safety_orders()
+    m = len(so_volumes)
+    sl_fraction = (config.stop_loss_percentage or 0.0) / 100.0
+    trailing = (
+        config.trailing_deviation / 100.0
+        if config.trailing_enabled and config.trailing_deviation and not config.take_profit_steps
+        else None
+    )
+    steps = config.take_profit_steps
+    first_target = steps[0][1] if steps else config.take_profit
+
+    # Ladders per number of filled safety orders, relative to the entry price:
+    # a deal opened at price p holds unit_qty / p and averages p * unit_average
+    unit_levels = 1.0 - deviations
+    unit_qty = np.concatenate(([0.0], so_volumes / unit_levels)).cumsum() + config.base_order_volume
+    cost = np.concatenate(([0.0], so_volumes)).cumsum() + config.base_order_volume
+    buy_cost = cost * (1.0 + fee)
+    unit_average = cost / unit_qty
+    unit_tp = unit_average * (1.0 + first_target / 100.0)
+    unit_sl = unit_average * (1.0 - sl_fraction) if sl_fraction else np.full(m + 1, -np.inf)
+    ascending = unit_levels[::-1].copy()
+    sell_qty = unit_qty * (1.0 - fee)
+
+    starts = np.flatnonzero(entries) if entries is not None else None
+    realized_at = np.zeros(n)
+    unrealized = np.zeros(n)
+    durations: List[float] = []
+    wins = max_filled = 0
+    open_deal_pnl = 0.0
+
+    start = 0
+    while start < n:
+        if starts is not None:
+            i = int(np.searchsorted(starts, start))
+            if i == len(starts):
+                break
+            start = int(starts[i])
+
+        entry_price = close[start]
+        unrealized[start] = sell_qty[0] - buy_cost[0]
+        exit_bar, filled, trigger = n - 1, 0, None
+        low_so_far = np.inf
+        for j, end in _chunks(start + 1, n):
+            lows = low[j:end] / entry_price
+            running_min = np.minimum(np.minimum.accumulate(lows), low_so_far)
+            fills = m - np.searchsorted(ascending, running_min, side="left")
+            sl_hit = lows <= unit_sl[fills]
+            tp_hit = high[j:end] / entry_price >= unit_tp[fills]
+            done = sl_hit | tp_hit
+            stop = int(done.argmax()) if done.any() else end - j
+            held = fills[:stop]
+            unrealized[j:j + stop] = sell_qty[held] * (close[j:j + stop] / entry_price) - buy_cost[held]
+            if stop < end - j:
+                exit_bar, filled = j + stop, int(fills[stop])
+                trigger = "stop_loss" if sl_hit[stop] else "take_profit"
+                break
+            low_so_far = running_min[-1]
+            filled = int(fills[-1])
+
+        max_filled = max(max_filled, filled)
+        if trigger == "take_profit" and (trailing or steps):
+            trigger_bar = exit_bar
+            exit_bar, proceeds, closed = _close_after_trigger(
+                config, trailing, steps, trigger_bar, unit_qty[filled] / entry_price,
+                unit_average[filled] * entry_price, unit_sl[filled] * entry_price, high, low, n,
+            )
+            # Partial take-profit fills are left out of the mark-to-market
+            marked = slice(trigger_bar, exit_bar if closed else n)
+            unrealized[marked] = sell_qty[filled] * (close[marked] / entry_price) - buy_cost[filled]
+            if not closed:
+                open_deal_pnl = unrealized[n - 1]
+                break
+        elif trigger is not None:
+            unit_price = unit_sl[filled] if trigger == "stop_loss" else unit_tp[filled]
+            proceeds = sell_qty[filled] * unit_price
+        else:
+            open_deal_pnl = unrealized[n - 1]
+            break
+
+        pnl = proceeds - buy_cost[filled]
+        realized_at[exit_bar] += pnl
+        unrealized[exit_bar] = 0.0
+        durations.append(float(timestamps[exit_bar] - timestamps[start]))
+        wins += pnl > 0
+
+        next_start = exit_bar
+        if config.cooldown:
+            next_start = int(np.searchsorted(timestamps, timestamps[exit_bar] + config.cooldown, side="left"))
+        start = max(next_start, exit_bar)
+        if start >= n - 1:
+            break
+
+    equity = realized_at.cumsum() + unrealized
+    peaks = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+    max_drawdown = float((peaks - equity).max()) if n else 0.0
+    capital = config.required_capital()
+    pnl = float(realized_at.sum())
+    return DCAResult(
+        deals=len(durations),
+        wins=int(wins),
+        pnl=pnl,
+        pnl_percentage=pnl / capital * 100.0,
+        unrealized_pnl=float(open_deal_pnl),
+        max_drawdown=max_drawdown,
+        max_drawdown_percentage=max_drawdown / capital * 100.0,
+        avg_deal_duration=float(np.mean(durations)) if durations else 0.0,
+        max_deal_duration=max(durations, default=0.0),
+        max_safety_orders_used=max_filled,
+        required_capital=capital,
+    )
+
+
+def _close_after_trigger(
+    config: DCAConfig,
+    trailing: Optional[float],
+    steps: List[Tuple[float, float]],
+    trigger_bar: int,
+    qty: float,
+    average: float,
+    stop_loss: float,
+    high: np.ndarray,
+    low: np.ndarray,
+    n: int,
+) -> Tuple[int, float, bool]:
+    """
+    Exit of a deal whose take profit was reached while trailing or split into
+    steps. No more safety orders fill from here. Returns (exit bar, sell
+    proceeds so far, fully closed).
+    """
+    keep = 1.0 - config.fee
+    peak = high[trigger_bar]
+
+    if trailing:
+        for j, end in _chunks(trigger_bar + 1, n):
+            peaks = np.maximum(np.maximum.accumulate(high[j:end]), peak)
+            previous = np.concatenate(([peak], peaks[:-1]))
+            hit = low[j:end] <= previous * (1.0 - trailing)
+            if hit.any():
+                k = int(hit.argmax())
+                return j + k, qty * previous[k] * (1.0 - trailing) * keep, True
+            peak = peaks[-1]
+        return n - 1, 0.0, False
+
+    targets = np.array([average * (1.0 + profit / 100.0) for _, profit in steps])
+    amounts = np.array([amount / 100.0 for amount, _ in steps]) * qty
+    proceeds, sold, done = amounts[0] * targets[0] * keep, amounts[0], 1
+    exit_bar = trigger_bar
+    for j, end in _chunks(trigger_bar + 1, n):
+        if done == len(steps):
+            break
+        peaks = np.maximum(np.maximum.accumulate(high[j:end]), peak)
+        sl_hit = low[j:end] <= stop_loss
+        sl_at = int(sl_hit.argmax()) if sl_hit.any() else end - j
+        reached = np.searchsorted(peaks, targets[done:], side="left")
+        for offset, at in enumerate(reached):
+            if at >= sl_at or at >= end - j:
+                break
+            step = done + offset
+            proceeds += amounts[step] * targets[step] * keep
+            sold += amounts[step]
+            exit_bar = j + int(at)
+        done += int(np.sum((reached < sl_at) & (reached < end - j)))
+        if sl_at < end - j and done < len(steps):
+            return j + sl_at, proceeds + (qty - sold) * stop_loss * keep, True
+        peak = peaks[-1]
+    if done < len(steps):
+        return n - 1, proceeds, False
+    return exit_bar, proceeds + max(qty - sold, 0.0) * targets[-1] * keep, True
+
+
+def backtest_frame(
+    config: Union[DCAConfig, Any],
+    df: pd.DataFrame,
+    strategy_list: Optional[List[Any]] = None,
+) -> DCAResult:
+    """Run a DCA config (or bot payload) over an OHLCV frame"""
+    if not isinstance(config, DCAConfig):
+        strategy_list = strategy_list if strategy_list is not None else (
+            config.get("strategy_list") if isinstance(config, dict) else getattr(config, "strategy_list", None)
+        )
+        config = DCAConfig.from_payload(config)
+    return simulate_dca(
+        config,
+        df["timestamp"].to_numpy(dtype=float),
+        df["high"].to_numpy(dtype=float),
+        df["low"].to_numpy(dtype=float),
+        df["close"].to_numpy(dtype=float),
+        entry_signals(strategy_list, df),
+    )
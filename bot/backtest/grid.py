@@ -0,0 +1,75 @@
+# backtest/grid.py
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from ..strategies.grid import GridEngine, grid_levels
+from .dca import DEFAULT_FEE
+
+
+class GridConfig(BaseModel):
+    """Numeric view of a grid bot's price range, order size and range options"""
+    lower_price: float
+    upper_price: float
+    grids_quantity: int
+    quantity_per_grid: float
+    grid_type: str = "arithmetic"
+    order_currency_type: str = "base"
+    trailing_up_enabled: bool = False
+    trailing_down_enabled: bool = False
+    expansion_up_enabled: bool = False
+    expansion_down_enabled: bool = False
+    expansion_up_stop_price: Optional[float] = None
+    expansion_down_stop_price: Optional[float] = None
+    fee: float = DEFAULT_FEE
+
+    @classmethod
+    def from_payload(cls, payload: Any, fee: float = DEFAULT_FEE) -> "GridConfig":
+        data = payload if isinstance(payload, dict) else payload.dict()
+        fields = {name: data[name] for name in cls.model_fields if data.get(name) is not None}
+        return cls(**{**fields, "fee": fee})
+
+    def levels(self) -> np.ndarray:
+        return grid_levels(self.lower_price, self.upper_price, self.grids_quantity, self.grid_type)
+
+    def engine(self) -> GridEngine:
+        return GridEngine.from_payload(self.dict(), fee=self.fee)
+
+
+class GridResult(NamedTuple):
+    round_trips: int
+    pnl: float                # realized, quote currency, net of fees
+    pnl_percentage: float     # realized pnl over required capital
+    unrealized_pnl: float     # inventory still held at the end, marked at the last price
+    required_capital: float   # quote needed for the initial buys and resting buy orders
+    time_in_range: float      # fraction of the price path inside the initial [lower, upper]
+    shifts: int               # trailing moves and expansions
+
+
+def ohlc_path(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Bars to a price path: open, low, high, close for up bars and open, high, low, close for down bars"""
+    up = close >= open_
+    path = np.empty((len(close), 4))
+    path[:, 0] = open_
+    path[:, 1] = np.where(up, low, high)
+    path[:, 2] = np.where(up, high, low)
+    path[:, 3] = close
+    return path.ravel()
+
+
+def simulate_grid(config: GridConfig, prices: np.ndarray) -> GridResult:
+    """Run a grid config over a price path with the local grid engine"""
+    engine = config.engine()
+    result = engine.simulate(prices)
+    capital = engine.required_balances(float(prices[0]))["total_quote"]
+    in_range = (prices >= config.lower_price) & (prices <= config.upper_price)
+    return GridResult(
+        round_trips=result.round_trips,
+        pnl=result.realized_pnl,
+        pnl_percentage=result.realized_pnl / capital * 100.0 if capital else 0.0,
+        unrealized_pnl=result.unrealized_pnl,
+        required_capital=capital,
+        time_in_range=float(in_range.mean()),
+        shifts=result.shifts,
+    )
@@ -0,0 +1,335 @@
+# backtest/optimizer.py
+import hashlib
+import json
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..utils.logger import get_logger
+from .data import load_npy, write_dataset
+from .dca import DEFAULT_FEE, DCAConfig, entry_signals, simulate_dca
+from .grid import GridConfig, ohlc_path, simulate_grid
+
+logger = get_logger("Optimizer")
+
+Params = Dict[str, Any]
+
+
+class Trial(NamedTuple):
+    params: Params
+    score: float
+    metrics: Optional[Dict[str, float]]
+
+
+class SearchSpace:
+    """
+    Parameter ranges keyed by payload field name.
+
+    A list is a set of choices; a (low, high) tuple is a range, integer when
+    both bounds are ints. Ranges are discretized into `steps` points for grid
+    search and rounded to `precision` decimals when sampled, so equivalent
+    configs share a cache entry.
+    """
+
+    def __init__(self, space: Dict[str, Union[Sequence[Any], tuple]], precision: int = 4):
+        self.space = space
+        self.precision = precision
+        self.names = list(space)
+
+    def _is_range(self, name: str) -> bool:
+        return isinstance(self.space[name], tuple)
+
+    def _is_int(self, name: str) -> bool:
+        return all(isinstance(bound, int) for bound in self.space[name])
+
+    def grid(self, steps: int = 5) -> List[Params]:
+        axes = []
+        for name in self.names:
+            if not self._is_range(name):
+                axes.append(list(self.space[name]))
+            elif self._is_int(name):
+                low, high = self.space[name]
+                axes.append(sorted({int(v) for v in np.linspace(low, high, steps).round()}))
+            else:
+                low, high = self.space[name]
+                axes.append([round(float(v), self.precision) for v in np.linspace(low, high, steps)])
+        return [dict(zip(self.names, values)) for values in product(*axes)]
+
+    def sample(self, rng: np.random.Generator) -> Params:
+        return self.from_unit(rng.random(len(self.names)))
+
+    def from_unit(self, unit: np.ndarray) -> Params:
+        """Map a point in [0, 1]^d onto the space"""
+        params: Params = {}
+        for name, u in zip(self.names, np.clip(unit, 0.0, 1.0)):
+            if not self._is_range(name):
+                choices = self.space[name]
+                params[name] = choices[min(int(u * len(choices)), len(choices) - 1)]
+            else:
+                low, high = self.space[name]
+                value = low + u * (high - low)
+                params[name] = int(round(value)) if self._is_int(name) else round(float(value), self.precision)
+        return params
+
+    def to_unit(self, params: Params) -> np.ndarray:
+        unit = []
+        for name in self.names:
+            if not self._is_range(name):
+                choices = list(self.space[name])
+                unit.append((choices.index(params[name]) + 0.5) / len(choices))
+            else:
+                low, high = self.space[name]
+                unit.append((params[name] - low) / (high - low) if high != low else 0.5)
+        return np.array(unit)
+
+
+# Worker state, set by _init_worker in each process
+_KIND = "dca"
+_BASE: Dict[str, Any] = {}
+_DATASET: Dict[str, str] = {}
+_FEE = DEFAULT_FEE
+
+
+def _init_worker(kind: str, base: Dict[str, Any], dataset: Dict[str, str], fee: float) -> None:
+    global _KIND, _BASE, _DATASET, _FEE
+    _KIND, _BASE, _DATASET, _FEE = kind, base, dataset, fee
+    _dca_inputs.cache_clear()
+    _grid_path.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _dca_inputs(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    bars = load_npy(path)
+    entries = None
+    if _BASE.get("strategy_list"):
+        import pandas as pd
+        df = pd.DataFrame({"high": bars[:, 2], "low": bars[:, 3], "close": bars[:, 4]})
+        entries = entry_signals(_BASE["strategy_list"], df)
+    return bars[:, 0], bars[:, 2], bars[:, 3], bars[:, 4], entries
+
+
+@lru_cache(maxsize=None)
+def _grid_path(path: str) -> np.ndarray:
+    bars = load_npy(path)
+    return ohlc_path(bars[:, 1], bars[:, 2], bars[:, 3], bars[:, 4])
+
+
+def _evaluate(params: Params) -> Optional[Dict[str, float]]:
+    """Backtest one config over every pair; metrics are averaged across pairs"""
+    data = {**_BASE, **params}
+    try:
+        if _KIND == "grid":
+            grid = GridConfig.from_payload(data, fee=_FEE)
+            results = [simulate_grid(grid, _grid_path(path))._asdict() for path in _DATASET.values()]
+        else:
+            dca = DCAConfig.from_payload(data, fee=_FEE)
+            results = [simulate_dca(dca, *_dca_inputs(path))._asdict() for path in _DATASET.values()]
+    except ValueError:
+        return None  # e.g. lower_price >= upper_price
+
+    metrics = {key: float(np.mean([r[key] for r in results])) for key in results[0]}
+    if "max_drawdown_percentage" in metrics:
+        metrics["worst_drawdown_percentage"] = max(r["max_drawdown_percentage"] for r in results)
+    return metrics
+
+
+class Optimizer:
+    """
+    Parameter search for DCA or grid bot payloads.
+
+    Price files are converted once to .npy and memory-mapped by every worker,
+    so a pool of processes shares one copy of the data. Each evaluated config
+    is cached (in memory, and in a JSONL file when `cache_path` is given) keyed
+    by base payload, parameters and dataset, so repeated or overlapping
+    searches only backtest what is new.
+    """
+
+    TPE_GAMMA = 0.25       # share of trials treated as "good" by bayesian_search
+    TPE_CANDIDATES = 64    # candidates drawn per suggestion
+
+    def __init__(
+        self,
+        base_payload: Any,
+        paths: Iterable[Union[str, Path]],
+        space: Union[SearchSpace, Dict[str, Any]],
+        objective: str = "pnl_percentage",
+        max_drawdown: Optional[float] = None,
+        processes: Optional[int] = None,
+        dataset_dir: Optional[Union[str, Path]] = None,
+        cache_path: Optional[Union[str, Path]] = None,
+        fee: float = DEFAULT_FEE,
+    ):
+        self.base_payload = base_payload
+        self.base = base_payload if isinstance(base_payload, dict) else base_payload.dict()
+        self.kind = "grid" if "grids_quantity" in self.base else "dca"
+        self.space = space if isinstance(space, SearchSpace) else SearchSpace(space)
+        self.objective = objective
+        self.max_drawdown = max_drawdown
+        self.processes = processes or os.cpu_count() or 1
+        self.fee = fee
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Without a dataset_dir the .npy copies live until close()
+        self._tmpdir: Optional[tempfile.TemporaryDirectory] = None
+        if dataset_dir is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="backtest_dataset_")
+            dataset_dir = self._tmpdir.name
+        self.dataset = {pair: str(path) for pair, path in write_dataset(paths, dataset_dir).items()}
+        if not self.dataset:
+            self.close()
+            raise ValueError("No OHLCV files found")
+
+        fingerprint = {pair: os.path.getmtime(path) for pair, path in self.dataset.items()}
+        self._cache_prefix = json.dumps(
+            {"kind": self.kind, "base": self.base, "data": fingerprint, "fee": fee}, sort_keys=True, default=str
+        )
+        self.trials: Dict[str, Trial] = {}
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._cached: Dict[str, Dict[str, Any]] = self._load_cache()
+
+    def __enter__(self) -> "Optimizer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+    def _key(self, params: Params) -> str:
+        raw = self._cache_prefix + json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+        with self.cache_path.open() as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        return {entry["key"]: entry for entry in entries}
+
+    def _score(self, metrics: Optional[Dict[str, float]]) -> float:
+        if metrics is None:
+            return -math.inf
+        if self.max_drawdown is not None and metrics.get("worst_drawdown_percentage", 0.0) > self.max_drawdown:
+            return -math.inf
+        return metrics[self.objective]
+
+    def evaluate(self, candidates: Iterable[Params]) -> List[Trial]:
+        """Backtest the candidates not already evaluated; returns their trials in order"""
+        keyed = {self._key(params): params for params in candidates}
+        pending = {key: params for key, params in keyed.items() if key not in self.trials}
+        for key in list(pending):
+            if key in self._cached:
+                metrics = self._cached[key]["metrics"]
+                self.trials[key] = Trial(pending.pop(key), self._score(metrics), metrics)
+
+        if pending:
+            init_args = (self.kind, self.base, self.dataset, self.fee)
+            if self.processes == 1:
+                _init_worker(*init_args)
+                outcomes = [_evaluate(params) for params in pending.values()]
+            else:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=init_args)
+                chunksize = max(1, len(pending) // (self.processes * 4))
+                outcomes = list(self._pool.map(_evaluate, pending.values(), chunksize=chunksize))
+
+            lines = []
+            for (key, params), metrics in zip(pending.items(), outcomes):
+                self.trials[key] = Trial(params, self._score(metrics), metrics)
+                lines.append(json.dumps({"key": key, "params": params, "metrics": metrics}))
+            if self.cache_path:
+                with self.cache_path.open("a") as f:
+                    f.write("\n".join(lines) + "\n")
+            logger.info(f"Evaluated {len(pending)} configs ({len(self.trials)} total), best {self.best().score:.4f}")
+        return [self.trials[key] for key in keyed]
+
+    def grid_search(self, steps: int = 5) -> List[Trial]:
+        return self.evaluate(self.space.grid(steps))
+
+    def random_search(self, n: int, seed: Optional[int] = None) -> List[Trial]:
+        rng = np.random.default_rng(seed)
+        return self.evaluate(self.space.sample(rng) for _ in range(n))
+
+    def bayesian_search(
+        self, n: int, warmup: int = 20, batch: Optional[int] = None, seed: Optional[int] = None
+    ) -> List[Trial]:
+        """
+        Tree-structured Parzen estimator search: after `warmup` random trials,
+        each round samples candidates around the best TPE_GAMMA share of trials
+        and keeps those most likely under the good density relative to the
+        rest. Rounds are `batch` configs (default: one per process) so the pool
+        stays busy.
+        """
+        rng = np.random.default_rng(seed)
+        batch = batch or self.processes
+        trials = self.random_search(min(warmup, n), seed=seed) if len(self.trials) < warmup else []
+        while len(trials) < n:
+            suggestions = self._suggest(min(batch, n - len(trials)), rng)
+            trials.extend(self.evaluate(suggestions))
+        return trials
+
+    def _suggest(self, count: int, rng: np.random.Generator) -> List[Params]:
+        history = list(self.trials.values())
+        points = np.array([self.space.to_unit(t.params) for t in history])
+        scores = np.array([t.score for t in history])
+        order = np.argsort(-scores, kind="stable")
+        n_good = max(1, int(math.ceil(self.TPE_GAMMA * len(history))))
+        good, bad = points[order[:n_good]], points[order[n_good:]]
+        bandwidth = np.maximum(points.std(axis=0) * len(points) ** -0.2, 0.02)
+
+        centers = good[rng.integers(len(good), size=count * self.TPE_CANDIDATES)]
+        candidates = np.clip(centers + rng.normal(0.0, 1.0, centers.shape) * bandwidth, 0.0, 1.0)
+        ratio = self._density(candidates, good, bandwidth) / (self._density(candidates, bad, bandwidth) + 1e-12)
+
+        suggestions: Dict[str, Params] = {}
+        for index in np.argsort(-ratio):
+            params = self.space.from_unit(candidates[index])
+            key = self._key(params)
+            if key not in self.trials and key not in suggestions:
+                suggestions[key] = params
+                if len(suggestions) == count:
+                    break
+        while len(suggestions) < count:  # space exhausted around the good region
+            params = self.space.sample(rng)
+            suggestions.setdefault(self._key(params), params)
+        return list(suggestions.values())
+
+    @staticmethod
+    def _density(x: np.ndarray, centers: np.ndarray, bandwidth: np.ndarray) -> np.ndarray:
+        if not len(centers):
+            return np.ones(len(x))
+        z = (x[:, None, :] - centers[None, :, :]) / bandwidth
+        return np.exp(-0.5 * (z ** 2).sum(axis=2)).mean(axis=1)
+
+    def best(self) -> Trial:
+        return max(self.trials.values(), key=lambda t: t.score)
+
+    def ranked(self, n: int = 10) -> List[Trial]:
+        trials = [t for t in self.trials.values() if t.score > -math.inf]
+        return sorted(trials, key=lambda t: t.score, reverse=True)[:n]
+
+    def to_payload(self, params: Params) -> Any:
+        """Base payload with the given parameters applied, keeping its field types"""
+        data = dict(self.base)
+        for name, value in params.items():
+            data[name] = str(value) if isinstance(data.get(name), str) else value
+        if isinstance(self.base_payload, dict):
+            return data
+        return type(self.base_payload)(**data)
+
+    def top(self, n: int = 10) -> List[Any]:
+        """The n best configs as ready-to-submit payloads"""
+        return [self.to_payload(trial.params) for trial in self.ranked(n)]
@@ -0,0 +1,104 @@
+# backtest/runner.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..utils.logger import get_logger
+from .data import discover, load_ohlcv
+from .dca import DCAConfig, entry_signals, simulate_dca
+
+logger = get_logger("Backtest")
+
+Job = Tuple[int, str, str]  # (config index, pair, file path)
+
+
+# Set per worker by _init_worker
+_CONFIGS: List[DCAConfig] = []
+_STRATEGY_LIST: Optional[List[Any]] = None
+
+
+def _init_worker(configs: List[DCAConfig], strategy_list: Optional[List[Any]]) -> None:
+    global _CONFIGS, _STRATEGY_LIST
+    _CONFIGS, _STRATEGY_LIST = configs, strategy_list
+    _load_pair.cache_clear()
+
+
+@lru_cache(maxsize=64)
+def _load_pair(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """Per-process cache: each worker parses a file once for all configs"""
+    df = load_ohlcv(path)
+    entries = entry_signals(_STRATEGY_LIST, df)
+    return (
+        df["timestamp"].to_numpy(dtype=float),
+        df["high"].to_numpy(dtype=float),
+        df["low"].to_numpy(dtype=float),
+        df["close"].to_numpy(dtype=float),
+        entries,
+    )
+
+
+def _run_jobs(jobs: List[Job]) -> List[Dict[str, Any]]:
+    rows = []
+    for index, pair, path in jobs:
+        timestamps, high, low, close, entries = _load_pair(path)
+        result = simulate_dca(_CONFIGS[index], timestamps, high, low, close, entries)
+        rows.append({"config": index, "pair": pair, **result._asdict()})
+    return rows
+
+
+def run_backtests(
+    configs: Sequence[Union[DCAConfig, Any]],
+    paths: Iterable[Union[str, Path]],
+    strategy_list: Optional[List[Any]] = None,
+    processes: Optional[int] = None,
+    jobs_per_task: int = 32,
+) -> pd.DataFrame:
+    """
+    Backtest every config against every pair file (CSV/Parquet) in `paths`.
+
+    Configs may be DCAConfig or bot payloads. Jobs are grouped by pair so a
+    worker reuses its parsed bars; pass processes=1 to run in-process.
+    Returns one row per (config, pair).
+    """
+    configs = [c if isinstance(c, DCAConfig) else DCAConfig.from_payload(c) for c in configs]
+    files = discover(paths)
+    if not files:
+        raise ValueError("No OHLCV files found")
+
+    jobs = [(index, pair, str(path)) for (pair, path), index in product(files.items(), range(len(configs)))]
+    tasks = [jobs[i:i + jobs_per_task] for i in range(0, len(jobs), jobs_per_task)]
+    processes = processes or os.cpu_count() or 1
+    logger.info(f"Backtesting {len(configs)} configs x {len(files)} pairs on {processes} processes")
+
+    rows: List[Dict[str, Any]] = []
+    if processes == 1:
+        _init_worker(configs, strategy_list)
+        for task in tasks:
+            rows.extend(_run_jobs(task))
+    else:
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(configs, strategy_list)) as pool:
+            for chunk in pool.map(_run_jobs, tasks):
+                rows.extend(chunk)
+    return pd.DataFrame(rows)
+
+
+def summarize(results: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate per-pair rows into one row per config, best total PnL first"""
+    grouped = results.groupby("config")
+    summary = pd.DataFrame({
+        "pairs": grouped["pair"].count(),
+        "deals": grouped["deals"].sum(),
+        "win_rate": grouped["wins"].sum() / grouped["deals"].sum().clip(lower=1),
+        "pnl": grouped["pnl"].sum(),
+        "pnl_percentage": grouped["pnl_percentage"].mean(),
+        "worst_drawdown_percentage": grouped["max_drawdown_percentage"].max(),
+        "avg_deal_duration": grouped["avg_deal_duration"].mean(),
+        "max_deal_duration": grouped["max_deal_duration"].max(),
+    })
+    return summary.sort_values("pnl", ascending=False)
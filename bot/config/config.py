@@ -3,9 +3,30 @@ import os
 
 load_dotenv() 
 
-THREE_COMMAS_API_KEY = os.environ.get("THREE_COMMAS_API_KEY")
-THREE_COMMAS_API_SECRET = os.environ.get("THREE_COMMAS_API_SECRET")
+THREE_COMMAS_API_KEY = os.environ.get("THREE_COMMAS_API_KEY", "")
+THREE_COMMAS_API_SECRET = os.environ.get("THREE_COMMAS_API_SECRET", "")
 PRIVATE_KEY_PATH = os.environ.get("PRIVATE_KEY_PATH", "keys/private_key.pem")
 THREE_COMMAS_BASE_URL = os.environ.get("THREE_COMMAS_BASE_URL", "https://api.3commas.io")
+
+# Shared HTTP connection pool used by the FastAPI gateways
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP2_ENABLED = os.environ.get("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+# Send a second GET to 3Commas when the first is slower than the endpoint's recent p95
+HEDGE_GETS = os.environ.get("HEDGE_GETS", "false").lower() in ("1", "true", "yes")
+
+# Inbound TradingView-style signals: accepted secrets (comma-separated, e.g. bots' url_secret values),
+# max age of a signal's timestamp, dedup window and an optional append-only log
+SIGNAL_SECRETS = [s for s in os.environ.get("SIGNAL_SECRETS", "").split(",") if s]
+SIGNAL_MAX_LAG = float(os.environ.get("SIGNAL_MAX_LAG", "300"))
+SIGNAL_DEDUP_WINDOW = float(os.environ.get("SIGNAL_DEDUP_WINDOW", "300"))
+SIGNAL_LOG_PATH = os.environ.get("SIGNAL_LOG_PATH") or None
+
+# Default number of concurrent upstream calls for batch bot operations
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "10"))
+
 if not THREE_COMMAS_API_KEY or not THREE_COMMAS_API_SECRET:
     raise ValueError("THREE_COMMAS_API_KEY and THREE_COMMAS_API_SECRET must be set in environment variables.")
\ No newline at end of file
@@ -0,0 +1,428 @@
+# core/bot_manager.py
+import asyncio
+import importlib
+import inspect
+import multiprocessing as mp
+import os
+import queue
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..utils.logger import get_logger, shutdown as shutdown_logging
+from .engine import MarketEvent, SignalHandler, TradingEngine
+
+logger = get_logger("BotManager")
+
+# source_factory(symbols) -> async MarketEvent iterators feeding one worker; must be picklable
+SourceFactory = Callable[[List[str]], Iterable[AsyncIterator[MarketEvent]]]
+
+
+@dataclass(frozen=True)
+class StrategySpec:
+    """Picklable recipe for a strategy instance running in a worker process"""
+    name: str
+    factory: Union[str, Callable[..., Any]]  # "package.module:Class" or a module-level callable
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    symbols: Optional[Tuple[str, ...]] = None
+    interval: Optional[float] = None
+    account_id: Optional[int] = None
+
+
+def _resolve(factory: Union[str, Callable[..., Any]]) -> Callable[..., Any]:
+    if callable(factory):
+        return factory
+    module, _, attr = factory.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+# -- worker process ---------------------------------------------------------
+
+def _worker_main(
+    shard: int,
+    specs: List[StrategySpec],
+    commands: "mp.Queue[Any]",
+    results: "mp.Queue[Any]",
+    source_factory: Optional[SourceFactory],
+    report_interval: float,
+) -> None:
+    try:
+        asyncio.run(_worker(shard, specs, commands, results, source_factory, report_interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_logging()  # workers exit without running atexit hooks
+
+
+async def _worker(
+    shard: int,
+    specs: List[StrategySpec],
+    commands: "mp.Queue[Any]",
+    results: "mp.Queue[Any]",
+    source_factory: Optional[SourceFactory],
+    report_interval: float,
+) -> None:
+    loop = asyncio.get_running_loop()
+    engine = TradingEngine(on_signal=lambda name, signal, event: results.put(("signal", shard, name, signal, event)))
+    pumps: List["asyncio.Task[Any]"] = []
+    subscribed: Optional[frozenset] = None
+
+    def add(spec: StrategySpec) -> None:
+        try:
+            strategy = _resolve(spec.factory)(**spec.kwargs)
+            engine.add_strategy(strategy, name=spec.name, interval=spec.interval, symbols=spec.symbols)
+        except Exception as e:
+            logger.error(f"Worker {shard} could not start {spec.name}: {e}")
+            results.put(("failed", shard, spec.name, str(e)))
+
+    def resubscribe() -> None:
+        """Restart the market data sources when the shard's symbol set changes"""
+        nonlocal subscribed
+        if source_factory is None:
+            return
+        symbols = frozenset(s for runner in engine.runners.values() for s in runner.symbols or ())
+        if symbols == subscribed:
+            return
+        subscribed = symbols
+        for task in pumps:
+            task.cancel()
+        pumps[:] = [asyncio.create_task(engine.pump(source)) for source in source_factory(sorted(symbols))]
+
+    async def control() -> None:
+        while True:
+            command = await loop.run_in_executor(None, _get, commands, report_interval)
+            if command is None:
+                continue
+            op, payload = command
+            if op == "stop":
+                engine.stop()
+                return
+            if op == "add":
+                add(payload)
+            elif op == "remove":
+                engine.remove_strategy(payload)
+            resubscribe()
+
+    async def report() -> None:
+        while True:
+            await asyncio.sleep(report_interval)
+            results.put(("stats", shard, os.getpid(), engine.stats()))
+
+    for spec in specs:
+        add(spec)
+    tasks = [asyncio.create_task(control()), asyncio.create_task(report())]
+    engine_task = asyncio.create_task(engine.run())
+    await asyncio.sleep(0)
+    resubscribe()
+    try:
+        await engine_task
+    finally:
+        for task in [*tasks, *pumps]:
+            task.cancel()
+        results.put(("stats", shard, os.getpid(), engine.stats()))
+
+
+def _get(q: "mp.Queue[Any]", timeout: float) -> Any:
+    try:
+        return q.get(timeout=timeout)
+    except queue.Empty:
+        return None
+
+
+# -- supervisor -------------------------------------------------------------
+
+class Shard:
+    """Parent-side view of one worker process"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[mp.process.BaseProcess] = None
+        self.commands: Optional["mp.Queue[Any]"] = None
+        self.specs: Dict[str, StrategySpec] = {}
+        self.restarts: List[float] = []
+        self.next_start = 0.0
+        self.retired = False
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def send(self, op: str, payload: Any = None) -> None:
+        if self.alive and self.commands is not None:
+            self.commands.put((op, payload))
+
+
+class BotManager:
+    """
+    Supervises many strategy instances sharded across worker processes.
+
+    Each worker runs a TradingEngine over its share of the strategies and
+    reports signals and per-strategy stats back to the parent, which forwards
+    signals to `on_signal` (e.g. OrderExecutor.on_signal). Crashed workers are
+    restarted with backoff and their strategies re-created; a worker that keeps
+    crashing is retired and its strategies spread over the others, except the
+    last live one, which keeps being restarted every MAX_BACKOFF seconds. Every
+    `rebalance_interval` seconds strategies move from the busiest to the
+    idlest worker, by measured CPU time, while the spread exceeds `imbalance`.
+    Strategy state is not carried over a move or a restart.
+    """
+
+    REPORT_INTERVAL = 2.0
+    REBALANCE_INTERVAL = 60.0
+    IMBALANCE = 0.25
+    MAX_MOVES = 4
+    MAX_RESTARTS = 5      # within RESTART_WINDOW before a worker is retired
+    RESTART_WINDOW = 300.0
+    MAX_BACKOFF = 30.0
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        on_signal: Optional[SignalHandler] = None,
+        source_factory: Optional[SourceFactory] = None,
+        report_interval: float = REPORT_INTERVAL,
+        rebalance_interval: float = REBALANCE_INTERVAL,
+        imbalance: float = IMBALANCE,
+        mp_context: Optional[str] = None,
+    ):
+        self.on_signal = on_signal
+        self.source_factory = source_factory
+        self.report_interval = report_interval
+        self.rebalance_interval = rebalance_interval
+        self.imbalance = imbalance
+        self._ctx: Any = mp.get_context(mp_context)  # typed as BaseContext, which has no .Process
+        self.results: "mp.Queue[Any]" = self._ctx.Queue()
+        self.shards = [Shard(i) for i in range(processes or os.cpu_count() or 1)]
+        self.strategy_stats: Dict[str, Dict[str, Any]] = {}
+        self.cpu_rate: Dict[str, float] = {}  # CPU seconds per second, per strategy
+        self._cpu_seen: Dict[str, Tuple[int, float, float]] = {}  # name -> (shard, cpu_time, at)
+        self.signals = 0
+        self.moves = 0
+        self._started = False
+        self._stopping = False
+
+    # -- placement ---------------------------------------------------------
+
+    def _owner(self, name: str) -> Optional[Shard]:
+        for shard in self.shards:
+            if name in shard.specs:
+                return shard
+        return None
+
+    def shard_load(self, shard: Shard) -> float:
+        return sum(self.cpu_rate.get(name, 0.0) for name in shard.specs)
+
+    def _least_loaded(self) -> Shard:
+        live = [shard for shard in self.shards if not shard.retired]
+        if not live:
+            raise RuntimeError("No worker processes left")
+        return min(live, key=lambda shard: (self.shard_load(shard), len(shard.specs)))
+
+    def add(self, spec: StrategySpec) -> int:
+        """Place a strategy on the least loaded worker; returns the shard index"""
+        if self._owner(spec.name) is not None:
+            raise ValueError(f"Strategy {spec.name} is already registered")
+        shard = self._least_loaded()
+        shard.specs[spec.name] = spec
+        shard.send("add", spec)
+        return shard.index
+
+    def remove(self, name: str) -> bool:
+        shard = self._owner(name)
+        if shard is None:
+            return False
+        del shard.specs[name]
+        shard.send("remove", name)
+        self.cpu_rate.pop(name, None)
+        self._cpu_seen.pop(name, None)
+        self.strategy_stats.pop(name, None)
+        return True
+
+    def _move(self, name: str, target: Shard) -> None:
+        source = self._owner(name)
+        if source is None:
+            raise ValueError(f"Strategy {name} is not registered")
+        spec = source.specs.pop(name)
+        source.send("remove", name)
+        target.specs[name] = spec
+        target.send("add", spec)
+        self._cpu_seen.pop(name, None)
+        self.moves += 1
+        logger.info(f"Moved {name} from worker {source.index} to worker {target.index}")
+
+    def assignments(self) -> Dict[str, int]:
+        return {name: shard.index for shard in self.shards for name in shard.specs}
+
+    def rebalance(self) -> int:
+        """Move strategies from the busiest to the idlest worker; returns the number moved"""
+        live = [shard for shard in self.shards if not shard.retired]
+        moved = 0
+        while moved < self.MAX_MOVES and len(live) > 1:
+            loads = {shard.index: self.shard_load(shard) for shard in live}
+            busiest = max(live, key=lambda shard: loads[shard.index])
+            idlest = min(live, key=lambda shard: loads[shard.index])
+            gap = loads[busiest.index] - loads[idlest.index]
+            mean = sum(loads.values()) / len(live)
+            if mean <= 0 or gap <= self.imbalance * mean:
+                break
+            # the strategy whose move best halves the gap without overshooting it
+            candidates = [(name, self.cpu_rate.get(name, 0.0)) for name in busiest.specs]
+            candidates = [(name, rate) for name, rate in candidates if 0 < rate < gap]
+            if not candidates:
+                break
+            name, _ = min(candidates, key=lambda c: abs(gap / 2 - c[1]))
+            self._move(name, idlest)
+            moved += 1
+        return moved
+
+    # -- processes ---------------------------------------------------------
+
+    def _spawn(self, shard: Shard) -> None:
+        shard.commands = self._ctx.Queue()
+        shard.process = self._ctx.Process(
+            target=_worker_main,
+            args=(shard.index, list(shard.specs.values()), shard.commands, self.results,
+                  self.source_factory, self.report_interval),
+            name=f"bot-worker-{shard.index}",
+            daemon=True,
+        )
+        shard.process.start()
+        for name in shard.specs:
+            self._cpu_seen.pop(name, None)
+
+    def start(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        for shard in self.shards:
+            self._spawn(shard)
+        logger.info(f"Started {len(self.shards)} workers for {len(self.assignments())} strategies")
+
+    def supervise(self) -> None:
+        """Restart dead workers with backoff, retiring ones that crash too often"""
+        now = time.monotonic()
+        for shard in self.shards:
+            if shard.retired or shard.alive or self._stopping:
+                continue
+            if shard.process is not None:
+                logger.error(f"Worker {shard.index} died (exit code {shard.process.exitcode})")
+                shard.process = None
+                shard.restarts = [t for t in shard.restarts if now - t < self.RESTART_WINDOW] + [now]
+                shard.next_start = now + min(self.MAX_BACKOFF, 2.0 ** (len(shard.restarts) - 1))
+                if len(shard.restarts) > self.MAX_RESTARTS:
+                    if any(not other.retired for other in self.shards if other is not shard):
+                        self._retire(shard)
+                        continue
+                    # Retiring the last worker would drop its strategies; keep them and retry slowly
+                    logger.error(
+                        f"Worker {shard.index} keeps crashing but is the last one left; "
+                        f"restarting it every {self.MAX_BACKOFF:.0f}s with {len(shard.specs)} strategies"
+                    )
+                    shard.next_start = now + self.MAX_BACKOFF
+            if now >= shard.next_start:
+                logger.info(f"Restarting worker {shard.index} with {len(shard.specs)} strategies")
+                self._spawn(shard)
+
+    def _retire(self, shard: Shard) -> None:
+        shard.retired = True
+        logger.error(f"Worker {shard.index} keeps crashing; moving its strategies to other workers")
+        specs = list(shard.specs.values())
+        shard.specs.clear()
+        for spec in specs:
+            target = self._least_loaded()
+            target.specs[spec.name] = spec
+            target.send("add", spec)
+
+    # -- messages ----------------------------------------------------------
+
+    def _drain(self, timeout: float) -> List[Any]:
+        messages: List[Any] = []
+        first = _get(self.results, timeout)
+        if first is None:
+            return messages
+        messages.append(first)
+        while len(messages) < 1000:
+            try:
+                messages.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        return messages
+
+    async def _handle(self, message: Tuple[Any, ...]) -> None:
+        kind, shard_index = message[0], message[1]
+        if kind == "signal":
+            _, _, name, signal, event = message
+            self.signals += 1
+            if self.on_signal is not None:
+                try:
+                    result = self.on_signal(name, signal, event)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.error(f"Signal handler failed for {name}: {e}")
+        elif kind == "stats":
+            _, _, _, stats = message
+            now = time.monotonic()
+            for name, runner_stats in stats.items():
+                if name not in self.shards[shard_index].specs:
+                    continue  # stale report from before a move
+                self.strategy_stats[name] = {**runner_stats, "worker": shard_index}
+                previous = self._cpu_seen.get(name)
+                cpu_time = runner_stats["cpu_time"]
+                if previous is not None and previous[0] == shard_index and now > previous[2]:
+                    self.cpu_rate[name] = max(0.0, cpu_time - previous[1]) / (now - previous[2])
+                self._cpu_seen[name] = (shard_index, cpu_time, now)
+        elif kind == "failed":
+            _, _, name, error = message
+            self.strategy_stats[name] = {"error": error, "worker": shard_index}
+
+    async def run(self) -> None:
+        """Start the workers and supervise them until `stop()`"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        next_rebalance = loop.time() + self.rebalance_interval
+        try:
+            while not self._stopping:
+                for message in await loop.run_in_executor(None, self._drain, 0.1):
+                    await self._handle(message)
+                self.supervise()
+                if loop.time() >= next_rebalance:
+                    self.rebalance()
+                    next_rebalance = loop.time() + self.rebalance_interval
+        finally:
+            self.shutdown()
+
+    def stop(self) -> None:
+        self._stopping = True
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        self._stopping = True
+        for shard in self.shards:
+            shard.send("stop")
+        deadline = time.monotonic() + timeout
+        for shard in self.shards:
+            if shard.process is None:
+                continue
+            shard.process.join(max(0.0, deadline - time.monotonic()))
+            if shard.process.is_alive():
+                shard.process.terminate()
+                shard.process.join()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "signals": self.signals,
+            "moves": self.moves,
+            "workers": [
+                {
+                    "index": shard.index,
+                    "pid": shard.process.pid if shard.process is not None else None,
+                    "alive": shard.alive,
+                    "retired": shard.retired,
+                    "restarts": len(shard.restarts),
+                    "strategies": len(shard.specs),
+                    "cpu_load": self.shard_load(shard),
+                }
+                for shard in self.shards
+            ],
+            "strategies": self.strategy_stats,
+        }
@@ -0,0 +1,241 @@
+# core/engine.py
+import asyncio
+import inspect
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ..utils.logger import get_logger
+from ..utils.metrics import LatencyHistogram
+
+logger = get_logger("TradingEngine")
+
+
+class MarketEvent(NamedTuple):
+    symbol: str
+    price: float
+    volume: float = 0.0
+    timestamp: float = 0.0  # exchange timestamp, seconds since epoch
+    kind: str = "ticker"
+
+
+# on_signal(strategy_name, signal, triggering_event_or_None); may be sync or async
+SignalHandler = Callable[[str, Any, Optional[MarketEvent]], Any]
+
+
+class StrategyRunner:
+    """
+    Drives one strategy on the event loop.
+
+    The strategy runs when a market event for one of its symbols arrives
+    (`on_market_event(event)` if it defines one, else `generate_signal()`) and,
+    if it has an `interval`, on fixed deadlines in between. Deadlines are kept
+    on an absolute schedule, so slow iterations don't drift the timer; skipped
+    deadlines are counted instead of being replayed back to back.
+    """
+
+    QUEUE_SIZE = 1024
+
+    def __init__(
+        self,
+        name: str,
+        strategy: Any,
+        on_signal: SignalHandler,
+        interval: Optional[float] = None,
+        symbols: Optional[Iterable[str]] = None,
+    ):
+        self.name = name
+        self.strategy = strategy
+        self.on_signal = on_signal
+        self.interval = interval
+        self.symbols = set(symbols) if symbols else None
+        self.queue: "asyncio.Queue[Tuple[float, MarketEvent]]" = asyncio.Queue(self.QUEUE_SIZE)
+
+        self.latency = LatencyHistogram()    # time spent inside the strategy per iteration
+        self.event_lag = LatencyHistogram()  # publish -> start of processing
+        self.iterations = 0
+        self.signals = 0
+        self.errors = 0
+        self.missed_deadlines = 0
+        self.dropped_events = 0
+        self.cpu_time = 0.0  # CPU seconds spent inside the strategy
+
+    def offer(self, event: MarketEvent) -> None:
+        """Enqueue without blocking the publisher; a full queue drops its oldest event"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped_events += 1
+        self.queue.put_nowait((time.perf_counter(), event))
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = self.interval or 0.0
+        next_deadline = loop.time() + interval if interval else None
+
+        while True:
+            timeout = None if next_deadline is None else max(0.0, next_deadline - loop.time())
+            try:
+                published_at, event = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                if next_deadline is None:  # no deadline, no timeout
+                    continue
+                late = loop.time() - next_deadline
+                skipped = int(late // interval)
+                self.missed_deadlines += skipped
+                next_deadline += interval * (skipped + 1)
+                await self.step(None)
+            else:
+                self.event_lag.observe(time.perf_counter() - published_at)
+                await self.step(event)
+
+    async def step(self, event: Optional[MarketEvent]) -> Any:
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        signal = None
+        try:
+            handler = getattr(self.strategy, "on_market_event", None)
+            if event is not None and handler is not None:
+                signal = handler(event)
+            else:
+                signal = self.strategy.generate_signal()
+            if inspect.isawaitable(signal):
+                signal = await signal
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error in strategy {self.name}: {e}")
+        finally:
+            self.latency.observe(time.perf_counter() - started)
+            self.cpu_time += time.thread_time() - cpu_started
+            self.iterations += 1
+
+        if signal is not None and signal != "hold":
+            self.signals += 1
+            try:
+                result = self.on_signal(self.name, signal, event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Signal handler failed for {self.name}: {e}")
+        return signal
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "iterations": self.iterations,
+            "signals": self.signals,
+            "errors": self.errors,
+            "missed_deadlines": self.missed_deadlines,
+            "dropped_events": self.dropped_events,
+            "cpu_time": self.cpu_time,
+            "queued_events": self.queue.qsize(),
+            "latency": self.latency.snapshot(),
+            "event_lag": self.event_lag.snapshot(),
+        }
+
+
+class TradingEngine:
+    """
+    asyncio engine running many strategies concurrently.
+
+    Market events published to the engine (directly or by pumping async event
+    sources) are routed to the strategies subscribed to that symbol; strategies
+    without symbols receive every event.
+    """
+
+    def __init__(self, on_signal: Optional[SignalHandler] = None):
+        self.on_signal = on_signal or self._log_signal
+        self.runners: Dict[str, StrategyRunner] = {}
+        self._by_symbol: Dict[str, List[StrategyRunner]] = {}
+        self._all_symbols: List[StrategyRunner] = []
+        self._tasks: List["asyncio.Task[Any]"] = []
+        self._runner_tasks: Dict[str, "asyncio.Task[Any]"] = {}
+        self._stopped: Optional[asyncio.Event] = None
+
+    @staticmethod
+    def _log_signal(name: str, signal: Any, event: Optional[MarketEvent]) -> None:
+        logger.info(f"[{name}] Generated signal: {signal}")
+
+    def add_strategy(
+        self,
+        strategy: Any,
+        name: Optional[str] = None,
+        interval: Optional[float] = None,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> StrategyRunner:
+        name = name or f"{type(strategy).__name__}-{len(self.runners)}"
+        if name in self.runners:
+            raise ValueError(f"Strategy {name} is already registered")
+        runner = StrategyRunner(
+            name,
+            strategy,
+            self.on_signal,
+            interval=interval if interval is not None else getattr(strategy, "interval", None),
+            symbols=symbols if symbols is not None else getattr(strategy, "symbols", None),
+        )
+        self.runners[name] = runner
+        if runner.symbols is None:
+            self._all_symbols.append(runner)
+        else:
+            for symbol in runner.symbols:
+                self._by_symbol.setdefault(symbol, []).append(runner)
+        if self._stopped is not None:
+            self._runner_tasks[name] = asyncio.create_task(runner.run())
+        return runner
+
+    def remove_strategy(self, name: str) -> Optional[StrategyRunner]:
+        """Unregister a strategy, cancelling it if the engine is running"""
+        runner = self.runners.pop(name, None)
+        if runner is None:
+            return None
+        if runner.symbols is None:
+            self._all_symbols.remove(runner)
+        else:
+            for symbol in runner.symbols:
+                subscribers = self._by_symbol[symbol]
+                subscribers.remove(runner)
+                if not subscribers:
+                    del self._by_symbol[symbol]
+        task = self._runner_tasks.pop(name, None)
+        if task is not None:
+            task.cancel()
+        return runner
+
+    def publish(self, event: MarketEvent) -> None:
+        for runner in self._by_symbol.get(event.symbol, ()):
+            runner.offer(event)
+        for runner in self._all_symbols:
+            runner.offer(event)
+
+    async def pump(self, source: AsyncIterator[MarketEvent]) -> None:
+        try:
+            async for event in source:
+                self.publish(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Market event source failed: {e}")
+
+    async def run(self, sources: Iterable[AsyncIterator[MarketEvent]] = ()) -> None:
+        """
+        Run every strategy (and pump every source) until `stop()` or
+        cancellation. Strategies added or removed meanwhile start and stop
+        immediately.
+        """
+        self._stopped = asyncio.Event()
+        self._runner_tasks = {name: asyncio.create_task(runner.run()) for name, runner in self.runners.items()}
+        self._tasks = [asyncio.create_task(self.pump(source)) for source in sources]
+        try:
+            await self._stopped.wait()
+        finally:
+            tasks = [*self._runner_tasks.values(), *self._tasks]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._runner_tasks = {}
+            self._tasks = []
+            self._stopped = None
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: runner.stats() for name, runner in self.runners.items()}
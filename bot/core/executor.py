@@ -0,0 +1,401 @@
+# core/executor.py
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypedDict, Unpack
+
+from ..api_client.client import APIError
+from ..api_client.endpoints import dcaendpoint, deals_endpoints
+from ..utils.logger import get_logger
+from ..utils.metrics import LatencyHistogram
+from .engine import MarketEvent
+
+logger = get_logger("OrderExecutor")
+
+PENDING, IN_FLIGHT, DONE, FAILED, CANCELLED = "pending", "in_flight", "done", "failed", "cancelled"
+
+# action -> (HTTP method, the order field naming its target, endpoint for that id)
+ACTIONS: Dict[str, Tuple[str, str, Callable[[int], str]]] = {
+    "start_deal": ("POST", "bot_id", dcaendpoint.start_new_deal),
+    "panic_sell_all": ("POST", "bot_id", dcaendpoint.panic_sell_all_deals),
+    "cancel_all_deals": ("POST", "bot_id", dcaendpoint.cancel_all_deals),
+    "enable_bot": ("POST", "bot_id", dcaendpoint.enable_dca_bot),
+    "disable_bot": ("POST", "bot_id", dcaendpoint.disable_dca_bot),
+    "panic_sell": ("POST", "deal_id", deals_endpoints.panic_sell_deal),
+    "cancel_deal": ("POST", "deal_id", deals_endpoints.cancel_deal),
+    "add_funds": ("POST", "deal_id", deals_endpoints.add_funds),
+    "update_deal": ("PATCH", "deal_id", deals_endpoints.update_deal),
+}
+
+# How cancel-replace undoes an order that already reached 3Commas
+UNDO_ACTIONS = {"start_deal": "cancel_deal"}
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    """3Commas ISO 8601 time (e.g. '2024-05-01T10:00:00.000Z') to unix seconds"""
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def to_3commas_pair(symbol: str) -> str:
+    """ccxt 'BTC/USDT' -> 3Commas 'USDT_BTC'; anything else is passed through"""
+    if "/" not in symbol:
+        return symbol
+    base, quote = symbol.split("/", 1)
+    return f"{quote.split(':')[0]}_{base}"
+
+
+class Order:
+    """One 3Commas action and its lifecycle in the executor's table"""
+
+    def __init__(
+        self,
+        key: str,
+        action: str,
+        account_id: int,
+        bot_id: Optional[int] = None,
+        deal_id: Optional[int] = None,
+        pair: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        signal_time: Optional[float] = None,
+        source: Optional[str] = None,
+        explicit_key: bool = False,
+    ):
+        self.key = key
+        self.action = action
+        self.account_id = account_id
+        self.bot_id = bot_id
+        self.deal_id = deal_id
+        self.pair = pair
+        self.params = params or {}
+        self.source = source
+        self.explicit_key = explicit_key
+        self.state = PENDING
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.signal_time = signal_time if signal_time is not None else time.perf_counter()
+        self.sent_at: Optional[float] = None
+        self.sent_time: Optional[float] = None  # wall clock, to match against 3Commas timestamps
+        self.unconfirmed = False  # failed in a way 3Commas may still have acted on
+        self.finished_at: Optional[float] = None
+        self.replaced_by: Optional[str] = None
+        self.task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def done(self) -> bool:
+        return self.state in (DONE, FAILED, CANCELLED)
+
+    def payload(self) -> Dict[str, Any]:
+        if self.action == "start_deal" and self.pair:
+            return {"pair": self.pair, **self.params}
+        return dict(self.params)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "action": self.action,
+            "account_id": self.account_id,
+            "bot_id": self.bot_id,
+            "deal_id": self.deal_id,
+            "pair": self.pair,
+            "state": self.state,
+            "error": self.error,
+            "source": self.source,
+            "replaced_by": self.replaced_by,
+            "unconfirmed": self.unconfirmed,
+        }
+
+
+class OrderFields(TypedDict, total=False):
+    """Keyword arguments of submit(); replace() takes any of them as changes"""
+
+    action: str
+    account_id: int
+    bot_id: Optional[int]
+    deal_id: Optional[int]
+    pair: Optional[str]
+    params: Optional[Dict[str, Any]]
+    idempotency_key: Optional[str]
+    signal_time: Optional[float]
+    source: Optional[str]
+
+
+class OrderExecutor:
+    """
+    Turns strategy signals into 3Commas deal and bot actions.
+
+    Every order is tracked in a bounded table keyed by its idempotency key: an
+    explicit key is executed at most once (unless it failed), and an implicit
+    one (derived from the action and its arguments) collapses repeats of the
+    same signal while the first is in flight or for DEDUP_WINDOW seconds after
+    it finished. Requests run as tasks so signal handlers never block the
+    engine, with at most `max_per_account` in flight per 3Commas account.
+
+    The key never reaches 3Commas, and the clients don't resend a POST whose
+    outcome is unclear. Resubmitting a start_deal whose last attempt ended
+    that way first looks for a deal the bot opened since then and adopts it
+    instead of opening a second one.
+    """
+
+    MAX_PER_ACCOUNT = 4
+    DEDUP_WINDOW = 5.0
+    TABLE_SIZE = 10_000
+    CLOCK_SKEW = 5.0  # seconds of slack between our clock and 3Commas' created_at
+
+    def __init__(
+        self,
+        client: Any,
+        max_per_account: int = MAX_PER_ACCOUNT,
+        dedup_window: float = DEDUP_WINDOW,
+        table_size: int = TABLE_SIZE,
+    ):
+        self.client = client  # AsyncThreeCommasAPIClient
+        self.max_per_account = max_per_account
+        self.dedup_window = dedup_window
+        self.table_size = table_size
+        self.orders: "OrderedDict[str, Order]" = OrderedDict()
+        self.routes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._semaphores: Dict[int, asyncio.Semaphore] = {}
+
+        self.signal_to_request = LatencyHistogram()  # signal -> request leaves for 3Commas
+        self.request_latency = LatencyHistogram()    # 3Commas round trip
+        self.counters = {
+            "submitted": 0, "deduplicated": 0, "succeeded": 0, "failed": 0, "cancelled": 0, "replaced": 0,
+            "reconciled": 0,
+        }
+
+    # -- routing -----------------------------------------------------------
+
+    def add_route(self, signal: str, action: str, account_id: int, strategy: str = "*", **order: Any) -> None:
+        """
+        Map a strategy's signal to an action, e.g.
+        add_route("buy", "start_deal", account_id=1, bot_id=42).
+        Extra keyword arguments (bot_id, deal_id, pair, params) go to submit.
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action: {action}")
+        self.routes[(strategy, signal)] = {"action": action, "account_id": account_id, **order}
+
+    def on_signal(self, strategy_name: str, signal: Any, event: Optional[MarketEvent]) -> Optional[Order]:
+        """TradingEngine signal handler: submits the routed action without waiting for it"""
+        signal_time = time.perf_counter()
+        route = self.routes.get((strategy_name, str(signal))) or self.routes.get(("*", str(signal)))
+        if route is None:
+            return None
+        order = dict(route)
+        if order.get("pair") is None and event is not None and order["action"] == "start_deal":
+            order["pair"] = to_3commas_pair(event.symbol)
+        return self.submit(signal_time=signal_time, source=strategy_name, **order)
+
+    # -- orders ------------------------------------------------------------
+
+    @staticmethod
+    def make_key(
+        action: str,
+        account_id: int,
+        bot_id: Optional[int] = None,
+        deal_id: Optional[int] = None,
+        pair: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        raw = json.dumps([action, account_id, bot_id, deal_id, pair, params or {}], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _duplicate(self, existing: Order) -> bool:
+        if existing.explicit_key:
+            return existing.state not in (FAILED, CANCELLED)
+        if not existing.done:
+            return True
+        return existing.finished_at is not None and time.perf_counter() - existing.finished_at < self.dedup_window
+
+    def submit(
+        self,
+        action: str,
+        account_id: int,
+        bot_id: Optional[int] = None,
+        deal_id: Optional[int] = None,
+        pair: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+        signal_time: Optional[float] = None,
+        source: Optional[str] = None,
+    ) -> Order:
+        """Queue an action; returns the tracked order (the existing one for a duplicate)"""
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action: {action}")
+        target = ACTIONS[action][1]
+        if {"bot_id": bot_id, "deal_id": deal_id}[target] is None:
+            raise ValueError(f"{action} needs a {target}")
+        key = idempotency_key or self.make_key(action, account_id, bot_id, deal_id, pair, params)
+        existing = self.orders.get(key)
+        if existing is not None and self._duplicate(existing):
+            self.counters["deduplicated"] += 1
+            return existing
+
+        order = Order(
+            key, action, account_id, bot_id, deal_id, pair, params,
+            signal_time=signal_time, source=source, explicit_key=idempotency_key is not None,
+        )
+        # A start_deal that may have gone through must not open a second deal
+        previous = existing if existing is not None and existing.unconfirmed and action == "start_deal" else None
+        self.orders.pop(key, None)
+        self.orders[key] = order
+        self.counters["submitted"] += 1
+        order.task = asyncio.create_task(self._execute(order, previous))
+        self._trim()
+        return order
+
+    def _trim(self) -> None:
+        """Forget the oldest finished orders beyond table_size"""
+        excess = len(self.orders) - self.table_size
+        for key in list(self.orders):
+            if excess <= 0:
+                break
+            if self.orders[key].done:
+                del self.orders[key]
+                excess -= 1
+
+    async def _find_deal(self, previous: Order) -> Optional[Dict[str, Any]]:
+        """A deal of the previous attempt's bot and pair created since it was sent, if any"""
+        deals = await self.client.get(
+            deals_endpoints.list_deals(),
+            {"bot_id": previous.bot_id, "scope": "active", "order": "created_at", "order_direction": "desc"},
+        )
+        since = (previous.sent_time or 0.0) - self.CLOCK_SKEW
+        for deal in deals or []:
+            if previous.pair and deal.get("pair") != previous.pair:
+                continue
+            created = _timestamp(deal.get("created_at"))
+            if created is not None and created >= since:
+                return deal
+        return None
+
+    async def _execute(self, order: Order, previous: Optional[Order] = None) -> None:
+        semaphore = self._semaphores.get(order.account_id)
+        if semaphore is None:
+            semaphore = self._semaphores[order.account_id] = asyncio.Semaphore(self.max_per_account)
+        try:
+            async with semaphore:
+                method, target, endpoint = ACTIONS[order.action]
+                order.state = IN_FLIGHT
+                if previous is not None:
+                    order.sent_time = previous.sent_time  # kept if the lookup fails
+                    deal = await self._find_deal(previous)
+                    if deal is not None:
+                        logger.info(f"{order.key} already opened deal {deal.get('id')}, not resending")
+                        order.result = deal
+                        order.state = DONE
+                        self.counters["reconciled"] += 1
+                        return
+                order.sent_at = time.perf_counter()
+                order.sent_time = time.time()
+                self.signal_to_request.observe(order.sent_at - order.signal_time)
+                sender = getattr(self.client, method.lower())
+                order.result = await sender(endpoint(getattr(order, target)), order.payload())
+                order.state = DONE
+                self.counters["succeeded"] += 1
+        except asyncio.CancelledError:
+            self._mark_cancelled(order)
+            raise
+        except Exception as e:
+            order.state = FAILED
+            order.error = str(e)
+            # A 4xx is a definite refusal; anything else (or a failed deal lookup) leaves the outcome open
+            rejected = isinstance(e, APIError) and e.status_code is not None and 400 <= e.status_code < 500
+            order.unconfirmed = not rejected if order.sent_at is not None else previous is not None
+            self.counters["failed"] += 1
+            logger.error(f"{order.action} for account {order.account_id} failed: {e}")
+        finally:
+            order.finished_at = time.perf_counter()
+            if order.sent_at is not None:
+                self.request_latency.observe(order.finished_at - order.sent_at)
+
+    def cancel(self, key: str) -> bool:
+        """Cancel an order still waiting for its account slot; sent requests can't be recalled"""
+        order = self.orders.get(key)
+        if order is None or order.state != PENDING or order.task is None:
+            return False
+        order.task.cancel()
+        # a task cancelled before its first step never runs _execute's handlers
+        self._mark_cancelled(order)
+        order.finished_at = time.perf_counter()
+        return True
+
+    def _mark_cancelled(self, order: Order) -> None:
+        if order.state != CANCELLED:
+            order.state = CANCELLED
+            self.counters["cancelled"] += 1
+
+    async def replace(self, key: str, **changes: Unpack[OrderFields]) -> Order:
+        """
+        Cancel-replace: drop the order if it hasn't been sent, otherwise wait
+        for it and undo it (e.g. cancel the deal a start_deal opened), then
+        submit the order with `changes` applied.
+
+        The replacement gets its own key (derived from the old key and its
+        fields unless `idempotency_key` is given), so it is never collapsed
+        into the order it replaces; replacing the same order twice with the
+        same changes still yields a single replacement.
+        """
+        old = self.orders[key]
+        fields: OrderFields = {
+            "action": old.action, "account_id": old.account_id, "bot_id": old.bot_id,
+            "deal_id": old.deal_id, "pair": old.pair, "params": old.params, "source": old.source,
+        }
+        fields.update(changes)
+        new_key = fields.get("idempotency_key") or self.make_key(
+            fields["action"], fields["account_id"], fields["bot_id"], fields["deal_id"], fields["pair"],
+            {"params": fields["params"], "replaces": key},
+        )
+        if new_key == key:
+            raise ValueError(f"Replacement of {key} must not reuse its key")
+
+        if not self.cancel(key) and not old.done and old.task is not None:
+            await asyncio.wait([old.task])
+        elif old.task is not None:
+            await asyncio.gather(old.task, return_exceptions=True)
+
+        undo = UNDO_ACTIONS.get(old.action)
+        if old.state == DONE and undo and isinstance(old.result, dict) and old.result.get("id") is not None:
+            reverted = self.submit(undo, old.account_id, deal_id=old.result["id"], source=old.source)
+            if reverted.task is not None:
+                await asyncio.gather(reverted.task, return_exceptions=True)
+            if reverted.state != DONE:
+                raise RuntimeError(f"Could not undo {old.action} {key}: {reverted.error}")
+
+        fields["idempotency_key"] = new_key
+        new = self.submit(**fields)
+        old.replaced_by = new.key
+        self.counters["replaced"] += 1
+        return new
+
+    def in_flight(self) -> List[Order]:
+        return [order for order in self.orders.values() if not order.done]
+
+    async def drain(self) -> None:
+        """Wait for every queued or in-flight order to finish"""
+        tasks = [order.task for order in self.in_flight() if order.task is not None]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        states: Dict[str, int] = {}
+        for order in self.orders.values():
+            states[order.state] = states.get(order.state, 0) + 1
+        return {
+            **self.counters,
+            "tracked": len(self.orders),
+            "states": states,
+            "signal_to_request": self.signal_to_request.snapshot(),
+            "request_latency": self.request_latency.snapshot(),
+        }
@@ -1,18 +1,33 @@
 # core/operations/bot_operations.py
-import time
-from typing import Optional, List
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, List
 from ...utils.logger import get_logger
+from ..engine import MarketEvent, TradingEngine
+from ..executor import OrderExecutor
+from ..scheduler import Scheduler
 from ...services.accounts_service import AccountsService
+from ...services.balance_sync import BalanceChartSync
 from ...strategies.dummy import DummyStrategy
 from ...config.settings import settings
 
 logger = get_logger("BotOperations")
 
 class BotOperations:
-    def __init__(self, accounts_service: AccountsService):
+    def __init__(
+        self,
+        accounts_service: AccountsService,
+        strategies: Optional[List[Any]] = None,
+        executor: Optional[OrderExecutor] = None,
+        balance_sync: Optional[BalanceChartSync] = None,
+    ):
         """Initialize the BotOperations with required services"""
         self.accounts_service = accounts_service
+        self.executor = executor
+        self.balance_sync = balance_sync
         self.strategy = DummyStrategy()
+        self.engine = TradingEngine(on_signal=self.on_signal)
+        for strategy in strategies or [self.strategy]:
+            self.engine.add_strategy(strategy, interval=getattr(strategy, "interval", settings.POLL_INTERVAL))
 
     def add_exchange_account(
         self,
@@ -25,7 +40,7 @@ class BotOperations:
         customer_id: Optional[str] = None,
         types_to_create: Optional[List[str]] = None,
         use_settings: bool = False
-    ):
+    ) -> Dict:
         """
         Add a new exchange account with comprehensive parameter handling
         
@@ -46,13 +61,17 @@ class BotOperations:
         try:
             if use_settings:
                 # Use credentials from settings
+                settings_key = getattr(settings, "EXCHANGE_API_KEY", None)
+                settings_secret = getattr(settings, "EXCHANGE_SECRET_KEY", None)
+                if not settings_key or not settings_secret:
+                    raise ValueError("EXCHANGE_API_KEY and EXCHANGE_SECRET_KEY are not configured")
                 payload = {
                     "type": type,
                     "name": name,
-                    "api_key": settings.EXCHANGE_API_KEY,
-                    "secret": settings.EXCHANGE_SECRET_KEY,
+                    "api_key": settings_key,
+                    "secret": settings_secret,
                 }
-                if hasattr(settings, 'EXCHANGE_PASSPHRASE'):
+                if settings.EXCHANGE_PASSPHRASE:
                     payload["passphrase"] = settings.EXCHANGE_PASSPHRASE
             else:
                 # Use passed parameters
@@ -77,7 +96,7 @@ class BotOperations:
             response = self.accounts_service.add_exchange_account(**payload)
             
             logger.info("Exchange account added successfully")
-            logger.debug(f"Account details: {response}")
+            logger.debug("Account details: %s", response)
             return response
             
         except Exception as e:
@@ -89,9 +108,10 @@ class BotOperations:
         account_id: int, 
         date_from: str = "2023-01-01", 
         date_to: str = "2023-12-31"
-    ):
+    ) -> Any:
         """
-        Get balance data for a specific account
+        Get balance data for a specific account, from local storage when a
+        BalanceChartSync is attached (only the missing tail is fetched)
         
         Args:
             account_id: ID of the account to query
@@ -99,10 +119,11 @@ class BotOperations:
             date_to: End date for data (YYYY-MM-DD)
             
         Returns:
-            dict: Balance chart data
+            list: Balance chart points
         """
         try:
-            balance_data = self.accounts_service.get_account_balance_chart_data(
+            source = self.balance_sync or self.accounts_service
+            balance_data = source.get_account_balance_chart_data(
                 account_id=account_id,
                 date_from=date_from,
                 date_to=date_to
@@ -113,19 +134,45 @@ class BotOperations:
             logger.error(f"Error fetching balance data: {e}")
             raise
 
-    def run_strategy(self):
-        """Main trading strategy loop"""
+    def schedule_balance_refresh(
+        self,
+        scheduler: Scheduler,
+        account_ids: Iterable[int],
+        interval: float = 300.0,
+        jitter: float = 30.0,
+    ) -> None:
+        """Reload exchange balances for each account every `interval` seconds, jittered across accounts"""
+        for account_id in account_ids:
+            scheduler.every(
+                interval,
+                self.accounts_service.post_load_balances,
+                name=f"load-balances-{account_id}",
+                args=(account_id,),
+                jitter=jitter,
+            )
+
+    def on_signal(self, strategy_name: str, signal: Any, event: Optional[MarketEvent]) -> None:
+        """Called by the engine for every actionable (non-"hold") signal"""
+        logger.info(f"[{strategy_name}] Generated signal: {signal}")
+        if self.executor is not None:
+            self.executor.on_signal(strategy_name, signal, event)
+
+    async def _run(self, sources: Iterable[AsyncIterator[MarketEvent]]) -> None:
+        try:
+            await self.engine.run(sources)
+        finally:
+            if self.executor is not None:
+                await self.executor.drain()
+
+    def run_strategy(self, sources: Iterable[AsyncIterator[MarketEvent]] = ()) -> None:
+        """Main trading strategy loop: runs every strategy on the event-driven engine"""
         logger.info("Starting trading strategy")
-        while True:
-            try:
-                signal = self.strategy.generate_signal()
-                logger.info(f"Generated signal: {signal}")
-                # Here you would add your trade execution logic
-                # execute_trade(signal)
-                time.sleep(settings.POLL_INTERVAL)
-            except KeyboardInterrupt:
-                logger.info("Strategy stopped by user")
-                break
-            except Exception as e:
-                logger.error(f"Error in strategy loop: {e}")
-                time.sleep(settings.ERROR_RETRY_DELAY)
\ No newline at end of file
+        try:
+            asyncio.run(self._run(sources))
+        except KeyboardInterrupt:
+            logger.info("Strategy stopped by user")
+        finally:
+            for name, stats in self.engine.stats().items():
+                logger.info(f"Strategy {name}: {stats}")
+            if self.executor is not None:
+                logger.info(f"Executor: {self.executor.stats()}")
@@ -0,0 +1,333 @@
+# core/scheduler.py
+import asyncio
+import heapq
+import inspect
+import itertools
+import random
+import time
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ..utils.logger import get_logger
+from ..utils.metrics import LatencyHistogram
+
+logger = get_logger("Scheduler")
+
+
+# -- triggers ---------------------------------------------------------------
+# A trigger maps "the previous fire time" (or None on the first call) to the
+# next fire time as a unix timestamp, or None once it is exhausted.
+
+class IntervalTrigger:
+    def __init__(self, seconds: float, start: Optional[float] = None):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+        self.start = start
+
+    def next_fire(self, previous: Optional[float], now: float) -> Optional[float]:
+        if previous is None:
+            return self.start if self.start is not None else now + self.seconds
+        return previous + self.seconds
+
+    def __repr__(self) -> str:
+        return f"every {self.seconds}s"
+
+
+class OneShotTrigger:
+    def __init__(self, at: float):
+        self.at = at
+
+    def next_fire(self, previous: Optional[float], now: float) -> Optional[float]:
+        return self.at if previous is None else None
+
+    def __repr__(self) -> str:
+        return f"at {self.at}"
+
+
+class CronTrigger:
+    """
+    Standard 5-field cron expression (minute hour day-of-month month
+    day-of-week) with *, lists, ranges and steps, plus @hourly/@daily/@weekly/
+    @monthly. As in cron, when both day fields are restricted either may match.
+    """
+
+    ALIASES = {
+        "@hourly": "0 * * * *",
+        "@daily": "0 0 * * *",
+        "@midnight": "0 0 * * *",
+        "@weekly": "0 0 * * 0",
+        "@monthly": "0 0 1 * *",
+    }
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str, tz: tzinfo = timezone.utc):
+        self.expression = expression
+        self.tz = tz
+        fields = self.ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        parsed = [self._parse(field, low, high) for field, (low, high) in zip(fields, self.FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}  # 7 is Sunday too
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int) -> Set[int]:
+        values: Set[int] = set()
+        for part in field.split(","):
+            body, _, step = part.partition("/")
+            if body == "*":
+                start, end = low, high
+            elif "-" in body:
+                start, end = (int(v) for v in body.split("-", 1))
+            else:
+                start = int(body)
+                end = high if step else start
+            if not low <= start <= end <= high:
+                raise ValueError(f"Cron field out of range: {field!r}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.isoweekday() % 7) in self.weekdays
+        if self.any_day:
+            return weekday
+        if self.any_weekday:
+            return day
+        return day or weekday
+
+    def next_fire(self, previous: Optional[float], now: float) -> Optional[float]:
+        after = previous if previous is not None else now
+        moment = datetime.fromtimestamp(after, self.tz).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.timestamp()
+        return None
+
+    def __repr__(self) -> str:
+        return f"cron {self.expression!r}"
+
+
+# -- jobs -------------------------------------------------------------------
+
+class Job:
+    """A scheduled callable and its runtime metrics"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        trigger: Any,
+        args: Tuple[Any, ...] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        jitter: float = 0.0,
+        priority: int = 0,
+        misfire_grace: float = 1.0,
+    ):
+        self.name = name
+        self.func = func
+        self.trigger = trigger
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.jitter = jitter
+        self.priority = priority
+        self.misfire_grace = misfire_grace
+
+        self.scheduled_at: Optional[float] = None  # fire time before jitter
+        self.next_run: Optional[float] = None      # fire time with jitter applied
+        self.running = False
+        self.removed = False
+
+        self.runs = 0
+        self.failures = 0
+        self.missed = 0      # fire times dropped because they were past misfire_grace
+        self.overlapped = 0  # fire times dropped because the previous run was still going
+        self.last_error: Optional[str] = None
+        self.runtime = LatencyHistogram()
+        self.lateness = LatencyHistogram()  # actual start - jittered fire time
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "trigger": repr(self.trigger),
+            "next_run": self.next_run,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "missed": self.missed,
+            "overlapped": self.overlapped,
+            "last_error": self.last_error,
+            "runtime": self.runtime.snapshot(),
+            "lateness": self.lateness.snapshot(),
+        }
+
+
+class Scheduler:
+    """
+    asyncio job scheduler driven by a priority heap of next fire times.
+
+    Jobs fire on interval, cron or one-shot triggers, with optional random
+    jitter so periodic calls from many jobs don't hit the API in lockstep.
+    Fire times are kept on the trigger's schedule: a job that fires late runs
+    once and the fire times it slept through by more than `misfire_grace`
+    seconds are counted as missed instead of being replayed, and a job still
+    running at its next fire time skips it. Sync callables run in a worker thread;
+    `max_concurrency` bounds how many jobs run at once, due jobs being
+    started in (fire time, priority) order.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.jobs: Dict[str, Job] = {}
+        self._heap: List[Tuple[float, int, int, Job]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopped = False
+        self._running: Set["asyncio.Task[None]"] = set()
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    # -- registration ------------------------------------------------------
+
+    def add_job(
+        self,
+        func: Callable[..., Any],
+        trigger: Any,
+        name: Optional[str] = None,
+        args: Tuple[Any, ...] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        jitter: float = 0.0,
+        priority: int = 0,
+        misfire_grace: float = 1.0,
+    ) -> Job:
+        name = name or str(getattr(func, "__name__", f"job-{len(self.jobs)}"))
+        if name in self.jobs:
+            raise ValueError(f"Job {name} is already scheduled")
+        job = Job(name, func, trigger, args, kwargs, jitter, priority, misfire_grace)
+        self.jobs[name] = job
+        self._schedule(job, job.trigger.next_fire(None, time.time()))
+        return job
+
+    def every(self, seconds: float, func: Callable[..., Any], **options: Any) -> Job:
+        return self.add_job(func, IntervalTrigger(seconds), **options)
+
+    def cron(self, expression: str, func: Callable[..., Any], **options: Any) -> Job:
+        return self.add_job(func, CronTrigger(expression), **options)
+
+    def at(self, when: float, func: Callable[..., Any], **options: Any) -> Job:
+        return self.add_job(func, OneShotTrigger(when), **options)
+
+    def remove_job(self, name: str) -> bool:
+        job = self.jobs.pop(name, None)
+        if job is None:
+            return False
+        job.removed = True  # its heap entry is dropped lazily
+        return True
+
+    def _schedule(self, job: Job, fire_at: Optional[float], run_at: Optional[float] = None) -> None:
+        job.scheduled_at = fire_at
+        if fire_at is None:
+            job.next_run = None  # exhausted; kept in `jobs` for its stats
+            return
+        job.next_run = self._jittered(job, fire_at) if run_at is None else run_at
+        heapq.heappush(self._heap, (job.next_run, job.priority, next(self._seq), job))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    @staticmethod
+    def _jittered(job: Job, fire_at: float) -> float:
+        return fire_at + (random.uniform(0, job.jitter) if job.jitter else 0.0)
+
+    # -- execution ---------------------------------------------------------
+
+    def _advance(self, job: Job, now: float) -> None:
+        """Schedule the job's next fire time, counting fire times already missed"""
+        fire_at = job.trigger.next_fire(job.scheduled_at, now)
+        run_at = self._jittered(job, fire_at) if fire_at is not None else None
+        while fire_at is not None and run_at is not None and run_at + job.misfire_grace < now:
+            job.missed += 1
+            fire_at = job.trigger.next_fire(fire_at, now)
+            run_at = self._jittered(job, fire_at) if fire_at is not None else None
+        self._schedule(job, fire_at, run_at)
+
+    def _dispatch(self, job: Job, run_at: float, now: float) -> None:
+        if job.running:
+            job.overlapped += 1
+        else:
+            # Marked before the task starts: a late fire time that _advance keeps
+            # within misfire_grace can be popped again in this same pass. Cleared
+            # by a done callback, which also runs for a task cancelled before it started.
+            job.running = True
+            task = asyncio.create_task(self._run_job(job, run_at))
+            self._running.add(task)
+
+            def finished(task: "asyncio.Task[None]") -> None:
+                job.running = False
+                self._running.discard(task)
+
+            task.add_done_callback(finished)
+        self._advance(job, now)
+
+    async def _run_job(self, job: Job, run_at: float) -> None:
+        if self._slots is not None:
+            await self._slots.acquire()
+        try:
+            job.lateness.observe(max(0.0, time.time() - run_at))
+            started = time.perf_counter()
+            try:
+                if inspect.iscoroutinefunction(job.func):
+                    await job.func(*job.args, **job.kwargs)
+                else:
+                    await asyncio.to_thread(job.func, *job.args, **job.kwargs)
+                job.last_error = None
+            except Exception as e:
+                job.failures += 1
+                job.last_error = str(e)
+                logger.error(f"Job {job.name} failed: {e}")
+            finally:
+                job.runtime.observe(time.perf_counter() - started)
+                job.runs += 1
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    async def run(self) -> None:
+        """Fire jobs until `stop()` or cancellation"""
+        self._wakeup = asyncio.Event()
+        self._stopped = False
+        try:
+            while not self._stopped:
+                now = time.time()
+                while self._heap and (self._heap[0][3].removed or self._heap[0][0] <= now):
+                    run_at, _, _, job = heapq.heappop(self._heap)
+                    if not job.removed:
+                        self._dispatch(job, run_at, now)
+                timeout = self._heap[0][0] - now if self._heap else None
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            tasks = list(self._running)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._wakeup = None
+
+    def stop(self) -> None:
+        self._stopped = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: job.stats() for name, job in self.jobs.items()}
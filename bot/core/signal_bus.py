@@ -0,0 +1,268 @@
+# core/signal_bus.py
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, NamedTuple, Optional, TextIO, Tuple, Union
+
+from ..utils.logger import get_logger
+from ..utils.metrics import REGISTRY
+from .engine import MarketEvent, SignalHandler
+
+logger = get_logger("SignalBus")
+
+SIGNALS = REGISTRY.counter(
+    "signals_received_total",
+    "Inbound signals by outcome (accepted, duplicate, invalid, unauthorized, stale)",
+    ("outcome",),
+)
+DISPATCH_LAG = REGISTRY.histogram(
+    "signal_dispatch_lag_seconds",
+    "Time from enqueueing a signal to the start of a consumer's handler",
+    ("consumer",),
+)
+HANDLER_ERRORS = REGISTRY.counter(
+    "signal_handler_errors_total",
+    "Signal consumer handlers that raised",
+    ("consumer",),
+)
+
+
+class InboundSignal(NamedTuple):
+    id: str                  # dedup key: the sender's id or a hash of the payload
+    action: str              # e.g. "buy", "sell"; routed like a strategy signal
+    strategy: str = "webhook"
+    symbol: Optional[str] = None
+    bot_id: Optional[int] = None
+    price: Optional[float] = None
+    timestamp: float = 0.0   # sender's time, seconds since epoch
+    seq: int = 0             # assigned on publish
+    received_at: float = 0.0
+    payload: Optional[Dict[str, Any]] = None
+
+    def event(self) -> MarketEvent:
+        return MarketEvent(self.symbol or "", self.price or 0.0, 0.0, self.timestamp or self.received_at, "signal")
+
+
+# handler(signal); may be sync or async
+ConsumerHandler = Callable[[InboundSignal], Any]
+
+
+def engine_handler(on_signal: SignalHandler) -> ConsumerHandler:
+    """Adapt a TradingEngine on_signal(strategy, signal, event) handler, e.g. OrderExecutor.on_signal"""
+    return lambda signal: on_signal(signal.strategy, signal.action, signal.event())
+
+
+class Consumer:
+    """One subscriber with its own queue, so a slow handler only delays itself"""
+
+    def __init__(self, name: str, handler: ConsumerHandler, queue_size: int):
+        self.name = name
+        self.handler = handler
+        self.queue: "asyncio.Queue[Tuple[float, InboundSignal]]" = asyncio.Queue(queue_size)
+        self.lag = DISPATCH_LAG.labels(name)
+        self.task: Optional["asyncio.Task[None]"] = None
+        self.handled = 0
+        self.errors = 0
+        self.dropped = 0
+
+    def offer(self, enqueued: float, signal: InboundSignal) -> None:
+        """Enqueue without blocking the publisher; a full queue drops its oldest signal"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+        self.queue.put_nowait((enqueued, signal))
+
+    async def run(self) -> None:
+        while True:
+            enqueued, signal = await self.queue.get()
+            self.lag.observe(time.perf_counter() - enqueued)
+            try:
+                result = self.handler(signal)
+                if inspect.isawaitable(result):
+                    await result
+                self.handled += 1
+            except Exception as e:
+                self.errors += 1
+                HANDLER_ERRORS.labels(self.name).inc()
+                logger.error(f"Signal consumer {self.name} failed on signal {signal.seq}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "handled": self.handled,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "queued": self.queue.qsize(),
+            "dispatch_lag": self.lag.snapshot(),
+        }
+
+
+class SignalBus:
+    """
+    In-process fan-out for inbound signals.
+
+    `publish` never awaits: it drops signals whose id was seen within
+    `dedup_window` seconds, optionally appends the signal to a JSON-lines log,
+    and puts it on every consumer's queue. Each consumer drains its queue in
+    its own task; the time from publish to the start of its handler is
+    recorded per consumer.
+
+    With a log, a restart restores the sequence number and the dedup table
+    from it, so a sender retrying a signal that was already accepted is still
+    recognized. Delivery to consumers is at most once; the log is the record
+    to replay from (`read_log`).
+    """
+
+    QUEUE_SIZE = 10000
+    MAX_SEEN = 100_000
+
+    def __init__(
+        self,
+        dedup_window: float = 300.0,
+        log_path: Optional[Union[str, Path]] = None,
+        fsync: bool = False,
+        queue_size: Optional[int] = None,
+    ):
+        self.dedup_window = dedup_window
+        self.fsync = fsync
+        self.queue_size = queue_size or self.QUEUE_SIZE
+        self.consumers: Dict[str, Consumer] = {}
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self._running = False
+        self.seq = 0
+        self.accepted = 0
+        self.duplicates = 0
+        self.log_path = Path(log_path) if log_path else None
+        self._log: Optional[TextIO] = None
+        if self.log_path is not None:
+            self._recover(self.log_path)
+            self._open_log(self.log_path)
+
+    @staticmethod
+    def make_id(payload: Dict[str, Any]) -> str:
+        raw = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    @staticmethod
+    def read_log(path: Union[str, Path]) -> Iterator[InboundSignal]:
+        """Signals in a log file, oldest first; a torn last line from a crash is skipped"""
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield InboundSignal(**json.loads(line))
+                except (ValueError, TypeError):
+                    logger.warning(f"Skipping unreadable line in signal log {path}")
+
+    def _recover(self, path: Path) -> None:
+        if not path.exists():
+            return
+        cutoff = time.time() - self.dedup_window
+        for signal in self.read_log(path):
+            self.seq = max(self.seq, signal.seq)
+            if signal.received_at >= cutoff:
+                self._seen[signal.id] = signal.received_at
+        logger.info(f"Recovered signal log {path}: seq {self.seq}, {len(self._seen)} recent ids")
+
+    def _open_log(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._log = open(path, "a", encoding="utf-8")
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.dedup_window
+        while self._seen and (len(self._seen) > self.MAX_SEEN or next(iter(self._seen.values())) < cutoff):
+            self._seen.popitem(last=False)
+
+    # -- consumers ---------------------------------------------------------
+
+    def subscribe(self, name: str, handler: ConsumerHandler) -> Consumer:
+        if name in self.consumers:
+            raise ValueError(f"Consumer {name} is already subscribed")
+        consumer = Consumer(name, handler, self.queue_size)
+        self.consumers[name] = consumer
+        if self._running:
+            consumer.task = asyncio.create_task(consumer.run())
+        return consumer
+
+    def unsubscribe(self, name: str) -> Optional[Consumer]:
+        consumer = self.consumers.pop(name, None)
+        if consumer is not None and consumer.task is not None:
+            consumer.task.cancel()
+        return consumer
+
+    # -- publishing --------------------------------------------------------
+
+    def publish(self, signal: InboundSignal) -> Optional[InboundSignal]:
+        """Enqueue for every consumer; returns the signal with its seq, or None for a duplicate"""
+        now = time.time()
+        self._prune(now)
+        if signal.id in self._seen:
+            self.duplicates += 1
+            SIGNALS.labels("duplicate").inc()
+            return None
+        self._seen[signal.id] = now
+        self.seq += 1
+        signal = signal._replace(seq=self.seq, received_at=now)
+        if self._log is not None:
+            self._log.write(json.dumps(signal._asdict(), default=str) + "\n")
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+
+        enqueued = time.perf_counter()
+        for consumer in self.consumers.values():
+            consumer.offer(enqueued, signal)
+        self.accepted += 1
+        SIGNALS.labels("accepted").inc()
+        return signal
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        self._running = True
+        if self.log_path is not None and self._log is None:
+            self._open_log(self.log_path)
+        for consumer in self.consumers.values():
+            if consumer.task is None or consumer.task.done():
+                consumer.task = asyncio.create_task(consumer.run())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Let consumers finish what is queued (up to `timeout`), then stop them and close the log"""
+        self._running = False
+        consumers = list(self.consumers.values())
+        try:
+            await asyncio.wait_for(asyncio.gather(*(c.queue.join() for c in consumers)), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Signal consumers did not drain before shutdown")
+        for consumer in consumers:
+            if consumer.task is not None:
+                consumer.task.cancel()
+        await asyncio.gather(*(c.task for c in consumers if c.task is not None), return_exceptions=True)
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    @asynccontextmanager
+    async def lifespan(self, app: Any) -> AsyncIterator[None]:
+        """FastAPI lifespan handler, like HTTPPool.lifespan"""
+        self.start()
+        try:
+            yield
+        finally:
+            await self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "tracked_ids": len(self._seen),
+            "consumers": {name: consumer.stats() for name, consumer in self.consumers.items()},
+        }
@@ -0,0 +1,209 @@
+# core/state.py
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Type, Union
+
+from ..models.trade import Balance, Bot, Deal, Record, Trade
+from ..utils.logger import get_logger
+
+logger = get_logger("StateStore")
+
+
+class StateStore:
+    """
+    Local copy of bots, deals, trades and balances.
+
+    Records are persisted in SQLite in WAL mode (readers never block the
+    writer and a crash loses at most the last uncommitted batch) and mirrored
+    in memory with indexes by account, bot and pair, so warm-up after a
+    restart is a single local read and queries never cost an API call.
+    Writes inside batch() share one transaction.
+    """
+
+    KINDS: Dict[str, Type[Record]] = {"bots": Bot, "deals": Deal, "trades": Trade, "balances": Balance}
+    INDEXED = ("account_id", "bot_id", "pair")
+
+    def __init__(self, path: str = "state.db", synchronous: str = "NORMAL"):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        for kind in self.KINDS:
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {kind} (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        self._depth = 0
+
+        self._records: Dict[str, Dict[str, Record]] = {kind: {} for kind in self.KINDS}
+        self._indexes: Dict[str, Dict[str, Dict[Any, Set[str]]]] = {
+            kind: {field: {} for field in self.INDEXED} for kind in self.KINDS
+        }
+        self.load()
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def load(self) -> None:
+        """(Re)build the in-memory state from disk"""
+        started = time.perf_counter()
+        with self._lock:
+            for kind, model in self.KINDS.items():
+                self._records[kind].clear()
+                for index in self._indexes[kind].values():
+                    index.clear()
+                for _, data in self._conn.execute(f"SELECT key, data FROM {kind}"):
+                    self._add(kind, model(**json.loads(data)))
+        counts = {kind: len(records) for kind, records in self._records.items()}
+        logger.info(f"Loaded state {counts} in {time.perf_counter() - started:.3f}s")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "StateStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @contextmanager
+    def batch(self) -> Iterator["StateStore"]:
+        """Group writes into one transaction; nested batches join the outer one"""
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                    self.load()
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("COMMIT")
+
+    def snapshot(self, dest: str) -> None:
+        """Consistent online copy of the database, safe while writes continue"""
+        with self._lock:
+            target = sqlite3.connect(dest)
+            try:
+                self._conn.backup(target)
+            finally:
+                target.close()
+
+    def checkpoint(self) -> None:
+        """Fold the WAL back into the main database file"""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    # -- writes ------------------------------------------------------------
+
+    def _model(self, kind: str) -> Type[Record]:
+        try:
+            return self.KINDS[kind]
+        except KeyError:
+            raise ValueError(f"Unknown record kind: {kind}") from None
+
+    def _index_values(self, record: Record, field: str) -> List[Any]:
+        if field == "pair" and isinstance(record, Bot):
+            return list(record.pairs)
+        value = getattr(record, field, None)
+        return [] if value is None else [value]
+
+    def _add(self, kind: str, record: Record) -> None:
+        key = record.key()
+        self._records[kind][key] = record
+        for field, index in self._indexes[kind].items():
+            for value in self._index_values(record, field):
+                index.setdefault(value, set()).add(key)
+
+    def _remove(self, kind: str, key: str) -> Optional[Record]:
+        record = self._records[kind].pop(key, None)
+        if record is None:
+            return None
+        for field, index in self._indexes[kind].items():
+            for value in self._index_values(record, field):
+                keys = index.get(value)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del index[value]
+        return record
+
+    def upsert(self, kind: str, record: Union[Record, Dict[str, Any]]) -> Record:
+        return self.upsert_many(kind, [record])[0]
+
+    def upsert_many(self, kind: str, records: Iterable[Union[Record, Dict[str, Any]]]) -> List[Record]:
+        """Insert or replace records; raw 3Commas dicts are validated into the kind's model"""
+        model = self._model(kind)
+        parsed = [r if isinstance(r, model) else model(**(r if isinstance(r, dict) else r.dict())) for r in records]
+        rows = [(r.key(), json.dumps(r.dict(), default=str)) for r in parsed]
+        with self.batch():
+            self._conn.executemany(f"INSERT OR REPLACE INTO {kind} (key, data) VALUES (?, ?)", rows)
+            for record in parsed:
+                self._remove(kind, record.key())
+                self._add(kind, record)
+        return parsed
+
+    def delete(self, kind: str, key: Any) -> bool:
+        self._model(kind)
+        with self.batch():
+            self._conn.execute(f"DELETE FROM {kind} WHERE key = ?", (str(key),))
+            return self._remove(kind, str(key)) is not None
+
+    def replace_all(self, kind: str, records: Iterable[Union[Record, Dict[str, Any]]], **scope: Any) -> List[Record]:
+        """
+        Make the stored records matching `scope` (e.g. account_id=1) exactly
+        `records`: upsert them and drop the ones 3Commas no longer returns.
+        """
+        with self.batch():
+            kept = self.upsert_many(kind, records)
+            fresh = {record.key() for record in kept}
+            for record in self.query(kind, **scope):
+                if record.key() not in fresh:
+                    self.delete(kind, record.key())
+        return kept
+
+    # -- reads -------------------------------------------------------------
+
+    def get(self, kind: str, key: Any) -> Optional[Record]:
+        self._model(kind)
+        return self._records[kind].get(str(key))
+
+    def all(self, kind: str) -> List[Record]:
+        self._model(kind)
+        return list(self._records[kind].values())
+
+    def query(self, kind: str, **filters: Any) -> List[Record]:
+        """Records matching every indexed filter, e.g. query("deals", account_id=1, pair="USDT_BTC")"""
+        self._model(kind)
+        unknown = set(filters) - set(self.INDEXED)
+        if unknown:
+            raise ValueError(f"Not an indexed field: {', '.join(sorted(unknown))}")
+        with self._lock:
+            if not filters:
+                return list(self._records[kind].values())
+            keys: Optional[Set[str]] = None
+            for field, value in sorted(filters.items(), key=lambda f: len(self._indexes[kind][f[0]].get(f[1], ()))):
+                matches = self._indexes[kind][field].get(value, set())
+                keys = set(matches) if keys is None else keys & matches
+                if not keys:
+                    return []
+            return [self._records[kind][key] for key in keys or ()]
+
+    def active_deals(self, **filters: Any) -> List[Deal]:
+        return [deal for deal in self.query("deals", **filters) if isinstance(deal, Deal) and deal.active]
+
+    def balances(self, account_id: int) -> Dict[str, Balance]:
+        return {
+            balance.currency: balance
+            for balance in self.query("balances", account_id=account_id)
+            if isinstance(balance, Balance)
+        }
+
+    def stats(self) -> Dict[str, int]:
+        return {kind: len(records) for kind, records in self._records.items()}
@@ -1,15 +1,32 @@
-import json
-import time
-from typing import List, Optional
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
 from fastapi import FastAPI, HTTPException, Query, Path
 from fastapi.middleware.cors import CORSMiddleware
-from httpx import AsyncClient
-from bot.config.config import THREE_COMMAS_API_KEY, THREE_COMMAS_BASE_URL, THREE_COMMAS_API_SECRET
-from .signer import generate_signature
-from .schemas import AddExchangeAccountPayload, CreateDCABotPayload, CreateGridBotPayload, UpdateGridBotPayload
+from fastapi.responses import PlainTextResponse
+from bot.api_client.cache import response_cache
+from bot.api_client.endpoints import dcaendpoint
+from bot.config.config import BATCH_CONCURRENCY
+from bot.utils.metrics import REGISTRY
+from .gateway import gateway_pool, logger, make_3commas_request
+from .grid_bots import router as grid_bots_router
+from .signals import router as signals_router, signal_bus
+from .schemas import (
+    AddExchangeAccountPayload,
+    CreateDCABotPayload,
+    DCABotBatchAction,
+    DCABotBatchPayload,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """The shared 3Commas connection pool and the signal consumers live as long as the app"""
+    async with gateway_pool.lifespan(app), signal_bus.lifespan(app):
+        yield
+
 
 # Initialize app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -20,55 +37,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-async def make_3commas_request(method: str, path: str, params: dict = None, payload: dict = None):
-    nonce = str(int(time.time() * 1000))
-    url = f"{THREE_COMMAS_BASE_URL}{path}"
+app.include_router(grid_bots_router)
+app.include_router(signals_router)
 
-    query_string = ""
-    if method == "GET" and params:
-        query_string = "&".join(f"{k}={v}" for k, v in params.items() if v is not None)
-        url = f"{url}?{query_string}"
+@app.get("/pool/stats")
+async def get_pool_stats() -> Dict[str, Any]:
+    """
+    Utilization of the shared 3Commas HTTP connection pool.
+    """
+    return gateway_pool.stats()
 
-    body = json.dumps(payload, separators=(",", ":"), sort_keys=True) if payload else ""
 
-    signature = generate_signature(THREE_COMMAS_API_SECRET, path, query_string, body)
+@app.get("/cache/stats")
+async def get_cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss/coalescing counters of the read-only response cache.
+    """
+    return response_cache.stats()
 
-    headers = {
-        "APIKEY": THREE_COMMAS_API_KEY,
-        "Signature": signature,
-        "Content-Type": "application/json",
-    }
 
-    async with AsyncClient() as client:
-        if method == "GET":
-            response = await client.get(url, headers=headers)
-        elif method == "POST":
-            response = await client.post(url, headers=headers, content=body)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported HTTP method")
-
-    print(f"3Commas API Request: {method} {url}")
-    print(f"Headers: {headers}")
-    if payload:
-        print(f"Payload: {payload}")
-    print(f"Response: {response.status_code} {response.text}")
-
-    if response.status_code == 204:
-        return None
-    if 200 <= response.status_code < 300:
-        try:
-            return response.json() if response.text else None
-        except json.JSONDecodeError:
-            return response.text
-    else:
-        raise HTTPException(
-            status_code=response.status_code,
-            detail=response.text or f"3Commas API returned status code {response.status_code}"
-        )
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """
+    3Commas call counts, latencies, retries and errors in the Prometheus text format.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=REGISTRY.CONTENT_TYPE)
 
 #=================================EXCHANGE ACCOUNT ENDPOINTS=================================
 @app.post("/add-exchange-account/")
-async def add_exchange_account(payload: AddExchangeAccountPayload):
+async def add_exchange_account(payload: AddExchangeAccountPayload) -> Any:
     try:
         result = await make_3commas_request(
             "POST",
@@ -83,7 +80,7 @@ async def add_exchange_account(payload: AddExchangeAccountPayload):
 
 
 @app.get("/account/list")
-async def get_accounts_list():
+async def get_accounts_list() -> Any:
     """
     Fetch the list of all exchange accounts associated with your 3Commas API key.
     """
@@ -92,14 +89,14 @@ async def get_accounts_list():
             "GET",
             "/public/api/ver1/accounts"
         )
-        print(f"Accounts List Response: {response}")
+        logger.debug("Accounts List Response: %s", response)
         return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/account/details/{account_id}")
-async def get_account_details(account_id: int = Path(..., description="3Commas account ID")):
+async def get_account_details(account_id: int = Path(..., description="3Commas account ID")) -> Any:
     """
     Fetch exchange account details using the 3Commas account ID.
     """
@@ -115,7 +112,7 @@ async def get_account_details(account_id: int = Path(..., description="3Commas a
 
 #=================================DCA ENDPOINTS=================================
 @app.post("/create-dca-bot/")
-async def create_dca_bot(payload: CreateDCABotPayload):
+async def create_dca_bot(payload: CreateDCABotPayload) -> Any:
     try:
         result = await make_3commas_request(
             "POST",
@@ -129,7 +126,7 @@ async def create_dca_bot(payload: CreateDCABotPayload):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/get-dca-bot/{bot_id}")
-async def get_dca_bot(bot_id: int, include_events: bool = True):
+async def get_dca_bot(bot_id: int, include_events: bool = True) -> Any:
     try:
         result = await make_3commas_request(
             "GET",
@@ -151,7 +148,7 @@ async def list_dca_bots(
     order_direction: str = "DESC",
     limit: Optional[int] = None,
     offset: Optional[int] = None
-):
+) -> Any:
     try:
         params = {
             "account_id": account_id,
@@ -181,7 +178,7 @@ async def get_strategy_list(
     account_id: Optional[int] = Query(None, description="3Commas exchange account ID"),
     type: Optional[str] = Query(None, description="Strategy direction type"),
     strategy: Optional[str] = Query(None, description="Strategy name")
-):
+) -> Any:
     try:
         params = {
             "account_id": account_id,
@@ -203,7 +200,7 @@ async def get_strategy_list(
 
 
 @app.post("/enable-dca-bot/{bot_id}")
-async def enable_dca_bot(bot_id: int):
+async def enable_dca_bot(bot_id: int) -> Any:
     try:
         result = await make_3commas_request(
             method="POST",
@@ -217,7 +214,7 @@ async def enable_dca_bot(bot_id: int):
     
     
 @app.post("/disable-dca-bot/{bot_id}")
-async def disable_dca_bot(bot_id: int):
+async def disable_dca_bot(bot_id: int) -> Any:
     try:
         result = await make_3commas_request(
             method="POST",
@@ -230,7 +227,7 @@ async def disable_dca_bot(bot_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/delete-dca-bot/{bot_id}")
-async def delete_dca_bot(bot_id: int):
+async def delete_dca_bot(bot_id: int) -> Any:
     try:
         result = await make_3commas_request(
             method="POST",
@@ -244,7 +241,7 @@ async def delete_dca_bot(bot_id: int):
 
 
 @app.post("/update-dca-bot/{bot_id}")
-async def update_dca_bot(bot_id: int, payload: CreateDCABotPayload):
+async def update_dca_bot(bot_id: int, payload: CreateDCABotPayload) -> Any:
     try:
         result = await make_3commas_request(
             method="POST",
@@ -256,200 +253,54 @@ async def update_dca_bot(bot_id: int, payload: CreateDCABotPayload):
         raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-#=================================DCA ENDPOINTS END=================================
-
-
-
-#=================================GRID ENDPOINTS=================================
-@app.post("/create-grid-bot/")
-async def create_grid_bot(payload: CreateGridBotPayload):
-    try:
-        result = await make_3commas_request(
-            "POST",
-            "/public/api/ver1/grid_bots/manual",
-            payload=payload.dict(exclude_none=True)
-        )
-        return result or {"detail": "Grid bot created successfully (no content returned)"}
-    except HTTPException as he:
-        raise he
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
 
-@app.patch("/{bot_id}/manual")
-async def update_grid_bot(bot_id: int = Path(..., description="3Commas Grid Bot ID"),
-                          payload: UpdateGridBotPayload = ...):
-    try:
-        endpoint = f"/public/api/ver1/grid_bots/{bot_id}/manual"
-        response = await make_3commas_request(
-            method="PATCH",
-            path=endpoint,
-            body=payload.dict(exclude_none=True)
-        )
-        return response
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    
 
-@app.get("/grid-bots/{bot_id}")
-def get_grid_bot(bot_id: int = Path(..., description="Grid Bot ID")):
-    """
-    Get a single Grid Bot by its ID.
-    """
-    response = make_3commas_request(
-        method="GET",
-        path=f"/public/api/ver1/grid_bots/{bot_id}",
-    )
-    return response
-
-
-@app.get("/grid-bots")
-def list_grid_bots(
-    account_ids: Optional[List[int]] = Query(None, description="Comma-separated list of account IDs"),
-    state: Optional[str] = Query(None, description="Bot state: enabled or disabled"),
-    sort_by: Optional[str] = Query(None),
-    sort_direction: Optional[str] = Query("DESC", regex="^(ASC|DESC)$"),
-    limit: Optional[int] = Query(None),
-    offset: Optional[int] = Query(None),
-    from_date: Optional[str] = Query(None, alias="from"),
-    base: Optional[str] = Query(None),
-    quote: Optional[str] = Query(None)
-):
-    """
-    Get a list of Grid Bots with optional filters.
-    """
-    query_params = {}
-
-    if account_ids:
-        query_params["account_ids[]"] = account_ids
-    if state:
-        query_params["state"] = state
-    if sort_by:
-        query_params["sort_by"] = sort_by
-    if sort_direction:
-        query_params["sort_direction"] = sort_direction
-    if limit:
-        query_params["limit"] = limit
-    if offset:
-        query_params["offset"] = offset
-    if from_date:
-        query_params["from"] = from_date
-    if base:
-        query_params["base"] = base
-    if quote:
-        query_params["quote"] = quote
-
-    response = make_3commas_request(
-        method="GET",
-        path="/public/api/ver1/grid_bots",
-        params=query_params
-    )
-    return response
-
-
-@app.get("/grid-bots/{bot_id}/profits")
-def get_grid_bot_profits(
-    bot_id: int = Path(..., description="Grid Bot ID"),
-    from_date: Optional[str] = Query(None, alias="from", description="Filter from ISO date"),
-    to_date: Optional[str] = Query(None, alias="to", description="Filter to ISO date")
-):
-    """
-    Get profit details for a specific Grid Bot.
-    """
-    query_params = {}
-    if from_date:
-        query_params["from"] = from_date
-    if to_date:
-        query_params["to"] = to_date
-
-    response = make_3commas_request(
-        method="GET",
-        path=f"/public/api/ver1/grid_bots/{bot_id}/profits",
-        params=query_params
-    )
-    return response
-
-
-@app.post("/grid-bots/{bot_id}/enable")
-def enable_grid_bot(bot_id: int = Path(..., description="Grid Bot ID")):
-    """
-    Enable a specific Grid Bot by ID.
-    """
-    response = make_3commas_request(
-        method="POST",
-        path=f"/public/api/ver1/grid_bots/{bot_id}/enable"
-    )
-    return response
+BATCH_ACTION_ENDPOINTS = {
+    "enable": dcaendpoint.enable_dca_bot,
+    "disable": dcaendpoint.disable_dca_bot,
+    "delete": dcaendpoint.delete_dca_bot,
+    "update": dcaendpoint.update_dca_bot,
+}
 
 
-@app.post("/grid-bots/{bot_id}/disable")
-def disable_grid_bot(bot_id: int = Path(..., description="Grid Bot ID")):
-    """
-    Disable a specific Grid Bot by ID.
-    """
-    response = make_3commas_request(
-        method="POST",
-        path=f"/public/api/ver1/grid_bots/{bot_id}/disable"
-    )
-    return response
+async def _run_batch_action(item: DCABotBatchAction, semaphore: asyncio.Semaphore) -> dict:
+    result = {"bot_id": item.bot_id, "action": item.action}
+    if item.action == "update" and item.payload is None:
+        return {**result, "status": "error", "status_code": 422, "detail": "payload is required for update"}
 
-
-@app.delete("/grid-bots/{bot_id}")
-def delete_grid_bot(bot_id: int = Path(..., description="Grid Bot ID")):
-    """
-    Delete a specific Grid Bot by ID.
+    async with semaphore:
+        try:
+            response = await make_3commas_request(
+                method="POST",
+                path=f"/public/api{BATCH_ACTION_ENDPOINTS[item.action](item.bot_id)}",
+                payload=item.payload.dict() if item.action == "update" and item.payload is not None else None
+            )
+            return {**result, "status": "ok", "result": response}
+        except HTTPException as he:
+            return {**result, "status": "error", "status_code": he.status_code, "detail": he.detail}
+        except Exception as e:
+            return {**result, "status": "error", "status_code": 500, "detail": str(e)}
+
+
+@app.post("/dca-bots/batch")
+async def batch_dca_bots(payload: DCABotBatchPayload) -> Dict[str, Any]:
     """
-    response = make_3commas_request(
-        method="DELETE",
-        path=f"/public/api/ver1/grid_bots/{bot_id}"
-    )
-    return response
-
+    Enable, disable, update or delete many DCA bots in one call.
 
-@app.get("/grid-bots/{bot_id}/required-balances")
-def get_required_balances(bot_id: int = Path(..., description="Grid Bot ID")):
-    """
-    Get required and missing balances for launching a Grid Bot.
-    Works only for Spot exchanges.
+    Actions fan out concurrently (at most `concurrency` upstream calls at once)
+    and are paced by the shared 3Commas rate limiter. One failed action does
+    not abort the others; every action gets its own result entry.
     """
-    response = make_3commas_request(
-        method="GET",
-        path=f"/public/api/ver1/grid_bots/{bot_id}/required_balances"
-    )
-    return response
-
-
-@app.get("/grid-bots/{bot_id}/events")
-def get_grid_bot_events(
-    bot_id: int = Path(..., description="Grid Bot ID"),
-    page: int = Query(1, ge=1, description="Page number for pagination"),
-    per_page: int = Query(100, ge=1, le=100, description="Records per page (1–100)")
-):
-    """
-    Retrieve a list of events for a specific Grid Bot by ID.
-    """
-    response = make_3commas_request(
-        method="GET",
-        path=f"/public/api/ver1/grid_bots/{bot_id}/events",
-        params={"page": page, "per_page": per_page}
-    )
-    return response
-
-
-@app.get("/grid-bots/{bot_id}/market-orders")
-def get_grid_bot_market_orders(
-    bot_id: int = Path(..., description="Unique 3Commas ID for this Grid Bot entity"),
-    limit: int = Query(100, ge=1, le=1000, description="Number of records to fetch"),
-    offset: int = Query(0, ge=0, description="Offset for pagination")
-):
-    """
-    Returns a list of market orders for a specific Grid Bot by ID.
-    """
-    response = make_3commas_request(
-        method="GET",
-        path=f"/public/api/ver1/grid_bots/{bot_id}/market_orders",
-        params={"limit": limit, "offset": offset}
-    )
-    return response
-#=================================GRID ENDPOINTS END=================================
\ No newline at end of file
+    if not payload.actions:
+        raise HTTPException(status_code=422, detail="actions must not be empty")
+
+    semaphore = asyncio.Semaphore(payload.concurrency or BATCH_CONCURRENCY)
+    results = await asyncio.gather(*(_run_batch_action(item, semaphore) for item in payload.actions))
+    failed = sum(1 for result in results if result["status"] != "ok")
+    return {
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
+#=================================DCA ENDPOINTS END=================================
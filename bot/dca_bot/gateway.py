@@ -0,0 +1,200 @@
+import json
+import math
+import time
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional
+import httpx
+from fastapi import HTTPException
+from bot.api_client.cache import response_cache
+from bot.api_client.circuit_breaker import circuit_breaker, is_failure_status
+from bot.api_client.hedging import hedged_async
+from bot.api_client.http_pool import HTTPPool
+from bot.api_client.instrumentation import Attempt, endpoint_family, observe_error, observe_retry
+from bot.api_client.pagination import paginate
+from bot.api_client.rate_limiter import rate_limiter
+from bot.api_client.signing import get_signer
+from bot.utils.logger import get_logger
+from bot.utils.metrics import REGISTRY
+from bot.config.config import (
+    THREE_COMMAS_API_KEY,
+    THREE_COMMAS_BASE_URL,
+    THREE_COMMAS_API_SECRET,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP2_ENABLED,
+    HEDGE_GETS,
+)
+
+logger = get_logger("Gateway")
+
+# One pooled client per process, opened/closed by the FastAPI lifespan
+gateway_pool = HTTPPool(
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    timeout=HTTP_TIMEOUT,
+    connect_timeout=HTTP_CONNECT_TIMEOUT,
+    http2=HTTP2_ENABLED,
+)
+
+signer = get_signer(THREE_COMMAS_API_SECRET)
+
+REGISTRY.add_collector("threecommas_http_pool", gateway_pool.stats)
+REGISTRY.add_collector("threecommas_response_cache", response_cache.stats)
+REGISTRY.add_collector("threecommas_circuit_breaker", circuit_breaker.stats)
+
+SUPPORTED_METHODS = ("GET", "POST", "PATCH", "DELETE")
+
+# A 429 is re-queued behind the shared rate limiter this many times before it reaches the caller
+RATE_LIMIT_REQUEUES = 2
+
+
+async def make_3commas_request(
+    method: str, path: str, params: Optional[Dict[str, Any]] = None, payload: Optional[Dict[str, Any]] = None
+) -> Any:
+    """
+    Signed call to the 3Commas API.
+
+    Read-only endpoints listed in ResponseCache.TTLS are served from the shared
+    response cache (identical concurrent GETs share one upstream call); any
+    successful mutating call invalidates the cached entries of its resource.
+    Calls to an endpoint whose circuit is open fail fast with a 503, and with
+    HEDGE_GETS set a slow GET is re-sent once it passes the endpoint's p95.
+    """
+    if method == "GET":
+        return await response_cache.get_or_fetch_async(
+            THREE_COMMAS_API_KEY, method, path, params,
+            lambda: _send_3commas_request(method, path, params, payload),
+        )
+    result = await _send_3commas_request(method, path, params, payload)
+    response_cache.invalidate(THREE_COMMAS_API_KEY, path)
+    return result
+
+
+async def _send_attempt(
+    method: str, path: str, url: str, headers: dict, body: Optional[bytes], attempt: int
+) -> httpx.Response:
+    """One upstream attempt; its outcome is reported to the endpoint's circuit"""
+    await rate_limiter.acquire_async(THREE_COMMAS_API_KEY, path)
+    started = time.perf_counter()
+    try:
+        with Attempt("gateway", path, method, attempt) as timing:
+            response = await gateway_pool.request(method, url, headers=headers, content=body)
+            timing.status = response.status_code
+    except httpx.TransportError:
+        circuit_breaker.record(path, failed=True)
+        raise
+    circuit_breaker.record(path, is_failure_status(response.status_code), time.perf_counter() - started)
+    rate_limiter.update_from_headers(THREE_COMMAS_API_KEY, path, response.headers)
+    return response
+
+
+async def _send_3commas_request(
+    method: str, path: str, params: Optional[Dict[str, Any]] = None, payload: Optional[Dict[str, Any]] = None
+) -> Any:
+    if method not in SUPPORTED_METHODS:
+        raise HTTPException(status_code=400, detail="Unsupported HTTP method")
+
+    # GET/DELETE parameters travel in the query string, everything else as the JSON body;
+    # the bytes signed here are the bytes sent below
+    query_style = method in ("GET", "DELETE")
+    signed = signer.prepare(method, path, params if query_style else payload, empty_body=b"")
+    url = f"{THREE_COMMAS_BASE_URL}{signed.target}"
+
+    headers = {
+        "APIKEY": THREE_COMMAS_API_KEY,
+        "Signature": signed.signature,
+        "Content-Type": "application/json",
+    }
+
+    for attempt in range(RATE_LIMIT_REQUEUES + 1):
+        wait = circuit_breaker.allow(path)
+        if wait is not None:
+            error = HTTPException(
+                status_code=503,
+                detail=f"3Commas circuit open for {endpoint_family(path)}",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+            observe_error(path, error)
+            raise error
+
+        def send() -> Awaitable[httpx.Response]:
+            return _send_attempt(method, path, url, headers, signed.body, attempt + 1)
+
+        response = await (hedged_async(path, send) if method == "GET" and HEDGE_GETS else send())
+        if response.status_code != 429:
+            break
+        if attempt < RATE_LIMIT_REQUEUES:
+            observe_retry(path, "429")
+        if "Retry-After" not in response.headers:
+            rate_limiter.penalize(THREE_COMMAS_API_KEY, path, 1.0)
+
+    logger.debug(
+        "3Commas %s %s -> %s headers=%s payload=%s response=%s",
+        method, url, response.status_code, headers, payload, response.text,
+    )
+
+    if response.status_code == 204:
+        return None
+    if 200 <= response.status_code < 300:
+        try:
+            return response.json() if response.text else None
+        except json.JSONDecodeError:
+            return response.text
+    else:
+        error = HTTPException(
+            status_code=response.status_code,
+            detail=response.text or f"3Commas API returned status code {response.status_code}"
+        )
+        observe_error(path, error)
+        raise error
+
+
+async def iter_dca_bots(page_size: int = 100, prefetch: int = 4, **filters: Any) -> AsyncIterator[dict]:
+    """Stream every DCA bot matching `filters` (account_id, strategy, scope, ...)"""
+    async def fetch(index: int) -> Any:
+        params = {**filters, "limit": page_size, "offset": index * page_size}
+        return await make_3commas_request("GET", "/public/api/ver1/bots", params=params)
+
+    async for bot in paginate(fetch, page_size, prefetch):
+        yield bot
+
+
+async def iter_grid_bots(page_size: int = 100, prefetch: int = 4, **filters: Any) -> AsyncIterator[dict]:
+    """Stream every grid bot matching `filters` (account_ids[], state, base, quote, ...)"""
+    async def fetch(index: int) -> Any:
+        params = {**filters, "limit": page_size, "offset": index * page_size}
+        return await make_3commas_request("GET", "/public/api/ver1/grid_bots", params=params)
+
+    async for bot in paginate(fetch, page_size, prefetch):
+        yield bot
+
+
+async def iter_grid_bot_events(bot_id: int, per_page: int = 100, prefetch: int = 4) -> AsyncIterator[dict]:
+    """Stream every event of a grid bot (the API caps per_page at 100)"""
+    per_page = min(per_page, 100)
+
+    async def fetch(index: int) -> Any:
+        params = {"page": index + 1, "per_page": per_page}
+        return await make_3commas_request(
+            "GET", f"/public/api/ver1/grid_bots/{bot_id}/events", params=params
+        )
+
+    async for event in paginate(fetch, per_page, prefetch):
+        yield event
+
+
+async def iter_grid_bot_market_orders(
+    bot_id: int, page_size: int = 1000, prefetch: int = 4
+) -> AsyncIterator[dict]:
+    """Stream every market order of a grid bot"""
+    async def fetch(index: int) -> Any:
+        params = {"limit": page_size, "offset": index * page_size}
+        return await make_3commas_request(
+            "GET", f"/public/api/ver1/grid_bots/{bot_id}/market_orders", params=params
+        )
+
+    async for order in paginate(fetch, page_size, prefetch):
+        yield order
@@ -0,0 +1,182 @@
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Body, HTTPException, Query, Path
+from .gateway import make_3commas_request
+from .schemas import CreateGridBotPayload, UpdateGridBotPayload
+from ..strategies.grid import GridEngine
+
+GRID_BOTS_PATH = "/public/api/ver1/grid_bots"
+
+router = APIRouter(tags=["grid bots"])
+
+
+async def _grid_request(
+    method: str, path: str = "", params: Optional[Dict[str, Any]] = None, payload: Optional[Dict[str, Any]] = None
+) -> Any:
+    """Proxy a grid bot call through the shared, pooled 3Commas gateway"""
+    try:
+        return await make_3commas_request(
+            method,
+            f"{GRID_BOTS_PATH}{path}",
+            params=params,
+            payload=payload
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+#=================================GRID ENDPOINTS=================================
+@router.post("/create-grid-bot/")
+async def create_grid_bot(payload: CreateGridBotPayload) -> Any:
+    result = await _grid_request("POST", "/manual", payload=payload.dict(exclude_none=True))
+    return result or {"detail": "Grid bot created successfully (no content returned)"}
+
+
+@router.patch("/grid-bots/{bot_id}/manual")
+@router.patch("/{bot_id}/manual", include_in_schema=False)
+async def update_grid_bot(bot_id: int = Path(..., description="3Commas Grid Bot ID"),
+                          payload: UpdateGridBotPayload = Body(...)) -> Any:
+    """
+    Edit a manual Grid Bot.
+    """
+    result = await _grid_request("PATCH", f"/{bot_id}/manual", payload=payload.dict(exclude_none=True))
+    return result or {"detail": f"Grid bot {bot_id} updated successfully (no content returned)"}
+
+
+@router.get("/grid-bots/{bot_id}")
+async def get_grid_bot(bot_id: int = Path(..., description="Grid Bot ID")) -> Any:
+    """
+    Get a single Grid Bot by its ID.
+    """
+    return await _grid_request("GET", f"/{bot_id}")
+
+
+@router.get("/grid-bots")
+async def list_grid_bots(
+    account_ids: Optional[List[int]] = Query(None, description="Comma-separated list of account IDs"),
+    state: Optional[str] = Query(None, description="Bot state: enabled or disabled"),
+    sort_by: Optional[str] = Query(None),
+    sort_direction: Optional[str] = Query("DESC", pattern="^(ASC|DESC)$"),
+    limit: Optional[int] = Query(None),
+    offset: Optional[int] = Query(None),
+    from_date: Optional[str] = Query(None, alias="from"),
+    base: Optional[str] = Query(None),
+    quote: Optional[str] = Query(None)
+) -> Any:
+    """
+    Get a list of Grid Bots with optional filters.
+    """
+    query_params = {
+        "account_ids[]": account_ids,
+        "state": state,
+        "sort_by": sort_by,
+        "sort_direction": sort_direction,
+        "limit": limit,
+        "offset": offset,
+        "from": from_date,
+        "base": base,
+        "quote": quote,
+    }
+    # Remove empty values
+    query_params = {k: v for k, v in query_params.items() if v}
+
+    return await _grid_request("GET", params=query_params)
+
+
+@router.get("/grid-bots/{bot_id}/profits")
+async def get_grid_bot_profits(
+    bot_id: int = Path(..., description="Grid Bot ID"),
+    from_date: Optional[str] = Query(None, alias="from", description="Filter from ISO date"),
+    to_date: Optional[str] = Query(None, alias="to", description="Filter to ISO date")
+) -> Any:
+    """
+    Get profit details for a specific Grid Bot.
+    """
+    query_params = {"from": from_date, "to": to_date}
+    query_params = {k: v for k, v in query_params.items() if v}
+
+    return await _grid_request("GET", f"/{bot_id}/profits", params=query_params)
+
+
+@router.post("/grid-bots/{bot_id}/enable")
+async def enable_grid_bot(bot_id: int = Path(..., description="Grid Bot ID")) -> Any:
+    """
+    Enable a specific Grid Bot by ID.
+    """
+    result = await _grid_request("POST", f"/{bot_id}/enable")
+    return result or {"detail": f"Grid bot {bot_id} enabled successfully (no content returned)"}
+
+
+@router.post("/grid-bots/{bot_id}/disable")
+async def disable_grid_bot(bot_id: int = Path(..., description="Grid Bot ID")) -> Any:
+    """
+    Disable a specific Grid Bot by ID.
+    """
+    result = await _grid_request("POST", f"/{bot_id}/disable")
+    return result or {"detail": f"Grid bot {bot_id} disabled successfully (no content returned)"}
+
+
+@router.delete("/grid-bots/{bot_id}")
+async def delete_grid_bot(bot_id: int = Path(..., description="Grid Bot ID")) -> Any:
+    """
+    Delete a specific Grid Bot by ID.
+    """
+    result = await _grid_request("DELETE", f"/{bot_id}")
+    return result or {"detail": f"Grid bot {bot_id} deleted successfully (no content returned)"}
+
+
+@router.get("/grid-bots/{bot_id}/required-balances")
+async def get_required_balances(bot_id: int = Path(..., description="Grid Bot ID")) -> Any:
+    """
+    Get required and missing balances for launching a Grid Bot.
+    Works only for Spot exchanges.
+    """
+    return await _grid_request("GET", f"/{bot_id}/required_balances")
+
+
+@router.post("/grid-bots/estimate")
+async def estimate_grid_bot(
+    payload: CreateGridBotPayload,
+    current_price: float = Query(..., gt=0, description="Price the bot would start at")
+) -> Dict[str, Any]:
+    """
+    Compute grid lines, required balances and profit per grid locally,
+    without creating the bot or calling 3Commas.
+    """
+    try:
+        engine = GridEngine.from_payload(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {
+        "levels": engine.levels.tolist(),
+        "required_balances": engine.required_balances(current_price),
+        "profit_per_grid": engine.profit_per_grid(),
+    }
+
+
+@router.get("/grid-bots/{bot_id}/events")
+async def get_grid_bot_events(
+    bot_id: int = Path(..., description="Grid Bot ID"),
+    page: int = Query(1, ge=1, description="Page number for pagination"),
+    per_page: int = Query(100, ge=1, le=100, description="Records per page (1–100)")
+) -> Any:
+    """
+    Retrieve a list of events for a specific Grid Bot by ID.
+    """
+    return await _grid_request("GET", f"/{bot_id}/events", params={"page": page, "per_page": per_page})
+
+
+@router.get("/grid-bots/{bot_id}/market-orders")
+async def get_grid_bot_market_orders(
+    bot_id: int = Path(..., description="Unique 3Commas ID for this Grid Bot entity"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of records to fetch"),
+    offset: int = Query(0, ge=0, description="Offset for pagination")
+) -> Any:
+    """
+    Returns a list of market orders for a specific Grid Bot by ID.
+    """
+    return await _grid_request(
+        "GET", f"/{bot_id}/market_orders", params={"limit": limit, "offset": offset}
+    )
+#=================================GRID ENDPOINTS END=================================
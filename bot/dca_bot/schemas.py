@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any, Union
 from pydantic import BaseModel, Field, validator
 
 
@@ -68,6 +68,18 @@ class CreateDCABotPayload(BaseModel):
 
 
 
+class DCABotBatchAction(BaseModel):
+    bot_id: int
+    action: Literal["enable", "disable", "delete", "update"]
+    payload: Optional[CreateDCABotPayload] = Field(None, description="Required for 'update'")
+
+
+class DCABotBatchPayload(BaseModel):
+    actions: List[DCABotBatchAction]
+    concurrency: Optional[int] = Field(None, ge=1, le=100, description="Max concurrent upstream calls")
+
+
+
 class AddExchangeAccountPayload(BaseModel):
     type: str = Field(..., description="Market code (e.g., 'binance')")
     name: str = Field(..., description="Name for this exchange account")
@@ -129,3 +141,25 @@ class UpdateGridBotPayload(BaseModel):
     note: Optional[str] = Field(None, max_length=300)
     ignore_warnings: Optional[bool] = False
     mode: Optional[str] = "long"
+
+
+class TradingViewSignalPayload(BaseModel):
+    """
+    Webhook body in the TradingView/3Commas custom-signal style, e.g.
+    {"secret": "...", "action": "{{strategy.order.action}}", "tv_instrument": "{{ticker}}",
+     "trigger_price": "{{close}}", "timestamp": "{{timenow}}"}
+    """
+    secret: str
+    action: str = Field(..., min_length=1, max_length=64)
+    strategy: Optional[str] = Field(None, max_length=64)
+    pair: Optional[str] = None  # 3Commas pair, e.g. "USDT_BTC"; preferred over tv_instrument
+    tv_instrument: Optional[str] = None
+    tv_exchange: Optional[str] = None
+    bot_id: Optional[int] = None
+    trigger_price: Optional[float] = None
+    timestamp: Optional[Union[float, str]] = None  # ISO 8601 or unix seconds
+    max_lag: Optional[float] = Field(None, gt=0)  # seconds; can only tighten SIGNAL_MAX_LAG
+    id: Optional[str] = Field(None, max_length=128)  # sender's dedup key
+
+    class Config:
+        extra = "allow"
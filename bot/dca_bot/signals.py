@@ -0,0 +1,95 @@
+import hmac
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union
+from fastapi import APIRouter, HTTPException, Request
+from bot.config.config import SIGNAL_DEDUP_WINDOW, SIGNAL_LOG_PATH, SIGNAL_MAX_LAG, SIGNAL_SECRETS
+from bot.core.signal_bus import SIGNALS, InboundSignal, SignalBus
+from bot.utils.metrics import REGISTRY
+from .schemas import TradingViewSignalPayload
+
+router = APIRouter(tags=["signals"])
+
+# Consumers subscribe to this bus, e.g.
+#   signal_bus.subscribe("executor", engine_handler(executor.on_signal))
+#   signal_bus.subscribe("engine", lambda signal: engine.publish(signal.event()))
+signal_bus = SignalBus(dedup_window=SIGNAL_DEDUP_WINDOW, log_path=SIGNAL_LOG_PATH)
+
+REGISTRY.add_collector("signal_bus", signal_bus.stats)
+
+
+def _reject(outcome: str, status_code: int, detail: str) -> HTTPException:
+    SIGNALS.labels(outcome).inc()
+    return HTTPException(status_code=status_code, detail=detail)
+
+
+def _timestamp(value: Optional[Union[float, str]]) -> Optional[float]:
+    """Unix seconds (or milliseconds) or an ISO 8601 string such as TradingView's {{timenow}}"""
+    if value is None or value == "":
+        return None
+    try:
+        seconds = float(value)
+        return seconds / 1000 if seconds > 1e11 else seconds
+    except ValueError:
+        pass
+    moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+#=================================SIGNAL ENDPOINTS=================================
+@router.post("/signals", status_code=202)
+async def receive_signal(request: Request) -> Dict[str, Any]:
+    """
+    Accept a TradingView-style webhook signal and queue it for the bus consumers.
+
+    TradingView posts alert messages as text/plain, so the body is parsed as
+    JSON whatever the content type. The `secret` must match one of
+    SIGNAL_SECRETS (e.g. the url_secret of the bots being driven); signals
+    older than SIGNAL_MAX_LAG seconds (or the payload's smaller `max_lag`)
+    and repeats of a recently accepted signal are refused.
+    """
+    try:
+        data = json.loads(await request.body())
+        if not isinstance(data, dict):
+            raise ValueError("signal must be a JSON object")
+        payload = TradingViewSignalPayload(**data)
+        timestamp = _timestamp(payload.timestamp)
+    except ValueError as e:
+        raise _reject("invalid", 422, f"Invalid signal: {e}")
+
+    if not any(hmac.compare_digest(payload.secret.encode(), secret.encode()) for secret in SIGNAL_SECRETS):
+        raise _reject("unauthorized", 403, "Invalid signal secret")
+
+    # The sender may ask for a tighter limit than SIGNAL_MAX_LAG, never a looser one
+    max_lag = SIGNAL_MAX_LAG
+    if payload.max_lag is not None:
+        max_lag = min(max_lag, payload.max_lag) if max_lag > 0 else payload.max_lag
+    if timestamp is not None and max_lag > 0 and time.time() - timestamp > max_lag:
+        raise _reject("stale", 422, f"Signal is older than {max_lag:g}s")
+
+    body = payload.dict(exclude={"secret"}, exclude_none=True)
+    signal = InboundSignal(
+        id=payload.id or SignalBus.make_id(body),
+        action=payload.action,
+        strategy=payload.strategy or "webhook",
+        symbol=payload.pair or payload.tv_instrument,
+        bot_id=payload.bot_id,
+        price=payload.trigger_price,
+        timestamp=timestamp or 0.0,
+        payload=body,
+    )
+    accepted = signal_bus.publish(signal)
+    if accepted is None:
+        return {"accepted": False, "duplicate": True, "id": signal.id}
+    return {"accepted": True, "id": accepted.id, "seq": accepted.seq}
+
+
+@router.get("/signals/stats")
+async def get_signal_stats() -> Dict[str, Any]:
+    """
+    Accepted/duplicate counts and per-consumer queue depth and enqueue-to-dispatch latency.
+    """
+    return signal_bus.stats()
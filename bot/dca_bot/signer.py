@@ -1,5 +1,4 @@
-import hmac
-import hashlib
+from bot.api_client.signing import get_signer
 
 def generate_signature(api_secret: str, request_path: str, query_string: str = "", request_body: str = "") -> str:
     """
@@ -11,17 +10,7 @@ def generate_signature(api_secret: str, request_path: str, query_string: str = "
     :param request_body: The raw request body (for POST/PUT requests)
     :return: Hex-encoded HMAC SHA256 signature
     """
-    # Form the full payload string to sign
-    total_params = request_path
-    if query_string:
-        total_params += "?" + query_string
-    total_params += request_body
-
-    # Compute HMAC SHA256 signature
-    signature = hmac.new(
-        api_secret.encode("utf-8"),
-        total_params.encode("utf-8"),
-        hashlib.sha256
-    ).hexdigest()
-
-    return signature
+    # The signer keeps a pre-keyed HMAC per secret, see bot.api_client.signing
+    return get_signer(api_secret).sign_request(
+        request_path, query_string, request_body.encode("utf-8")
+    )
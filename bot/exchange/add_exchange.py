@@ -1,17 +1,19 @@
 import os
 import json
+from typing import Any, Dict
 from fastapi import FastAPI, HTTPException
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
-import httpx
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from bot.config.config import THREE_COMMAS_API_KEY, THREE_COMMAS_API_SECRET, THREE_COMMAS_BASE_URL
 from bot.exchange.schemas import AddExchangeAccountRequest, AddExchangeAccountResponse
+from bot.dca_bot.gateway import gateway_pool
+from bot.api_client.signing import get_signer
+from bot.api_client.instrumentation import Attempt
+from bot.utils.metrics import REGISTRY
 
-from .signer import sign_payload
 
-
-app = FastAPI()
+app = FastAPI(lifespan=gateway_pool.lifespan)
 
 
 EXCHANGE_API_KEY = os.getenv("EXCHANGE_API_KEY")
@@ -19,7 +21,7 @@ EXCHANGE_API_SECRET = os.getenv("EXCHANGE_API_SECRET")
 EXCHANGE_PASSPHRASE = os.getenv("EXCHANGE_PASSPHRASE") 
 
 @app.post("/ver1/accounts/new", response_model=AddExchangeAccountResponse)
-async def add_exchange_account(request_body: AddExchangeAccountRequest):
+async def add_exchange_account(request_body: AddExchangeAccountRequest) -> Any:
     path = "/ver1/accounts/new"
     url = f"{THREE_COMMAS_BASE_URL}{path}"
 
@@ -34,22 +36,30 @@ async def add_exchange_account(request_body: AddExchangeAccountRequest):
     if EXCHANGE_PASSPHRASE:
         payload["passphrase"] = EXCHANGE_PASSPHRASE
 
-    json_body_str = json.dumps(payload, separators=(',', ':'))  # compact JSON
-
-    # Signature is based on path + JSON string payload
-    total_params = f"{path}{json_body_str}"
-    signature = sign_payload(THREE_COMMAS_API_SECRET, total_params)
+    # Signature is based on path + compact JSON payload, serialized once and sent as-is
+    signed = get_signer(THREE_COMMAS_API_SECRET).prepare("POST", path, payload)
 
     headers = {
         "Apikey": THREE_COMMAS_API_KEY,
-        "Signature": signature,
+        "Signature": signed.signature,
         "Content-Type": "application/json",
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, content=json_body_str)
-    
+    with Attempt("gateway", path, "POST", 1) as timing:
+        response = await gateway_pool.request("POST", url, headers=headers, content=signed.body)
+        timing.status = response.status_code
+
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
     
-    return response.json()
\ No newline at end of file
+    return response.json()
+
+
+@app.get("/pool/stats")
+async def get_pool_stats() -> Dict[str, Any]:
+    return gateway_pool.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type=REGISTRY.CONTENT_TYPE)
@@ -0,0 +1,417 @@
+# exchange/market_data.py
+import asyncio
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from ..core.engine import MarketEvent
+from ..utils.logger import get_logger
+
+logger = get_logger("MarketData")
+
+
+class MarketUpdate(NamedTuple):
+    """Raw update in ccxt's unified format (ticker dict, list of trades or order book dict)"""
+    kind: str  # "ticker" | "trades" | "order_book"
+    symbol: str
+    data: Any
+    exchange: str = ""  # ccxt exchange id of the venue, when known
+
+
+class RingBuffer:
+    """
+    Fixed-capacity columnar ring buffer of (timestamp, price, volume) rows.
+
+    Appends and reads of the latest row are O(1) and allocation free; `view`
+    returns the buffered rows oldest-first.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self._data = np.zeros((capacity, 3), dtype=np.float64)
+        self._next = 0
+        self.size = 0
+
+    def append(self, timestamp: float, price: float, volume: float = 0.0) -> None:
+        row = self._data[self._next]
+        row[0] = timestamp
+        row[1] = price
+        row[2] = volume
+        self._next = (self._next + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def last(self) -> Optional[np.ndarray]:
+        if not self.size:
+            return None
+        return self._data[self._next - 1]
+
+    def view(self, n: Optional[int] = None) -> np.ndarray:
+        """The newest `n` rows (default: all), oldest first, as a copy"""
+        n = self.size if n is None else min(n, self.size)
+        if n == 0:
+            return self._data[:0].copy()
+        start = (self._next - n) % self.capacity
+        if start + n <= self.capacity:
+            return self._data[start:start + n].copy()
+        return np.concatenate((self._data[start:], self._data[:self._next]))
+
+    def prices(self, n: Optional[int] = None) -> np.ndarray:
+        return self.view(n)[:, 1]
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class SymbolData:
+    """Latest state of one symbol: scalar top-of-book plus ticker/trade history"""
+
+    __slots__ = ("symbol", "last_price", "bid", "ask", "timestamp", "tickers", "trades", "bids", "asks")
+
+    def __init__(self, symbol: str, capacity: int, depth: int):
+        self.symbol = symbol
+        self.last_price = float("nan")
+        self.bid = float("nan")
+        self.ask = float("nan")
+        self.timestamp = 0.0
+        self.tickers = RingBuffer(capacity)
+        self.trades = RingBuffer(capacity)
+        self.bids = np.zeros((depth, 2), dtype=np.float64)  # (price, amount), best first
+        self.asks = np.zeros((depth, 2), dtype=np.float64)
+
+
+def _seconds(timestamp_ms: Optional[float]) -> float:
+    return timestamp_ms / 1000.0 if timestamp_ms else time.time()
+
+
+def _fill_levels(target: np.ndarray, levels: Sequence[Sequence[float]]) -> None:
+    count = min(len(levels), len(target))
+    target[:] = 0.0
+    if count:
+        target[:count] = np.asarray([level[:2] for level in levels[:count]], dtype=np.float64)
+
+
+class MarketDataStore:
+    """
+    In-process market state shared by all strategies.
+
+    Strategies read `latest_price(symbol)` in O(1) instead of each making its
+    own network call; updates arrive from a MarketDataFeed.
+    """
+
+    def __init__(self, capacity: int = 4096, depth: int = 20):
+        self.capacity = capacity
+        self.depth = depth
+        self.symbols: Dict[str, SymbolData] = {}
+
+    def _symbol(self, symbol: str) -> SymbolData:
+        data = self.symbols.get(symbol)
+        if data is None:
+            data = self.symbols[symbol] = SymbolData(symbol, self.capacity, self.depth)
+        return data
+
+    def apply(self, update: MarketUpdate) -> Optional[MarketEvent]:
+        """Apply a ccxt-format update and return the event to publish (if any)"""
+        data = self._symbol(update.symbol)
+        if update.kind == "ticker":
+            ticker = update.data
+            price = ticker.get("last") or ticker.get("close")
+            if price is None:
+                return None
+            data.timestamp = _seconds(ticker.get("timestamp"))
+            data.last_price = float(price)
+            if ticker.get("bid") is not None:
+                data.bid = float(ticker["bid"])
+            if ticker.get("ask") is not None:
+                data.ask = float(ticker["ask"])
+            volume = float(ticker.get("baseVolume") or 0.0)
+            data.tickers.append(data.timestamp, data.last_price, volume)
+            return MarketEvent(update.symbol, data.last_price, volume, data.timestamp, "ticker")
+
+        if update.kind == "trades":
+            volume = 0.0
+            for trade in update.data:
+                data.timestamp = _seconds(trade.get("timestamp"))
+                data.last_price = float(trade["price"])
+                amount = float(trade.get("amount") or 0.0)
+                volume += amount
+                data.trades.append(data.timestamp, data.last_price, amount)
+            if not update.data:
+                return None
+            return MarketEvent(update.symbol, data.last_price, volume, data.timestamp, "trade")
+
+        if update.kind == "order_book":
+            book = update.data
+            _fill_levels(data.bids, book.get("bids") or [])
+            _fill_levels(data.asks, book.get("asks") or [])
+            data.timestamp = _seconds(book.get("timestamp"))
+            if book.get("bids"):
+                data.bid = float(data.bids[0, 0])
+            if book.get("asks"):
+                data.ask = float(data.asks[0, 0])
+            if not (book.get("bids") and book.get("asks")):
+                return None
+            return MarketEvent(update.symbol, (data.bid + data.ask) / 2, 0.0, data.timestamp, "order_book")
+
+        logger.warning(f"Unknown market update kind: {update.kind}")
+        return None
+
+    def latest_price(self, symbol: str) -> Optional[float]:
+        data = self.symbols.get(symbol)
+        if data is None or data.last_price != data.last_price:  # NaN until the first price
+            return None
+        return data.last_price
+
+    def best_bid_ask(self, symbol: str) -> Optional[tuple]:
+        data = self.symbols.get(symbol)
+        return (data.bid, data.ask) if data is not None else None
+
+    def history(self, symbol: str, n: Optional[int] = None, kind: str = "tickers") -> np.ndarray:
+        data = self.symbols.get(symbol)
+        if data is None:
+            return np.zeros((0, 3))
+        return getattr(data, kind).view(n)
+
+
+class CCXTSource:
+    """
+    Live updates from one exchange via ccxt.
+
+    Uses ccxt.pro websocket `watch_*` methods when available and falls back to
+    polling the REST `fetch_*` methods every `poll_interval` seconds. Trade
+    polls ask for trades since the newest one seen and drop any repeats, so
+    each trade is published once.
+    """
+
+    # channel -> (ccxt `has` capability, streaming method, polling method)
+    CHANNELS = {
+        "ticker": ("watchTicker", "watch_ticker", "fetch_ticker"),
+        "trades": ("watchTrades", "watch_trades", "fetch_trades"),
+        "order_book": ("watchOrderBook", "watch_order_book", "fetch_order_book"),
+    }
+
+    def __init__(
+        self,
+        exchange_id: str,
+        symbols: Iterable[str],
+        channels: Iterable[str] = ("ticker",),
+        poll_interval: float = 1.0,
+        config: Optional[Dict[str, Any]] = None,
+    ):
+        self.exchange_id = exchange_id
+        self.symbols = list(symbols)
+        self.channels = list(channels)
+        self.poll_interval = poll_interval
+        self.config = config or {}
+        # symbol -> (newest trade timestamp seen, keys of the trades at that timestamp)
+        self._trade_cursor: Dict[str, Tuple[Optional[float], Set[Any]]] = {}
+
+    def _create_exchange(self) -> Any:
+        try:
+            import ccxt.pro as ccxt_module
+        except ImportError:
+            import ccxt.async_support as ccxt_module
+        return getattr(ccxt_module, self.exchange_id)({"enableRateLimit": True, **self.config})
+
+    async def _channel(self, exchange: Any, channel: str, symbol: str, queue: "asyncio.Queue[MarketUpdate]") -> None:
+        capability, watch, fetch = self.CHANNELS[channel]
+        streaming = bool(exchange.has.get(capability)) and hasattr(exchange, watch)
+        method = getattr(exchange, watch if streaming else fetch)
+        while True:
+            try:
+                if channel != "trades":
+                    await queue.put(MarketUpdate(channel, symbol, await method(symbol), self.exchange_id))
+                else:
+                    since = None if streaming else self._trade_cursor.get(symbol, (None, set()))[0]
+                    trades = self._new_trades(symbol, await method(symbol, since))
+                    if trades:
+                        await queue.put(MarketUpdate(channel, symbol, trades, self.exchange_id))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"{self.exchange_id} {channel} {symbol} failed: {e}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            if not streaming:
+                await asyncio.sleep(self.poll_interval)
+
+    def _new_trades(self, symbol: str, trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop trades already published; `since` polls repeat those at the newest timestamp"""
+        last, seen = self._trade_cursor.get(symbol, (None, set()))
+        fresh = []
+        newest, newest_keys = last, set(seen)
+        for trade in trades:
+            timestamp = trade.get("timestamp")
+            key = trade.get("id") or (timestamp, trade["price"], trade.get("amount"), trade.get("side"))
+            if timestamp is not None and last is not None:
+                if timestamp < last or (timestamp == last and key in seen):
+                    continue
+            fresh.append(trade)
+            if timestamp is None:
+                continue
+            if newest is None or timestamp > newest:
+                newest, newest_keys = timestamp, {key}
+            elif timestamp == newest:
+                newest_keys.add(key)
+        self._trade_cursor[symbol] = (newest, newest_keys)
+        return fresh
+
+    async def stream(self) -> AsyncIterator[MarketUpdate]:
+        exchange = self._create_exchange()
+        queue: "asyncio.Queue[MarketUpdate]" = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(self._channel(exchange, channel, symbol, queue))
+            for channel in self.channels
+            for symbol in self.symbols
+        ]
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await exchange.close()
+
+
+class ReplaySource:
+    """
+    Replays recorded market data for offline testing.
+
+    Accepts JSON lines written by `MarketDataRecorder` ({"kind", "symbol",
+    "data"} and optionally "exchange" per line) or CSV trade files with timestamp,symbol,price,amount
+    columns (timestamp in ms). `speed=0` replays as fast as possible, `speed=1`
+    in real time, `speed=10` ten times faster.
+    """
+
+    def __init__(self, path: Union[str, Path], speed: float = 0.0):
+        self.path = Path(path)
+        self.speed = speed
+
+    def _read(self) -> Iterable[MarketUpdate]:
+        with self.path.open() as f:
+            if self.path.suffix == ".csv":
+                for row in csv.DictReader(f):
+                    trade = {
+                        "timestamp": float(row["timestamp"]),
+                        "price": float(row["price"]),
+                        "amount": float(row.get("amount") or 0.0),
+                    }
+                    yield MarketUpdate("trades", row["symbol"], [trade], row.get("exchange") or "")
+            else:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        yield MarketUpdate(record["kind"], record["symbol"], record["data"], record.get("exchange", ""))
+
+    @staticmethod
+    def _timestamp(update: MarketUpdate) -> Optional[float]:
+        data = update.data[-1] if isinstance(update.data, list) and update.data else update.data
+        return data.get("timestamp") if isinstance(data, dict) else None
+
+    async def stream(self) -> AsyncIterator[MarketUpdate]:
+        first_ts = None
+        started = time.monotonic()
+        for update in self._read():
+            if self.speed > 0:
+                ts = self._timestamp(update)
+                if ts is not None:
+                    first_ts = ts if first_ts is None else first_ts
+                    delay = (ts - first_ts) / 1000.0 / self.speed - (time.monotonic() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)  # let consumers run between updates
+            yield update
+
+
+class MarketDataRecorder:
+    """Appends updates to a JSON lines file that ReplaySource can play back"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = self.path.open("a")
+
+    def write(self, update: MarketUpdate) -> None:
+        record = {"kind": update.kind, "symbol": update.symbol, "data": update.data}
+        if update.exchange:
+            record["exchange"] = update.exchange
+        self._file.write(json.dumps(record))
+        self._file.write("\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class MarketDataFeed:
+    """
+    Pumps one or more sources into a MarketDataStore.
+
+    `events()` is an async iterator of MarketEvents that can be handed straight
+    to TradingEngine.run(sources=[feed.events()]). A source that fails is
+    logged and the others keep running; `stop()` cancels the pumps and waits
+    for them to finish.
+    """
+
+    def __init__(
+        self,
+        sources: List[Any],
+        store: Optional[MarketDataStore] = None,
+        recorder: Optional[MarketDataRecorder] = None,
+    ):
+        self.sources = sources
+        self.store = store or MarketDataStore()
+        self.recorder = recorder
+        self.updates = 0
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    @staticmethod
+    def _pump_done(task: "asyncio.Task[None]") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Market data {task.get_name()} failed: {task.exception()!r}")
+
+    async def events(self) -> AsyncIterator[MarketEvent]:
+        queue: "asyncio.Queue[Optional[MarketUpdate]]" = asyncio.Queue()
+
+        async def pump(source: Any) -> None:
+            try:
+                async for update in source.stream():
+                    await queue.put(update)
+            finally:
+                queue.put_nowait(None)
+
+        tasks = []
+        for source in self.sources:
+            task = asyncio.create_task(pump(source), name=f"source {type(source).__name__}")
+            task.add_done_callback(self._pump_done)
+            tasks.append(task)
+        self._tasks.update(tasks)
+        remaining = len(tasks)
+        try:
+            while remaining:
+                update = await queue.get()
+                if update is None:
+                    remaining -= 1
+                    continue
+                self.updates += 1
+                if self.recorder is not None:
+                    self.recorder.write(update)
+                event = self.store.apply(update)
+                if event is not None:
+                    yield event
+        finally:
+            await self._cancel(tasks)
+
+    async def _cancel(self, tasks: List["asyncio.Task[None]"]) -> None:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.difference_update(tasks)
+
+    async def stop(self) -> None:
+        """Cancel the pumps of every running `events()` and wait for them"""
+        await self._cancel(list(self._tasks))
@@ -1,12 +1,15 @@
 import json
 import time
-from typing import Optional
+from typing import Any, Dict, Optional
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from httpx import AsyncClient
 from bot.config.config import THREE_COMMAS_API_KEY, THREE_COMMAS_BASE_URL, THREE_COMMAS_API_SECRET
 from dca_bot.signer import generate_signature
 from dca_bot.schemas import CreateDCABotPayload
+from bot.utils.logger import get_logger
+
+logger = get_logger("Main")
 
 # Initialize app
 app = FastAPI()
@@ -20,7 +23,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-async def make_3commas_request(method: str, path: str, params: dict = None, payload: dict = None):
+async def make_3commas_request(
+    method: str, path: str, params: Optional[Dict[str, Any]] = None, payload: Optional[Dict[str, Any]] = None
+) -> Any:
     nonce = str(int(time.time() * 1000))
     url = f"{THREE_COMMAS_BASE_URL}{path}"
 
@@ -48,11 +53,10 @@ async def make_3commas_request(method: str, path: str, params: dict = None, payl
         else:
             raise HTTPException(status_code=400, detail="Unsupported HTTP method")
 
-    print(f"3Commas API Request: {method} {url}")
-    print(f"Headers: {headers}")
-    if payload:
-        print(f"Payload: {payload}")
-    print(f"Response: {response.status_code} {response.text}")
+    logger.debug(
+        "3Commas %s %s -> %s headers=%s payload=%s response=%s",
+        method, url, response.status_code, headers, payload, response.text,
+    )
 
     if response.status_code == 204:
         return None
@@ -69,7 +73,7 @@ async def make_3commas_request(method: str, path: str, params: dict = None, payl
 
 
 @app.post("/create-dca-bot/")
-async def create_dca_bot(payload: CreateDCABotPayload):
+async def create_dca_bot(payload: CreateDCABotPayload) -> Any:
     try:
         result = await make_3commas_request(
             "POST",
@@ -83,7 +87,7 @@ async def create_dca_bot(payload: CreateDCABotPayload):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/get-dca-bot/{bot_id}")
-async def get_dca_bot(bot_id: int, include_events: bool = True):
+async def get_dca_bot(bot_id: int, include_events: bool = True) -> Any:
     try:
         result = await make_3commas_request(
             "GET",
@@ -105,7 +109,7 @@ async def list_dca_bots(
     order_direction: str = "DESC",
     limit: Optional[int] = None,
     offset: Optional[int] = None
-):
+) -> Any:
     try:
         params = {
             "account_id": account_id,
@@ -135,7 +139,7 @@ async def get_strategy_list(
     account_id: Optional[int] = Query(None, description="3Commas exchange account ID"),
     type: Optional[str] = Query(None, description="Strategy direction type"),
     strategy: Optional[str] = Query(None, description="Strategy name")
-):
+) -> Any:
     try:
         params = {
             "account_id": account_id,
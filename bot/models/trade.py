@@ -0,0 +1,71 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional, Union
+
+
+class Record(BaseModel):
+    """
+    Base for everything the state store persists. Unknown fields from 3Commas
+    responses are kept, so a record round-trips the full API object. Fields
+    aliased to an API key are stored under their own name, so both load.
+    """
+
+    class Config:
+        extra = "allow"
+        populate_by_name = True
+
+    def key(self) -> str:
+        return str(getattr(self, "id"))
+
+
+class Bot(Record):
+    id: int
+    account_id: int
+    name: str = ""
+    type: str = "dca"  # "dca" | "grid"
+    pairs: List[str] = Field(default_factory=list)
+    is_enabled: bool = False
+    updated_at: Optional[str] = None
+
+
+FINISHED_DEAL_STATUSES = frozenset({"completed", "cancelled", "failed", "panic_sold", "stop_loss_finished"})
+
+
+class Deal(Record):
+    id: int
+    bot_id: int
+    account_id: int
+    pair: str
+    status: str = "created"
+    finished: bool = Field(False, alias="finished?")
+    bought_amount: float = 0.0
+    bought_volume: float = 0.0
+    actual_profit: float = 0.0
+    created_at: Optional[str] = None
+    closed_at: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return not self.finished and self.status not in FINISHED_DEAL_STATUSES
+
+
+class Trade(Record):
+    id: Union[int, str]
+    account_id: int
+    pair: str
+    side: str  # "buy" | "sell"
+    price: float
+    amount: float
+    deal_id: Optional[int] = None
+    bot_id: Optional[int] = None
+    timestamp: Optional[float] = None
+
+
+class Balance(Record):
+    account_id: int
+    currency: str
+    amount: float = 0.0
+    usd_value: Optional[float] = None
+    updated_at: Optional[float] = None
+
+    def key(self) -> str:
+        return f"{self.account_id}:{self.currency}"
@@ -1,6 +1,7 @@
 # services/accounts_service.py
-from typing import List, Optional, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from ..api_client.client import ThreeCommasAPIClient, APIError, AuthenticationError, RateLimitError
+from ..api_client.async_client import AsyncThreeCommasAPIClient
 from ..api_client.endpoints import accounts_endpoints as endpoints
 from ..utils.logger import get_logger
 
@@ -18,30 +19,34 @@ class InvalidAccountParametersError(AccountServiceError):
     """Invalid account parameters exception"""
     pass
 
+def _translate_error(e: Exception) -> AccountServiceError:
+    """Map client exceptions onto the account service error hierarchy"""
+    if isinstance(e, AuthenticationError):
+        logger.error(f"Authentication failed: {str(e)}")
+        return AccountServiceError("Invalid API credentials")
+    if isinstance(e, RateLimitError):
+        logger.error("API rate limit exceeded")
+        return AccountServiceError("Too many requests, please try again later")
+    if isinstance(e, APIError):
+        logger.error(f"API request failed: {str(e)}")
+        if "not found" in str(e).lower():
+            return AccountNotFoundError("Account not found")
+        return AccountServiceError(f"API operation failed: {str(e)}")
+    logger.error(f"Unexpected error: {str(e)}")
+    return AccountServiceError("Service operation failed")
+
 class AccountsService:
     def __init__(self, client: ThreeCommasAPIClient):
         if not isinstance(client, ThreeCommasAPIClient):
             raise ValueError("client must be a ThreeCommasAPIClient instance")
         self.client = client
 
-    def _handle_api_call(self, callable, *args, **kwargs) -> Any:
+    def _handle_api_call(self, callable: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
         """Wrapper for handling API calls with consistent error handling"""
         try:
             return callable(*args, **kwargs)
-        except AuthenticationError as e:
-            logger.error(f"Authentication failed: {str(e)}")
-            raise AccountServiceError("Invalid API credentials") from e
-        except RateLimitError as e:
-            logger.error("API rate limit exceeded")
-            raise AccountServiceError("Too many requests, please try again later") from e
-        except APIError as e:
-            logger.error(f"API request failed: {str(e)}")
-            if "not found" in str(e).lower():
-                raise AccountNotFoundError("Account not found") from e
-            raise AccountServiceError(f"API operation failed: {str(e)}") from e
         except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}")
-            raise AccountServiceError("Service operation failed") from e
+            raise _translate_error(e) from e
 
     def get_account_active_trading_entities(self, account_id: int) -> Dict:
         """Get active trading entities for an account"""
@@ -135,4 +140,97 @@ class AccountsService:
             )
             return self._handle_api_call(self.client.post, endpoint, params=payload)
         except ValueError as e:
-            raise InvalidAccountParametersError(f"Invalid parameter: {str(e)}") from e
\ No newline at end of file
+            raise InvalidAccountParametersError(f"Invalid parameter: {str(e)}") from e
+
+
+class AsyncAccountsService:
+    """asyncio variant of AccountsService backed by AsyncThreeCommasAPIClient"""
+
+    def __init__(self, client: AsyncThreeCommasAPIClient):
+        if not isinstance(client, AsyncThreeCommasAPIClient):
+            raise ValueError("client must be an AsyncThreeCommasAPIClient instance")
+        self.client = client
+
+    async def _handle_api_call(
+        self, callable: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Wrapper for handling API calls with consistent error handling"""
+        try:
+            return await callable(*args, **kwargs)
+        except Exception as e:
+            raise _translate_error(e) from e
+
+    async def get_account_active_trading_entities(self, account_id: int) -> Dict:
+        """Get active trading entities for an account"""
+        if not isinstance(account_id, int) or account_id <= 0:
+            raise InvalidAccountParametersError("Invalid account ID")
+
+        endpoint, params = endpoints.get_account_active_trading_entities(account_id)
+        return await self._handle_api_call(self.client.get, endpoint, params=params)
+
+    async def get_account_balance_chart_data(
+        self,
+        account_id: int,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> Dict:
+        """Get balance chart data for an account"""
+        if not isinstance(account_id, int) or account_id <= 0:
+            raise InvalidAccountParametersError("Invalid account ID")
+
+        endpoint, params = endpoints.get_account_balance_chart_data(
+            account_id, date_from, date_to
+        )
+        return await self._handle_api_call(self.client.get, endpoint, params=params)
+
+    async def get_account_balance_chart_data_summary(
+        self,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> Dict:
+        """Get balance chart data summary"""
+        endpoint, params = endpoints.get_account_balance_chart_data_summary(date_from, date_to)
+        return await self._handle_api_call(self.client.get, endpoint, params=params)
+
+    async def post_load_balances(self, account_id: int) -> Dict:
+        """Load balances for an account"""
+        if not isinstance(account_id, int) or account_id <= 0:
+            raise InvalidAccountParametersError("Invalid account ID")
+
+        endpoint, params = endpoints.post_load_balances(account_id)
+        return await self._handle_api_call(self.client.post, endpoint, params=params)
+
+    async def get_account_types_to_connect(self) -> Dict:
+        """Get available account types to connect"""
+        endpoint, params = endpoints.get_account_types_to_connect()
+        return await self._handle_api_call(self.client.get, endpoint, params=params)
+
+    async def add_exchange_account(
+        self,
+        type: str,
+        name: str,
+        api_key: str,
+        secret: str,
+        passphrase: Optional[str] = None,
+        address: Optional[str] = None,
+        customer_id: Optional[str] = None,
+        types_to_create: Optional[List[str]] = None
+    ) -> Dict:
+        """Add a new exchange account (see AccountsService.add_exchange_account)"""
+        if not all([type, name, api_key, secret]):
+            raise InvalidAccountParametersError("Missing required parameters")
+
+        try:
+            endpoint, payload = endpoints.post_add_exchange_account(
+                type=type,
+                name=name,
+                api_key=api_key,
+                secret=secret,
+                passphrase=passphrase,
+                address=address,
+                customer_id=customer_id,
+                types_to_create=types_to_create
+            )
+            return await self._handle_api_call(self.client.post, endpoint, params=payload)
+        except ValueError as e:
+            raise InvalidAccountParametersError(f"Invalid parameter: {str(e)}") from e
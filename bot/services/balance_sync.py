@@ -0,0 +1,241 @@
+# services/balance_sync.py
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from ..utils.logger import get_logger
+from .accounts_service import AccountsService
+
+logger = get_logger("BalanceChartSync")
+
+DAY = 86400
+Columns = Dict[str, np.ndarray]
+
+
+def to_timestamp(value: Union[str, int, float, datetime]) -> int:
+    """3Commas chart date (unix seconds, or a YYYY-MM-DD / ISO string) -> unix seconds, UTC"""
+    if isinstance(value, datetime):
+        moment = value
+    elif isinstance(value, (int, float)) or str(value).isdigit():
+        seconds = float(value)
+        return int(seconds / 1000 if seconds > 1e11 else seconds)
+    else:
+        moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def to_date(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
+
+
+def points_to_columns(points: List[Dict[str, Any]]) -> Columns:
+    """API points to sorted columns: int64 `date` plus one float64 column per numeric field"""
+    if not points:
+        return {"date": np.empty(0, dtype=np.int64)}
+    names = sorted({key for point in points for key in point if key != "date"})
+    dates = np.fromiter((to_timestamp(point["date"]) for point in points), dtype=np.int64, count=len(points))
+    columns = {"date": dates}
+    for name in names:
+        values = np.full(len(points), np.nan)
+        for i, point in enumerate(points):
+            value = point.get(name)
+            if value is None:
+                continue
+            try:
+                values[i] = float(value)
+            except (TypeError, ValueError):
+                pass
+        if not np.isnan(values).all():
+            columns[name] = values
+    order = np.argsort(dates, kind="stable")
+    return {name: column[order] for name, column in columns.items()}
+
+
+def merge_columns(old: Columns, new: Columns) -> Columns:
+    """Union by date; points in `new` replace stored points with the same date"""
+    if not len(old["date"]):
+        return new
+    if not len(new["date"]):
+        return old
+    keep = ~np.isin(old["date"], new["date"])
+    names = set(old) | set(new)
+    merged = {}
+    for name in names:
+        default = np.zeros(0, dtype=np.int64) if name == "date" else None
+        left = old.get(name, default)
+        right = new.get(name, default)
+        if left is None:
+            left = np.full(len(old["date"]), np.nan)
+        if right is None:
+            right = np.full(len(new["date"]), np.nan)
+        merged[name] = np.concatenate([left[keep], right])
+    order = np.argsort(merged["date"], kind="stable")
+    return {name: column[order] for name, column in merged.items()}
+
+
+def columns_to_points(columns: Columns) -> List[Dict[str, Any]]:
+    names = [name for name in columns if name != "date"]
+    dates = columns["date"].tolist()
+    values = {name: columns[name].tolist() for name in names}
+    return [
+        {"date": date, **{name: values[name][i] for name in names if values[name][i] == values[name][i]}}
+        for i, date in enumerate(dates)
+    ]
+
+
+class BalanceChartSync:
+    """
+    Local time series of account balance charts.
+
+    Points are stored per account as columns in an .npz file (replaced
+    atomically on write) and cached in memory. A sync only asks 3Commas for
+    the tail since the last stored point, re-fetching the last `overlap`
+    seconds because the newest point may still change. Range queries and the
+    cross-account summary are served locally once the data is no older than
+    `max_age` seconds.
+    """
+
+    def __init__(
+        self,
+        accounts_service: AccountsService,
+        directory: Union[str, Path] = "data/balance_charts",
+        history_start: str = "2023-01-01",
+        max_age: float = 3600.0,
+        overlap: int = DAY,
+    ):
+        self.accounts_service = accounts_service
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.history_start = to_timestamp(history_start)
+        self.max_age = max_age
+        self.overlap = overlap
+        self._columns: Dict[int, Columns] = {}
+        self._synced_at: Dict[int, float] = {}
+        self._locks: Dict[int, threading.RLock] = {}
+        self._guard = threading.Lock()
+        self.fetched_points = 0
+        self.api_calls = 0
+
+    def _path(self, account_id: int) -> Path:
+        return self.directory / f"account_{account_id}.npz"
+
+    def _lock(self, account_id: int) -> threading.RLock:
+        with self._guard:
+            return self._locks.setdefault(account_id, threading.RLock())
+
+    def load(self, account_id: int) -> Columns:
+        columns = self._columns.get(account_id)
+        if columns is None:
+            path = self._path(account_id)
+            if path.exists():
+                with np.load(path) as data:
+                    columns = {name: data[name] for name in data.files}
+                self._synced_at[account_id] = path.stat().st_mtime
+            else:
+                columns = {"date": np.empty(0, dtype=np.int64)}
+            self._columns[account_id] = columns
+        return columns
+
+    def _save(self, account_id: int, columns: Columns) -> None:
+        path = self._path(account_id)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, allow_pickle=False, **columns)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def sync(self, account_id: int, until: Optional[float] = None) -> int:
+        """Fetch the missing tail for an account; returns the number of points received"""
+        with self._lock(account_id):
+            columns = self.load(account_id)
+            stored = columns["date"]
+            since = int(stored[-1]) - self.overlap if len(stored) else self.history_start
+            until = until if until is not None else time.time()
+            points: Any = self.accounts_service.get_account_balance_chart_data(
+                account_id=account_id, date_from=to_date(since), date_to=to_date(until)
+            )
+            self.api_calls += 1
+            fresh = points_to_columns(points if isinstance(points, list) else [])
+            if len(fresh["date"]):
+                columns = merge_columns(columns, fresh)
+                self._save(account_id, columns)
+                self._columns[account_id] = columns
+            self._synced_at[account_id] = time.time()
+            self.fetched_points += len(fresh["date"])
+            logger.info(f"Synced {len(fresh['date'])} balance points for account {account_id} since {to_date(since)}")
+            return len(fresh["date"])
+
+    def ensure_fresh(self, account_id: int) -> None:
+        # Checked under the account's lock so concurrent readers of a stale
+        # account wait for one sync instead of each starting their own
+        with self._lock(account_id):
+            self.load(account_id)
+            synced_at = self._synced_at.get(account_id)
+            if synced_at is None or time.time() - synced_at > self.max_age:
+                self.sync(account_id)
+
+    def columns(
+        self,
+        account_id: int,
+        date_from: Optional[Union[str, float]] = None,
+        date_to: Optional[Union[str, float]] = None,
+    ) -> Columns:
+        """Stored columns within [date_from, date_to] (dates inclusive), synced first if stale"""
+        self.ensure_fresh(account_id)
+        columns = self._columns[account_id]
+        dates = columns["date"]
+        start = np.searchsorted(dates, to_timestamp(date_from)) if date_from is not None else 0
+        end = (
+            np.searchsorted(dates, to_timestamp(date_to) + (DAY - 1 if isinstance(date_to, str) else 0), side="right")
+            if date_to is not None else len(dates)
+        )
+        return {name: column[start:end] for name, column in columns.items()}
+
+    def get_account_balance_chart_data(
+        self,
+        account_id: int,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Drop-in for AccountsService.get_account_balance_chart_data; `date` comes back as unix seconds"""
+        return columns_to_points(self.columns(account_id, date_from, date_to))
+
+    def get_account_balance_chart_data_summary(
+        self,
+        account_ids: List[int],
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-date totals across the given accounts, from local data. Each
+        account contributes its latest point at or before every date.
+        """
+        per_account = [self.columns(account_id, date_from, date_to) for account_id in account_ids]
+        per_account = [columns for columns in per_account if len(columns["date"])]
+        if not per_account:
+            return []
+        dates = np.unique(np.concatenate([columns["date"] for columns in per_account]))
+        names = sorted({name for columns in per_account for name in columns if name != "date"})
+        totals = {"date": dates, **{name: np.zeros(len(dates)) for name in names}}
+        for columns in per_account:
+            index = np.searchsorted(columns["date"], dates, side="right") - 1
+            known = index >= 0
+            for name in names:
+                if name in columns:
+                    totals[name][known] += np.nan_to_num(columns[name][index[known]])
+        return columns_to_points(totals)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "accounts": {account_id: int(len(columns["date"])) for account_id, columns in self._columns.items()},
+            "api_calls": self.api_calls,
+            "fetched_points": self.fetched_points,
+        }
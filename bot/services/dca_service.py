@@ -1,4 +1,5 @@
 from ..api_client.client import ThreeCommasAPIClient, APIError
+from ..api_client.async_client import AsyncThreeCommasAPIClient
 from ..api_client.endpoints.dcaendpoint import create_dca_bot
 from ..models.schemas import CreateDCABotPayload
 
@@ -12,3 +13,15 @@ class DCABotService:
             return self.api_client.post(endpoint, payload.dict())
         except APIError as e:
             raise Exception(f"Failed to create bot: {str(e)}")
+
+
+class AsyncDCABotService:
+    def __init__(self, api_client: AsyncThreeCommasAPIClient):
+        self.api_client = api_client
+
+    async def create_bot(self, payload: CreateDCABotPayload) -> dict:
+        endpoint = create_dca_bot()
+        try:
+            return await self.api_client.post(endpoint, payload.dict())
+        except APIError as e:
+            raise Exception(f"Failed to create bot: {str(e)}")
@@ -0,0 +1,324 @@
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+logger = get_logger("Arbitrage")
+
+DEFAULT_FEE = 0.001
+
+
+class Opportunity(NamedTuple):
+    kind: str                  # "spatial" | "triangular"
+    symbols: Tuple[str, ...]   # one symbol, or the three legs in trade order
+    venues: Tuple[str, ...]    # (buy venue, sell venue), or the single venue of a triangle
+    sides: Tuple[str, ...]     # "buy"/"sell" per leg
+    prices: Tuple[float, ...]  # quote used for each leg
+    profit: float              # fraction net of taker fees, 0.002 == 0.2%
+    size: float                # spatial: base size available on both sides; nan for triangles
+    timestamp: float
+
+
+def split_symbol(symbol: str) -> Tuple[str, str]:
+    """ccxt unified symbol -> (base, quote); settlement suffixes like ':USDT' are ignored"""
+    base, _, quote = symbol.partition("/")
+    return base, quote.split(":")[0]
+
+
+class ArbitrageScanner:
+    """
+    Spatial and triangular arbitrage over top-of-book quotes from many venues.
+
+    Quotes live in (symbol x venue) arrays. An update only re-evaluates what
+    it can change: the updated symbol's row of venues for spatial
+    opportunities, and the precomputed triangles that contain the updated
+    (symbol, venue) cell for triangular ones, whose legs are summed as log
+    rates. Triangles are discovered incrementally as new markets appear.
+    With `max_age`, quotes older than that (relative to the update being
+    applied) count as missing in both kinds of opportunity.
+    """
+
+    # (symbol x venue) quote arrays and the fill of an empty cell; see _alloc
+    QUOTE_FILLS = {
+        "bid": 0.0, "ask": np.inf, "bid_size": np.nan, "ask_size": np.nan, "updated": -np.inf,
+        "net_bid": 0.0, "net_ask": np.inf, "log_sell": -np.inf, "log_buy": -np.inf,
+    }
+    bid: np.ndarray
+    ask: np.ndarray
+    bid_size: np.ndarray
+    ask_size: np.ndarray
+    updated: np.ndarray
+    net_bid: np.ndarray   # bid net of the venue's taker fee
+    net_ask: np.ndarray   # ask including the fee
+    log_sell: np.ndarray  # log of the quote received per base sold, net of fees
+    log_buy: np.ndarray   # log of the base received per quote spent, net of fees
+
+    def __init__(
+        self,
+        fees: Optional[Dict[str, float]] = None,
+        default_fee: float = DEFAULT_FEE,
+        min_profit: float = 0.0,
+        max_age: Optional[float] = None,
+        triangular: bool = True,
+    ):
+        self.fees = dict(fees or {})
+        self.default_fee = default_fee
+        self.min_profit = min_profit
+        self.max_age = max_age
+        self.triangular = triangular
+
+        self.symbols: List[str] = []
+        self.venues: List[str] = []
+        self._symbol_index: Dict[str, int] = {}
+        self._venue_index: Dict[str, int] = {}
+        self._alloc(16, 4)
+        self.updates = 0
+
+        # Triangles: legs as (symbol row, venue column, is_sell) per leg
+        self._tri_rows: List[Tuple[int, ...]] = []
+        self._tri_venue: List[int] = []
+        self._tri_sell: List[Tuple[bool, ...]] = []
+        self._tri_arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._tri_by_cell: Dict[Tuple[int, int], List[int]] = {}
+        self._cell_arrays: Dict[Tuple[int, int], np.ndarray] = {}
+        self._markets: Dict[int, Dict[str, Dict[str, int]]] = {}  # venue -> currency -> other currency -> row
+        self._seen_triangles: set = set()
+
+    # -- storage -----------------------------------------------------------
+
+    def _alloc(self, rows: int, cols: int) -> None:
+        old = getattr(self, "bid", None)
+        for name, fill in self.QUOTE_FILLS.items():
+            grown = np.full((rows, cols), fill)
+            if old is not None:
+                current = getattr(self, name)
+                grown[:current.shape[0], :current.shape[1]] = current
+            setattr(self, name, grown)
+        self._fee_row = np.array(
+            [self.fees.get(v, self.default_fee) for v in self.venues] + [self.default_fee] * (cols - len(self.venues))
+        )
+
+    def _cell(self, symbol: str, venue: str) -> Tuple[int, int, bool]:
+        """(row, column, new market) for a symbol on a venue, growing the arrays as needed"""
+        row = self._symbol_index.get(symbol)
+        if row is None:
+            row = self._symbol_index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        col = self._venue_index.get(venue)
+        if col is None:
+            col = self._venue_index[venue] = len(self.venues)
+            self.venues.append(venue)
+        rows, cols = self.bid.shape
+        if row >= rows or col >= cols:
+            self._alloc(2 * rows if row >= rows else rows, 2 * cols if col >= cols else cols)
+        self._fee_row[col] = self.fees.get(venue, self.default_fee)
+        return row, col, not np.isfinite(self.updated[row, col])
+
+    # -- triangles ---------------------------------------------------------
+
+    def _register_market(self, row: int, col: int) -> None:
+        """Add every triangle the new market closes on its venue"""
+        base, quote = split_symbol(self.symbols[row])
+        if not base or not quote:
+            return
+        graph = self._markets.setdefault(col, {})
+        graph.setdefault(base, {})[quote] = row
+        graph.setdefault(quote, {})[base] = row
+        for third in set(graph[base]) & set(graph[quote]):
+            if third in (base, quote):
+                continue
+            currencies = (base, quote, third)
+            key = (col, frozenset(currencies))
+            if key in self._seen_triangles:
+                continue
+            self._seen_triangles.add(key)
+            # Both directions of the cycle base -> quote -> third -> base
+            for cycle in ((base, quote, third), (base, third, quote)):
+                legs = []
+                for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+                    leg_row = graph[a][b]
+                    legs.append((leg_row, split_symbol(self.symbols[leg_row])[0] == a))
+                self._add_triangle(col, legs)
+
+    def _add_triangle(self, col: int, legs: List[Tuple[int, bool]]) -> None:
+        index = len(self._tri_venue)
+        self._tri_rows.append(tuple(row for row, _ in legs))
+        self._tri_sell.append(tuple(sell for _, sell in legs))
+        self._tri_venue.append(col)
+        for row, _ in legs:
+            self._tri_by_cell.setdefault((row, col), []).append(index)
+            self._cell_arrays.pop((row, col), None)
+        self._tri_arrays = None
+
+    def _triangles(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._tri_arrays is None:
+            self._tri_arrays = (
+                np.array(self._tri_rows, dtype=np.intp).reshape(-1, 3),
+                np.array(self._tri_venue, dtype=np.intp),
+                np.array(self._tri_sell, dtype=bool).reshape(-1, 3),
+            )
+        return self._tri_arrays
+
+    def _triangle_profits(self, ids: np.ndarray, timestamp: float) -> np.ndarray:
+        rows, venues, sells = self._triangles()
+        rows, sells, cols = rows[ids], sells[ids], venues[ids][:, None]
+        logs = np.where(sells, self.log_sell[rows, cols], self.log_buy[rows, cols])
+        if self.max_age is not None:
+            logs = np.where(self.updated[rows, cols] < timestamp - self.max_age, -np.inf, logs)
+        return np.exp(logs.sum(axis=1)) - 1.0
+
+    def _triangle_opportunity(self, index: int, profit: float, timestamp: float) -> Opportunity:
+        rows, venues, sells = self._triangles()
+        col = int(venues[index])
+        legs = [int(r) for r in rows[index]]
+        sides = tuple("sell" if s else "buy" for s in sells[index])
+        prices = tuple(
+            float(self.bid[r, col] if s == "sell" else self.ask[r, col]) for r, s in zip(legs, sides)
+        )
+        return Opportunity(
+            "triangular", tuple(self.symbols[r] for r in legs), (self.venues[col],), sides, prices,
+            float(profit), float("nan"), timestamp,
+        )
+
+    # -- updates -----------------------------------------------------------
+
+    def update(
+        self,
+        venue: str,
+        symbol: str,
+        bid: float,
+        ask: float,
+        bid_size: float = float("nan"),
+        ask_size: float = float("nan"),
+        timestamp: float = 0.0,
+    ) -> List[Opportunity]:
+        """Apply a top-of-book quote; returns the opportunities it creates above min_profit"""
+        row, col, new_market = self._cell(symbol, venue)
+        fee = self._fee_row[col]
+        valid_bid, valid_ask = bid > 0, ask > 0
+        self.bid[row, col] = bid if valid_bid else 0.0
+        self.ask[row, col] = ask if valid_ask else np.inf
+        self.bid_size[row, col], self.ask_size[row, col] = bid_size, ask_size
+        self.updated[row, col] = timestamp
+        self.net_bid[row, col] = bid * (1 - fee) if valid_bid else 0.0
+        self.net_ask[row, col] = ask * (1 + fee) if valid_ask else np.inf
+        self.log_sell[row, col] = np.log(bid * (1 - fee)) if valid_bid else -np.inf
+        self.log_buy[row, col] = np.log((1 - fee) / ask) if valid_ask else -np.inf
+        self.updates += 1
+        if new_market and self.triangular:
+            self._register_market(row, col)
+
+        found = self._spatial(row, timestamp)
+        if self.triangular:
+            ids = self._cell_arrays.get((row, col))
+            if ids is None and (row, col) in self._tri_by_cell:
+                ids = self._cell_arrays[(row, col)] = np.array(self._tri_by_cell[(row, col)], dtype=np.intp)
+            if ids is not None:
+                profits = self._triangle_profits(ids, timestamp)
+                for i in np.flatnonzero(profits > self.min_profit):
+                    found.append(self._triangle_opportunity(int(ids[i]), profits[i], timestamp))
+        return found
+
+    def _spatial(self, row: int, timestamp: float) -> List[Opportunity]:
+        cols = len(self.venues)
+        if cols < 2:
+            return []
+        net_bid, net_ask = self.net_bid[row, :cols], self.net_ask[row, :cols]
+        if self.max_age is not None:
+            stale = self.updated[row, :cols] < timestamp - self.max_age
+            net_bid, net_ask = np.where(stale, 0.0, net_bid), np.where(stale, np.inf, net_ask)
+        # edge[i, j]: buy on venue i, sell on venue j
+        edge = net_bid[None, :] / net_ask[:, None] - 1.0
+        np.fill_diagonal(edge, -np.inf)
+        buy, sell = np.unravel_index(int(np.argmax(edge)), edge.shape)
+        profit = edge[buy, sell]
+        if not profit > self.min_profit:
+            return []
+        size = np.fmin(self.ask_size[row, buy], self.bid_size[row, sell])
+        return [Opportunity(
+            "spatial", (self.symbols[row],), (self.venues[buy], self.venues[sell]), ("buy", "sell"),
+            (float(self.ask[row, buy]), float(self.bid[row, sell])), float(profit), float(size), timestamp,
+        )]
+
+    def on_update(self, update: Any) -> List[Opportunity]:
+        """Apply a MarketUpdate ticker or order book; trades carry no quotes and are ignored"""
+        data = update.data
+        if update.kind == "order_book":
+            bids, asks = data.get("bids") or [], data.get("asks") or []
+            if not bids or not asks:
+                return []
+            bid, bid_size = bids[0][0], bids[0][1]
+            ask, ask_size = asks[0][0], asks[0][1]
+        elif update.kind == "ticker":
+            bid, ask = data.get("bid"), data.get("ask")
+            if bid is None or ask is None:
+                return []
+            bid_size, ask_size = data.get("bidVolume"), data.get("askVolume")
+        else:
+            return []
+        timestamp = (data.get("timestamp") or 0) / 1000.0
+        return self.update(
+            update.exchange or "default", update.symbol, float(bid), float(ask),
+            float("nan") if bid_size is None else float(bid_size),
+            float("nan") if ask_size is None else float(ask_size),
+            timestamp,
+        )
+
+    # -- full scans (for verification and periodic snapshots) ---------------
+
+    def scan(self) -> List[Opportunity]:
+        """Recompute every opportunity from scratch"""
+        found: List[Opportunity] = []
+        now = float(np.max(self.updated)) if self.updates else 0.0
+        for row in range(len(self.symbols)):
+            found.extend(self._spatial(row, now))
+        if self.triangular and self._tri_venue:
+            ids = np.arange(len(self._tri_venue))
+            profits = self._triangle_profits(ids, now)
+            for i in np.flatnonzero(profits > self.min_profit):
+                found.append(self._triangle_opportunity(int(i), profits[i], now))
+        return found
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "symbols": len(self.symbols),
+            "venues": len(self.venues),
+            "triangles": len(self._tri_venue),
+            "updates": self.updates,
+        }
+
+    async def run(
+        self,
+        sources: Sequence[Any],
+        on_opportunity: Optional[Callable[[Opportunity], Any]] = None,
+    ) -> AsyncIterator[Opportunity]:
+        """
+        Consume MarketUpdate streams (CCXTSource / ReplaySource, one per
+        venue) and yield opportunities as they appear.
+        """
+        queue: "asyncio.Queue[Any]" = asyncio.Queue()
+
+        async def pump(source: Any) -> None:
+            try:
+                async for update in source.stream():
+                    await queue.put(update)
+            finally:
+                await queue.put(None)
+
+        tasks = [asyncio.create_task(pump(source)) for source in sources]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                update = await queue.get()
+                if update is None:
+                    remaining -= 1
+                    continue
+                for opportunity in self.on_update(update):
+                    if on_opportunity is not None:
+                        on_opportunity(opportunity)
+                    yield opportunity
+        finally:
+            for task in tasks:
+                task.cancel()
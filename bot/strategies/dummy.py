@@ -1,9 +1,21 @@
 from random import uniform
+from typing import Optional
+
+from ..exchange.market_data import MarketDataStore
+from ..utils.logger import get_logger
+
+logger = get_logger("DummyStrategy")
 
 
 class DummyStrategy:
+    def __init__(self, market_data: Optional[MarketDataStore] = None, symbol: str = "BTC/USDT"):
+        self.market_data = market_data
+        self.symbol = symbol
+
     def generate_signal(self) -> str:
-        # Random fake logic
-        price = round(uniform(10000, 10500), 2)
-        print(f"[DUMMY STRATEGY] Price: ${price}")
+        price = self.market_data.latest_price(self.symbol) if self.market_data else None
+        if price is None:
+            # Random fake logic until a market data feed is attached
+            price = round(uniform(10000, 10500), 2)
+        logger.info("Price: $%s", price, extra={"sample": 0.1})
         return "buy" if price < 10200 else "hold"
@@ -0,0 +1,319 @@
+import math
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_FEE = 0.001
+SCAN_CHUNK = 1024  # ticks checked per vectorized breakout search; doubles while the price stays in range
+
+
+def grid_levels(lower: float, upper: float, grids_quantity: int, grid_type: str = "arithmetic") -> np.ndarray:
+    """Grid lines, ascending; grids_quantity lines make grids_quantity - 1 cells"""
+    if not 0 < lower < upper or grids_quantity < 2:
+        raise ValueError("Grid needs 0 < lower_price < upper_price and at least 2 lines")
+    if grid_type == "geometric":
+        return np.geomspace(lower, upper, grids_quantity)
+    if grid_type != "arithmetic":
+        raise ValueError(f"Unknown grid type: {grid_type}")
+    return np.linspace(lower, upper, grids_quantity)
+
+
+def level_crossings(levels: np.ndarray, prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every grid line crossed by a price stream, in time order.
+
+    Returns (line index, direction, tick index): direction is +1 for a move
+    above the line and -1 for a move to or below it; the tick index is the
+    position in `prices` where the crossing completed.
+    """
+    bands = np.searchsorted(levels, prices, side="left")
+    moves = np.flatnonzero(np.diff(bands))
+    origin, delta = bands[moves], bands[moves + 1] - bands[moves]
+    counts = np.abs(delta)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    direction = np.repeat(np.sign(delta), counts)
+    origin = np.repeat(origin, counts)
+    line = np.where(direction > 0, origin + offsets, origin - 1 - offsets)
+    return line, direction, np.repeat(moves + 1, counts)
+
+
+class GridFills(NamedTuple):
+    tick: np.ndarray      # index of the tick in the simulated stream
+    side: np.ndarray      # +1 sell, -1 buy
+    price: np.ndarray
+    quantity: np.ndarray  # base currency
+    profit: np.ndarray    # quote profit realized by each sell over its buy, net of the sell fee
+
+
+class GridSimulation(NamedTuple):
+    fills: GridFills
+    round_trips: int
+    realized_pnl: float    # sell profits minus every buy fee paid
+    unrealized_pnl: float  # inventory still held, marked at the last price
+    fees: float
+    shifts: int            # trailing moves and expansions
+    levels: np.ndarray     # grid at the end of the stream
+    holding: np.ndarray    # per cell, whether it holds inventory at the end
+
+
+class GridEngine:
+    """
+    Local model of a 3Commas grid bot.
+
+    Cell i spans lines i and i+1: it buys at line i and sells the same
+    quantity one line higher. Cells above the current price start out holding
+    inventory bought at market, which is also how required balances are
+    computed. Each cell is a two-state machine driven only by its own two
+    lines, so fills over a stream come from a stable sort of the vectorized
+    line crossings by cell. The stream is only split where the price leaves
+    the grid and trailing or expansion changes the lines.
+    """
+
+    def __init__(
+        self,
+        lower_price: float,
+        upper_price: float,
+        grids_quantity: int,
+        quantity_per_grid: float,
+        grid_type: str = "arithmetic",
+        order_currency_type: str = "base",
+        fee: float = DEFAULT_FEE,
+        trailing_up: bool = False,
+        trailing_down: bool = False,
+        expansion_up: bool = False,
+        expansion_down: bool = False,
+        expansion_up_stop_price: Optional[float] = None,
+        expansion_down_stop_price: Optional[float] = None,
+    ):
+        self.levels = grid_levels(lower_price, upper_price, grids_quantity, grid_type)
+        self.grid_type = grid_type
+        self.quantity_per_grid = quantity_per_grid
+        self.order_currency_type = order_currency_type
+        self.fee = fee
+        self.trailing_up = trailing_up
+        self.trailing_down = trailing_down
+        self.expansion_up = expansion_up
+        self.expansion_down = expansion_down
+        self.expansion_up_stop_price = expansion_up_stop_price
+        self.expansion_down_stop_price = expansion_down_stop_price
+
+    @classmethod
+    def from_payload(cls, payload: Any, fee: float = DEFAULT_FEE) -> "GridEngine":
+        """Build from CreateGridBotPayload / UpdateGridBotPayload or their dict form"""
+        data = payload if isinstance(payload, dict) else payload.dict()
+        return cls(
+            lower_price=float(data["lower_price"]),
+            upper_price=float(data["upper_price"]),
+            grids_quantity=int(data["grids_quantity"]),
+            quantity_per_grid=float(data["quantity_per_grid"]),
+            grid_type=data.get("grid_type") or "arithmetic",
+            order_currency_type=data.get("order_currency_type") or "base",
+            fee=fee,
+            trailing_up=bool(data.get("trailing_up_enabled")),
+            trailing_down=bool(data.get("trailing_down_enabled")),
+            expansion_up=bool(data.get("expansion_up_enabled")),
+            expansion_down=bool(data.get("expansion_down_enabled")),
+            expansion_up_stop_price=data.get("expansion_up_stop_price"),
+            expansion_down_stop_price=data.get("expansion_down_stop_price"),
+        )
+
+    def quantities(self, levels: Optional[np.ndarray] = None) -> np.ndarray:
+        """Base quantity per cell; quote-sized grids buy less base on higher lines"""
+        levels = self.levels if levels is None else levels
+        if self.order_currency_type == "quote":
+            return self.quantity_per_grid / levels[:-1]
+        return np.full(len(levels) - 1, float(self.quantity_per_grid))
+
+    def profit_per_grid(self) -> Dict[str, Any]:
+        """Net profit of one buy/sell round trip on each cell, in percent and quote"""
+        low, high = self.levels[:-1], self.levels[1:]
+        cost = low * (1 + self.fee)
+        net = high * (1 - self.fee) - cost
+        percentage = net / cost * 100.0
+        return {
+            "min_percentage": float(percentage.min()),
+            "max_percentage": float(percentage.max()),
+            "per_grid_percentage": percentage.tolist(),
+            "per_grid_quote": (net * self.quantities()).tolist(),
+        }
+
+    def required_balances(self, price: float) -> Dict[str, float]:
+        """
+        Balances needed to start the bot at `price`: base for the sell orders
+        above it and quote for the buy orders below it.
+        """
+        qty = self.quantities()
+        holding = self.levels[1:] > price
+        base = float(qty[holding].sum())
+        quote = float((qty[~holding] * self.levels[:-1][~holding]).sum())
+        return {"base_amount": base, "quote_amount": quote, "total_quote": quote + base * price}
+
+    # -- simulation --------------------------------------------------------
+
+    def _step(self, levels: np.ndarray) -> float:
+        return levels[1] / levels[0] if self.grid_type == "geometric" else levels[1] - levels[0]
+
+    def _lines_beyond(self, levels: np.ndarray, price: float, up: bool) -> np.ndarray:
+        """New lines needed past the grid edge until `price` is inside again"""
+        step, edge = self._step(levels), levels[-1] if up else levels[0]
+        if self.grid_type == "geometric":
+            k = math.ceil(abs(math.log(price / edge)) / math.log(step))
+            powers = step ** np.arange(1, max(k, 1) + 1)
+            return edge * powers if up else edge / powers[::-1]
+        k = math.ceil(abs(price - edge) / step)
+        offsets = step * np.arange(1, max(k, 1) + 1)
+        return edge + offsets if up else edge - offsets[::-1]
+
+    def _run_cells(
+        self, levels: np.ndarray, qty: np.ndarray, prices: np.ndarray, offset: int,
+        holding: np.ndarray, held_at: np.ndarray, fills: List[GridFills],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Fills over a stretch where the lines do not change; returns the end state"""
+        cells = len(levels) - 1
+        line, direction, tick = level_crossings(levels, prices)
+        cell = np.where(direction < 0, line, line - 1)
+        valid = np.flatnonzero((cell >= 0) & (cell < cells))
+        order = valid[np.argsort(cell[valid], kind="stable")]
+        cell, is_sell = cell[order], direction[order] > 0
+        if not len(cell):
+            return holding, held_at
+
+        first = np.ones(len(cell), dtype=bool)
+        first[1:] = cell[1:] != cell[:-1]
+        prev_buy = np.zeros(len(cell), dtype=bool)
+        prev_buy[1:] = ~is_sell[:-1]
+        # A cell's state after any of its crossings is that crossing's side, so
+        # a crossing fills only when the previous one (or the start) left it opposite
+        sells = is_sell & np.where(first, holding[cell], prev_buy)
+        buys = ~is_sell & np.where(first, ~holding[cell], ~prev_buy)
+        group = np.cumsum(first) - 1
+        sells_so_far = np.cumsum(sells, dtype=np.int64)
+        sells_so_far -= (sells_so_far - sells)[first][group]
+        carried = sells & holding[cell] & (sells_so_far == 1)  # sells inventory held coming in
+
+        filled = sells | buys
+        side = np.where(is_sell, 1, -1)[filled]
+        fill_cell = cell[filled]
+        price = np.where(is_sell[filled], levels[fill_cell + 1], levels[fill_cell])
+        basis = np.where(carried[filled], held_at[fill_cell], levels[fill_cell])
+        profit = np.where(side > 0, qty[fill_cell] * (price * (1 - self.fee) - basis), 0.0)
+        at = np.argsort(order[filled], kind="stable")  # back to time order
+        fills.append(GridFills(tick[order][filled][at] + offset, side[at], price[at], qty[fill_cell][at], profit[at]))
+
+        last = np.ones(len(cell), dtype=bool)
+        last[:-1] = cell[1:] != cell[:-1]
+        holding, held_at = holding.copy(), held_at.copy()
+        holding[cell[last]] = ~is_sell[last]
+        bought = cell[buys]
+        held_at[bought] = levels[bought]
+        return holding, held_at
+
+    def _breakout(self, prices: np.ndarray, start: int, low: Optional[float], high: Optional[float]) -> int:
+        """First tick after `start` outside [low, high] (None disables a side), or len(prices)"""
+        n, chunk = len(prices), SCAN_CHUNK
+        j = start + 1
+        while j < n:
+            end = min(n, j + chunk)
+            window = prices[j:end]
+            outside = np.zeros(len(window), dtype=bool)
+            if high is not None:
+                outside |= window > high
+            if low is not None:
+                outside |= window < low
+            if outside.any():
+                return j + int(outside.argmax())
+            j, chunk = end, chunk * 2
+        return n
+
+    def simulate(self, prices: np.ndarray) -> GridSimulation:
+        """Run the grid over a tick (or OHLC path) stream starting at prices[0]"""
+        prices = np.asarray(prices, dtype=float)
+        levels = self.levels.copy()
+        qty = self.quantities(levels)
+        start = float(prices[0])
+        holding = levels[1:] > start
+        held_at = np.full(len(qty), start)
+        fills: List[GridFills] = []
+        self._market(fills, 0, -1, start, qty[holding])
+
+        expand_up, expand_down = self.expansion_up, self.expansion_down
+        shifts, s, n = 0, 0, len(prices)
+        while True:
+            watch_up = self.trailing_up or expand_up
+            watch_down = self.trailing_down or expand_down
+            t = self._breakout(prices, s, levels[0] if watch_down else None, levels[-1] if watch_up else None)
+            holding, held_at = self._run_cells(levels, qty, prices[s:t + 1], s, holding, held_at, fills)
+            if t >= n:
+                break
+            price, up = float(prices[t]), prices[t] > levels[-1]
+            new = self._lines_beyond(levels, price, up)
+
+            if up and expand_up:
+                if self.expansion_up_stop_price is not None:
+                    new = new[new <= self.expansion_up_stop_price]
+                if not len(new):
+                    expand_up = False
+                    s = t
+                    continue
+                added = np.concatenate(([levels[-1]], new))
+                levels = np.concatenate((levels, new))
+                new_qty = self.quantities(added)
+                new_holding = added[1:] > price
+                qty = np.concatenate((qty, new_qty))
+                holding = np.concatenate((holding, new_holding))
+                held_at = np.concatenate((held_at, np.full(len(new_qty), price)))
+                self._market(fills, t, -1, price, new_qty[new_holding])
+            elif not up and expand_down:
+                if self.expansion_down_stop_price is not None:
+                    new = new[new >= self.expansion_down_stop_price]
+                if not len(new):
+                    expand_down = False
+                    s = t
+                    continue
+                added = np.concatenate((new, [levels[0]]))
+                levels = np.concatenate((new, levels))
+                new_qty = self.quantities(added)
+                qty = np.concatenate((new_qty, qty))
+                holding = np.concatenate((np.ones(len(new_qty), dtype=bool), holding))
+                held_at = np.concatenate((np.full(len(new_qty), price), held_at))
+                self._market(fills, t, -1, price, new_qty)
+            elif up:
+                # Trailing up: every cell has sold; move the lines up and buy into the cells above the price
+                levels = np.concatenate((levels, new))[-len(levels):]
+                qty = self.quantities(levels)
+                holding = levels[1:] > price
+                held_at = np.full(len(qty), price)
+                self._market(fills, t, -1, price, qty[holding])
+            else:
+                # Trailing down: every cell holds; the top cells' inventory moves to the new bottom cells
+                dropped = min(len(new), len(qty))
+                levels = np.concatenate((new, levels))[:len(levels)]
+                qty = self.quantities(levels)
+                holding = np.ones(len(qty), dtype=bool)
+                held_at = np.concatenate((held_at[len(qty) - dropped:], held_at[:len(qty) - dropped]))
+            shifts += 1
+            s = t
+
+        merged = GridFills(*(np.concatenate(column) for column in zip(*fills)))
+        fee_paid = float(np.sum(merged.price * merged.quantity) * self.fee)
+        buy_fees = float(np.sum((merged.price * merged.quantity)[merged.side < 0]) * self.fee)
+        last = float(prices[-1])
+        return GridSimulation(
+            fills=merged,
+            round_trips=int((merged.side > 0).sum()),
+            realized_pnl=float(merged.profit.sum()) - buy_fees,
+            unrealized_pnl=float(np.sum(qty[holding] * (last * (1 - self.fee) - held_at[holding]))),
+            fees=fee_paid,
+            shifts=shifts,
+            levels=levels,
+            holding=holding,
+        )
+
+    @staticmethod
+    def _market(fills: List[GridFills], tick: int, side: int, price: float, quantity: np.ndarray) -> None:
+        """Record market orders placed when (re)building the grid"""
+        count = len(quantity)
+        fills.append(GridFills(
+            np.full(count, tick), np.full(count, side), np.full(count, price),
+            np.asarray(quantity, dtype=float), np.zeros(count),
+        ))
@@ -0,0 +1,201 @@
+# strategies/indicators.py
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+
+class IndicatorBank:
+    """
+    Incremental RSI, EMA, ATR, Bollinger Bands and VWAP for many pairs at once.
+
+    All state lives in NumPy arrays indexed by pair, so one `update` call
+    advances every pair (or the subset given by `index`) in O(1) per pair,
+    without Python-level loops. Values follow the `ta` library definitions
+    (see `compute_indicators`) and are NaN until each indicator has seen
+    `window` samples.
+    """
+
+    def __init__(
+        self,
+        n_pairs: int,
+        rsi_period: int = 14,
+        ema_period: int = 50,
+        atr_period: int = 14,
+        bb_period: int = 20,
+        bb_dev: float = 2.0,
+        vwap_period: int = 14,
+    ):
+        self.n_pairs = n_pairs
+        self.rsi_period = rsi_period
+        self.ema_period = ema_period
+        self.atr_period = atr_period
+        self.bb_period = bb_period
+        self.bb_dev = bb_dev
+        self.vwap_period = vwap_period
+
+        nan = lambda: np.full(n_pairs, np.nan)  # noqa: E731
+        self.count = np.zeros(n_pairs, dtype=np.int64)
+        self.close = nan()
+
+        self._ema = np.zeros(n_pairs)
+        self._rsi_up = np.zeros(n_pairs)
+        self._rsi_down = np.zeros(n_pairs)
+        self._atr = np.zeros(n_pairs)
+
+        self._bb_buffer = np.zeros((n_pairs, bb_period))
+        self._bb_sum = np.zeros(n_pairs)
+        self._bb_sumsq = np.zeros(n_pairs)
+
+        self._pv_buffer = np.zeros((n_pairs, vwap_period))
+        self._vol_buffer = np.zeros((n_pairs, vwap_period))
+        self._pv_sum = np.zeros(n_pairs)
+        self._vol_sum = np.zeros(n_pairs)
+
+        self.ema = nan()
+        self.rsi = nan()
+        self.atr = nan()
+        self.bb_middle = nan()
+        self.bb_upper = nan()
+        self.bb_lower = nan()
+        self.vwap = nan()
+
+    def update(
+        self,
+        close: ArrayLike,
+        high: Optional[ArrayLike] = None,
+        low: Optional[ArrayLike] = None,
+        volume: Optional[ArrayLike] = None,
+        index: Optional[ArrayLike] = None,
+    ) -> None:
+        """Advance the pairs in `index` (default: all) by one bar/tick"""
+        rows = np.arange(self.n_pairs) if index is None else np.asarray(index, dtype=np.int64)
+        c = np.asarray(close, dtype=np.float64)
+        h = c if high is None else np.asarray(high, dtype=np.float64)
+        l = c if low is None else np.asarray(low, dtype=np.float64)  # noqa: E741
+        v = np.zeros_like(c) if volume is None else np.asarray(volume, dtype=np.float64)
+
+        count = self.count[rows]
+        first = count == 0
+        prev = np.where(first, c, self.close[rows])
+        n = count + 1
+
+        # EMA: ewm(span=period, adjust=False) seeded with the first close
+        alpha = 2.0 / (self.ema_period + 1)
+        ema = np.where(first, c, self._ema[rows] + alpha * (c - self._ema[rows]))
+        self._ema[rows] = ema
+        self.ema[rows] = np.where(n >= self.ema_period, ema, np.nan)
+
+        # RSI: Wilder smoothing (ewm alpha=1/period) of gains and losses
+        diff = c - prev
+        alpha = 1.0 / self.rsi_period
+        up = self._rsi_up[rows] + alpha * (np.maximum(diff, 0.0) - self._rsi_up[rows])
+        down = self._rsi_down[rows] + alpha * (np.maximum(-diff, 0.0) - self._rsi_down[rows])
+        up = np.where(first, 0.0, up)
+        down = np.where(first, 0.0, down)
+        self._rsi_up[rows] = up
+        self._rsi_down[rows] = down
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(down == 0, 100.0, 100.0 - 100.0 / (1.0 + up / down))
+        self.rsi[rows] = np.where(n >= self.rsi_period, rsi, np.nan)
+
+        # ATR: simple mean of the first `period` true ranges, Wilder smoothing afterwards
+        true_range = np.where(
+            first,
+            h - l,
+            np.maximum(h - l, np.maximum(np.abs(h - prev), np.abs(l - prev))),
+        )
+        period = self.atr_period
+        atr = np.where(
+            n <= period,
+            self._atr[rows] + true_range,                         # running sum while warming up
+            (self._atr[rows] * (period - 1) + true_range) / period,
+        )
+        atr = np.where(n == period, atr / period, atr)
+        self._atr[rows] = atr
+        self.atr[rows] = np.where(n >= period, atr, np.nan)
+
+        # Bollinger Bands: rolling mean/std (ddof=0) from running sums over a ring buffer
+        slot = count % self.bb_period
+        old = np.where(count >= self.bb_period, self._bb_buffer[rows, slot], 0.0)
+        self._bb_buffer[rows, slot] = c
+        bb_sum = self._bb_sum[rows] + c - old
+        bb_sumsq = self._bb_sumsq[rows] + c * c - old * old
+        # Re-sum full windows once per wrap so floating point drift can't accumulate
+        wrapped = slot == self.bb_period - 1
+        if wrapped.any():
+            full = self._bb_buffer[rows[wrapped]]
+            bb_sum[wrapped] = full.sum(axis=1)
+            bb_sumsq[wrapped] = (full * full).sum(axis=1)
+        self._bb_sum[rows] = bb_sum
+        self._bb_sumsq[rows] = bb_sumsq
+        ready = n >= self.bb_period
+        mean = bb_sum / self.bb_period
+        std = np.sqrt(np.maximum(bb_sumsq / self.bb_period - mean * mean, 0.0))
+        self.bb_middle[rows] = np.where(ready, mean, np.nan)
+        self.bb_upper[rows] = np.where(ready, mean + self.bb_dev * std, np.nan)
+        self.bb_lower[rows] = np.where(ready, mean - self.bb_dev * std, np.nan)
+
+        # VWAP: rolling sum(typical price * volume) / rolling sum(volume)
+        slot = count % self.vwap_period
+        filled = count >= self.vwap_period
+        pv = (h + l + c) / 3.0 * v
+        old_pv = np.where(filled, self._pv_buffer[rows, slot], 0.0)
+        old_vol = np.where(filled, self._vol_buffer[rows, slot], 0.0)
+        self._pv_buffer[rows, slot] = pv
+        self._vol_buffer[rows, slot] = v
+        pv_sum = self._pv_sum[rows] + pv - old_pv
+        vol_sum = self._vol_sum[rows] + v - old_vol
+        wrapped = slot == self.vwap_period - 1
+        if wrapped.any():
+            pv_sum[wrapped] = self._pv_buffer[rows[wrapped]].sum(axis=1)
+            vol_sum[wrapped] = self._vol_buffer[rows[wrapped]].sum(axis=1)
+        self._pv_sum[rows] = pv_sum
+        self._vol_sum[rows] = vol_sum
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vwap = pv_sum / vol_sum
+        self.vwap[rows] = np.where(n >= self.vwap_period, vwap, np.nan)
+
+        self.close[rows] = c
+        self.count[rows] = n
+
+
+def compute_indicators(
+    df: pd.DataFrame,
+    rsi_period: int = 14,
+    ema_period: int = 50,
+    atr_period: int = 14,
+    bb_period: int = 20,
+    bb_dev: float = 2.0,
+    vwap_period: int = 14,
+) -> pd.DataFrame:
+    """
+    Batch computation over a whole OHLCV frame with the `ta` library.
+
+    `df` needs a `close` column; `high`/`low` default to close and `volume`
+    to zero, mirroring IndicatorBank.update.
+    """
+    from ta.momentum import RSIIndicator
+    from ta.trend import EMAIndicator
+    from ta.volatility import AverageTrueRange, BollingerBands
+    from ta.volume import VolumeWeightedAveragePrice
+
+    close = df["close"].astype(float)
+    high = df["high"].astype(float) if "high" in df else close
+    low = df["low"].astype(float) if "low" in df else close
+    volume = df["volume"].astype(float) if "volume" in df else close * 0.0
+
+    bands = BollingerBands(close, window=bb_period, window_dev=bb_dev)
+    atr = AverageTrueRange(high, low, close, window=atr_period).average_true_range()
+    atr.iloc[:atr_period - 1] = np.nan  # ta reports 0 while warming up
+    return pd.DataFrame({
+        "rsi": RSIIndicator(close, window=rsi_period).rsi(),
+        "ema": EMAIndicator(close, window=ema_period).ema_indicator(),
+        "atr": atr,
+        "bb_middle": bands.bollinger_mavg(),
+        "bb_upper": bands.bollinger_hband(),
+        "bb_lower": bands.bollinger_lband(),
+        "vwap": VolumeWeightedAveragePrice(high, low, close, volume, window=vwap_period).volume_weighted_average_price(),
+    }, index=df.index)
@@ -1,3 +1,14 @@
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .indicators import ArrayLike, IndicatorBank, compute_indicators
+
+BUY, HOLD, SELL = 1, 0, -1
+SIGNAL_NAMES = {BUY: "buy", HOLD: "hold", SELL: "sell"}
+
+
 def rsi_ema_scalping_strategy() -> dict:
     return {
         "strategy": "nonstop",
@@ -10,3 +21,87 @@ def rsi_ema_scalping_strategy() -> dict:
             "take_profit_pct": 0.04,
         }
     }
+
+
+def scalping_signals(
+    close: np.ndarray,
+    rsi: np.ndarray,
+    ema: np.ndarray,
+    rsi_buy_threshold: float,
+    rsi_sell_threshold: float,
+) -> np.ndarray:
+    """
+    RSI/EMA scalping rule, vectorized: buy oversold dips while price holds above
+    the EMA trend, sell when overbought. Pairs still warming up (NaN) hold.
+    """
+    with np.errstate(invalid="ignore"):
+        buy = (rsi < rsi_buy_threshold) & (close > ema)
+        sell = rsi > rsi_sell_threshold
+    return np.where(buy, BUY, np.where(sell, SELL, HOLD)).astype(np.int8)
+
+
+class RSIEMAScalpingStrategy:
+    """
+    Evaluates the RSI/EMA scalping signal locally for many pairs.
+
+    `update(prices)` advances every pair by one tick and returns a signal per
+    pair; in the trading engine each MarketEvent updates only its own pair.
+    """
+
+    def __init__(self, symbols: Iterable[str], options: Optional[Dict[str, Any]] = None, interval: Optional[float] = None):
+        self.options = {**rsi_ema_scalping_strategy()["options"], **(options or {})}
+        self.symbols = list(symbols)
+        self.interval = interval
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.bank = IndicatorBank(
+            len(self.symbols),
+            rsi_period=self.options["rsi_period"],
+            ema_period=self.options["ema_period"],
+        )
+
+    def evaluate(self) -> np.ndarray:
+        return scalping_signals(
+            self.bank.close, self.bank.rsi, self.bank.ema,
+            self.options["rsi_buy_threshold"], self.options["rsi_sell_threshold"],
+        )
+
+    def update(
+        self,
+        prices: ArrayLike,
+        high: Optional[ArrayLike] = None,
+        low: Optional[ArrayLike] = None,
+        volume: Optional[ArrayLike] = None,
+    ) -> np.ndarray:
+        self.bank.update(prices, high, low, volume)
+        return self.evaluate()
+
+    def on_market_event(self, event: Any) -> Optional[str]:
+        index = self._index.get(event.symbol)
+        if index is None:
+            return None
+        self.bank.update([event.price], volume=[event.volume], index=[index])
+        signal = scalping_signals(
+            self.bank.close[index:index + 1], self.bank.rsi[index:index + 1], self.bank.ema[index:index + 1],
+            self.options["rsi_buy_threshold"], self.options["rsi_sell_threshold"],
+        )[0]
+        return SIGNAL_NAMES[int(signal)]
+
+    def signals(self) -> Dict[str, str]:
+        """Current signal per symbol"""
+        return {symbol: SIGNAL_NAMES[int(signal)] for symbol, signal in zip(self.symbols, self.evaluate())}
+
+    def generate_signal(self) -> str:
+        # Deadline ticks carry no new price and no symbol to act on; signals are
+        # only emitted from on_market_event, once per price update
+        return "hold"
+
+    def evaluate_batch(self, df: pd.DataFrame) -> pd.Series:
+        """Signals over a whole price history using the `ta` batch indicators"""
+        indicators = compute_indicators(
+            df, rsi_period=self.options["rsi_period"], ema_period=self.options["ema_period"]
+        )
+        signals = scalping_signals(
+            df["close"].to_numpy(dtype=float), indicators["rsi"].to_numpy(), indicators["ema"].to_numpy(),
+            self.options["rsi_buy_threshold"], self.options["rsi_sell_threshold"],
+        )
+        return pd.Series(signals, index=df.index, name="signal")
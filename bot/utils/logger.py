@@ -1,11 +1,180 @@
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import re
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")  # "text" | "json"
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+
+REDACTED = "***"
+_SECRET_NAMES = r"api[_-]?key|apikey|api[_-]?secret|secret|signature|passphrase|password|token"
+_SECRET_KEY = re.compile(rf"^({_SECRET_NAMES})$", re.IGNORECASE)
+_SECRET_VALUE = re.compile(
+    rf"""(?i)(["']?\b(?:{_SECRET_NAMES})["']?\s*[:=]\s*["']?)([^"',\s}}&]+)"""
+)
+
+# LogRecord attributes; anything else on a record came in through `extra=`
+_RESERVED = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sample"}
+
+
+def redact(value: Any) -> Any:
+    """Mask credentials in strings (key=value / "key": "value" pairs) and in dict values by key"""
+    if isinstance(value, str):
+        return _SECRET_VALUE.sub(rf"\g<1>{REDACTED}", value)
+    if isinstance(value, dict):
+        return {k: REDACTED if isinstance(k, str) and _SECRET_KEY.match(k) else redact(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(redact(v) for v in value)
+    return value
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__("[%(asctime)s] %(levelname)s - %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        return redact(super().format(record))
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, `extra=` fields and any traceback"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact(record.getMessage()),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED:
+                entry[key] = REDACTED if _SECRET_KEY.match(key) else redact(value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = redact(record.exc_text)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one in every round(1 / rate) records per call site for records
+    logged with extra={"sample": rate}; warnings and errors are never dropped.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._seen: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = getattr(record, "sample", None)
+        if rate is None or rate >= 1 or record.levelno >= logging.WARNING:
+            return True
+        site = (record.pathname, record.lineno)
+        with self._lock:
+            seen = self._seen.get(site, 0)
+            self._seen[site] = seen + 1
+        return rate > 0 and seen % max(1, round(1 / rate)) == 0
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread with their message already merged
+    (so later changes to the logged objects can't alter it) and any traceback
+    rendered to text; `extra=` fields are kept for the JSON formatter, and
+    redaction and layout happen on the listener thread. A full queue drops
+    the record instead of blocking the caller.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Like QueueHandler.prepare, minus the full format(): only what can't travel is resolved here
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+        record = copy.copy(record)
+        record.message = message
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def _start_listener(handler: NonBlockingQueueHandler) -> QueueListener:
+    stream = logging.StreamHandler()
+    stream.setFormatter(JSONFormatter() if LOG_FORMAT == "json" else TextFormatter())
+    listener = QueueListener(handler.queue, stream, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def _pipeline() -> NonBlockingQueueHandler:
+    """Create the process-wide queue handler and its background listener once"""
+    global _handler, _listener
+    with _lock:
+        if _handler is None:
+            _handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+            _handler.addFilter(SamplingFilter())
+            _listener = _start_listener(_handler)
+            atexit.register(shutdown)
+        return _handler
+
+
+def _after_fork() -> None:
+    """A forked child inherits the handler but not the listener thread"""
+    global _listener, _lock
+    _lock = threading.Lock()
+    if _handler is not None:
+        _handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+        _listener = _start_listener(_handler)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def shutdown() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
 
 
 def get_logger(name: str) -> logging.Logger:
+    """
+    Logger writing through the shared non-blocking pipeline. Safe to call any
+    number of times per name; use %-style arguments so messages below the
+    level are never formatted.
+    """
     logger = logging.getLogger(name)
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
+    handler = _pipeline()
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+        logger.setLevel(LOG_LEVEL)
+        logger.propagate = False
     return logger
@@ -0,0 +1,70 @@
+import asyncio
+
+import httpx
+import pytest
+
+from bot.api_client.async_client import AsyncThreeCommasAPIClient
+from bot.api_client.client import APIError, UnconfirmedRequestError
+
+
+class FastRetryClient(AsyncThreeCommasAPIClient):
+    BASE_URL = "https://3commas.test/public/api"
+    RETRY_DELAY = 0.0
+
+
+def call(method, path, respond):
+    """Send one request through the retry loop; returns (result or exception, attempts seen)"""
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        return respond(len(attempts))
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            client = FastRetryClient("key", "secret", http_client=http)
+            try:
+                return await getattr(client, method.lower())(path, {"pair": "USDT_BTC"})
+            except APIError as e:
+                return e
+
+    return asyncio.run(scenario()), len(attempts)
+
+
+def test_get_is_retried_after_a_server_error():
+    def respond(n):
+        return httpx.Response(502) if n < 3 else httpx.Response(200, json={"id": 1})
+
+    outcome, attempts = call("GET", "/ver1/deals/1/show", respond)
+    assert outcome == {"id": 1}
+    assert attempts == 3
+
+
+@pytest.mark.parametrize("method", ["POST", "PATCH"])
+def test_unsafe_methods_are_not_resent_after_a_server_error(method):
+    outcome, attempts = call(method, "/ver1/bots/7/start_new_deal", lambda n: httpx.Response(504))
+    assert isinstance(outcome, UnconfirmedRequestError)
+    assert outcome.status_code == 504
+    assert attempts == 1
+
+
+def test_post_is_not_resent_after_a_read_timeout():
+    def respond(n):
+        raise httpx.ReadTimeout("no answer")
+
+    outcome, attempts = call("POST", "/ver1/bots/8/start_new_deal", respond)
+    assert isinstance(outcome, UnconfirmedRequestError)
+    assert attempts == 1
+
+
+def test_post_is_retried_when_it_never_reached_3commas():
+    def respond(n):
+        if n == 1:
+            raise httpx.ConnectError("refused")
+        if n == 2:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"id": 5})
+
+    outcome, attempts = call("POST", "/ver1/bots/9/start_new_deal", respond)
+    assert outcome == {"id": 5}
+    assert attempts == 3
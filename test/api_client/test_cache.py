@@ -0,0 +1,164 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from bot.api_client.cache import ResponseCache
+
+
+def get_async(cache, fetch, path="/ver1/bots", params=None):
+    return cache.get_or_fetch_async("key", "GET", path, params, fetch)
+
+
+def get(cache, fetch, path="/ver1/bots", api_key="key"):
+    return cache.get_or_fetch(api_key, "GET", path, None, fetch)
+
+
+class Upstream:
+    """Counts fetches; each waits for `release` so callers can pile up"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def fetch(self):
+        self.calls += 1
+        await self.release.wait()
+        return {"call": self.calls}
+
+
+def test_concurrent_async_callers_share_one_fetch():
+    async def scenario():
+        cache = ResponseCache()
+        upstream = Upstream()
+        callers = [asyncio.create_task(get_async(cache, upstream.fetch, params={"limit": 10})) for _ in range(5)]
+        await asyncio.sleep(0)
+        upstream.release.set()
+        results = await asyncio.gather(*callers)
+        cached = await get_async(cache, upstream.fetch, "/public/api/ver1/bots", {"limit": 10})
+        return cache, upstream, results, cached
+
+    cache, upstream, results, cached = asyncio.run(scenario())
+    assert upstream.calls == 1
+    assert results == [{"call": 1}] * 5
+    assert cached == {"call": 1}
+    assert cache.stats()["coalesced"] == 4
+    assert cache.stats()["hits"] == 1
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others():
+    async def scenario():
+        cache = ResponseCache()
+        upstream = Upstream()
+        leader = asyncio.create_task(get_async(cache, upstream.fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(get_async(cache, upstream.fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        upstream.release.set()
+        return upstream, await follower, leader.cancelled()
+
+    upstream, result, leader_cancelled = asyncio.run(scenario())
+    assert leader_cancelled
+    assert result == {"call": 1}
+    assert upstream.calls == 1
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    async def failing():
+        await asyncio.sleep(0)
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        cache = ResponseCache()
+        callers = [get_async(cache, failing, "/ver1/accounts") for _ in range(3)]
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        return cache, results
+
+    cache, results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert cache.stats()["entries"] == 0
+
+
+def test_uncached_paths_always_fetch():
+    cache = ResponseCache()
+    calls = []
+    for _ in range(2):
+        get(cache, lambda: calls.append(1), "/ver1/deals")
+    assert len(calls) == 2
+    assert cache.ttl_for("/ver1/deals") is None
+
+
+def test_entries_expire_after_their_ttl():
+    cache = ResponseCache(ttls=[(r"^/ver1/bots$", 0.05)])
+    values = iter(range(10))
+    first = get(cache, lambda: next(values))
+    again = get(cache, lambda: next(values))
+    time.sleep(0.06)
+    expired = get(cache, lambda: next(values))
+    assert (first, again, expired) == (0, 0, 1)
+
+
+def test_concurrent_sync_callers_share_one_fetch():
+    cache = ResponseCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "bots"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(get(cache, fetch)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(get(cache, fetch))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    while cache.stats()["coalesced"] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert results == ["bots"] * 4
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("mutated, evicted", [
+    ("/ver1/bots/42/enable", {"/ver1/bots", "/ver1/bots/42/show"}),
+    ("/public/api/ver1/accounts/7/load_balances", {"/ver1/accounts", "/ver1/accounts/7"}),
+])
+def test_mutations_evict_their_resource_and_its_listing(mutated, evicted):
+    cache = ResponseCache(ttls=[(r"^/ver1/", 60.0)])
+    paths = ["/ver1/bots", "/ver1/bots/42/show", "/ver1/bots/43/show", "/ver1/accounts", "/ver1/accounts/7"]
+    for path in paths:
+        get(cache, lambda: path, path)
+        get(cache, lambda: path, path, "other-key")
+
+    assert cache.invalidate("key", mutated) == len(evicted)
+    refetched = []
+    for path in paths:
+        get(cache, lambda: refetched.append(path), path)
+        get(cache, lambda: refetched.append(("other", path)), path, "other-key")
+    assert set(refetched) == evicted
+
+
+def test_a_fetch_started_before_an_invalidation_is_not_stored():
+    async def scenario():
+        cache = ResponseCache()
+        upstream = Upstream()
+        stale = asyncio.create_task(get_async(cache, upstream.fetch))
+        await asyncio.sleep(0)
+        cache.invalidate("key", "/ver1/bots/42/enable")
+        upstream.release.set()
+        await stale
+        return await get_async(cache, upstream.fetch), upstream
+
+    fresh, upstream = asyncio.run(scenario())
+    assert upstream.calls == 2
+    assert fresh == {"call": 2}
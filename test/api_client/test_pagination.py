@@ -0,0 +1,47 @@
+import asyncio
+
+from bot.api_client.pagination import paginate
+
+
+class Pages:
+    """100 items in pages of 10; records which pages were requested and finished"""
+
+    def __init__(self, total=100, size=10, report_total=True):
+        self.total, self.size, self.report_total = total, size, report_total
+        self.requested, self.finished = [], []
+
+    async def fetch(self, index):
+        self.requested.append(index)
+        await asyncio.sleep(0.001 * (index % 3))
+        items = list(range(index * self.size, min(self.total, (index + 1) * self.size)))
+        self.finished.append(index)
+        return {"data": items, "total": self.total} if self.report_total else items
+
+
+def collect(pages, **options):
+    async def scenario():
+        return [item async for item in paginate(pages.fetch, pages.size, **options)]
+
+    return asyncio.run(scenario())
+
+
+def test_items_arrive_in_order_with_and_without_a_total():
+    assert collect(Pages(), prefetch=4) == list(range(100))
+    assert collect(Pages(total=95, report_total=False)) == list(range(95))
+    assert collect(Pages(total=100, report_total=False)) == list(range(100))
+
+
+def test_stopping_early_cancels_and_awaits_the_prefetched_pages():
+    pages = Pages()
+
+    async def scenario():
+        stream = paginate(pages.fetch, pages.size, prefetch=4)
+        async for item in stream:
+            if item == 15:
+                break
+        await stream.aclose()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        return tasks
+
+    assert asyncio.run(scenario()) == []
+    assert len(pages.finished) < 10
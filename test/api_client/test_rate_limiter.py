@@ -0,0 +1,100 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+from bot.api_client.rate_limiter import RateLimiter, TokenBucket, endpoint_family, key_id, parse_retry_after
+
+
+@pytest.mark.parametrize("endpoint, family", [
+    ("/public/api/ver1/bots/1/show", "/ver1/bots"),
+    ("/ver1/deals?limit=10", "/ver1/deals"),
+    ("/ver2/smart_trades/5", "/ver2/smart_trades"),
+    ("/health", "default"),
+])
+def test_endpoint_family(endpoint, family):
+    assert endpoint_family(endpoint) == family
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 8 <= parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+
+def test_bucket_queues_callers_in_arrival_order():
+    bucket = TokenBucket(rate=10.0, capacity=2.0)
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2:] == pytest.approx([0.1, 0.2, 0.3], abs=0.01)
+
+
+def test_bucket_refills_up_to_capacity():
+    bucket = TokenBucket(rate=100.0, capacity=2.0)
+    bucket.reserve(2)
+    time.sleep(0.05)
+    assert bucket.stats()["tokens"] == pytest.approx(2.0)
+    assert bucket.reserve() == 0.0
+
+
+def test_penalty_holds_back_a_caller_already_queued():
+    async def scenario():
+        bucket = TokenBucket(rate=20.0, capacity=1.0)
+        bucket.reserve()
+        queued = asyncio.create_task(bucket.acquire_async())  # due in 0.05s
+        await asyncio.sleep(0.01)
+        bucket.penalize(0.2)
+        started = time.monotonic()
+        waited = await queued
+        return waited, time.monotonic() - started
+
+    waited, elapsed = asyncio.run(scenario())
+    assert elapsed >= 0.18
+    assert waited >= 0.2
+
+
+def test_exhausted_budget_blocks_until_the_reset():
+    bucket = TokenBucket(rate=100.0, capacity=100.0)
+    bucket.update(limit=10, remaining=0, reset_after=0.1)
+    assert bucket.rate == pytest.approx(10 / 1.0)
+    assert bucket.capacity == 10
+    assert bucket.reserve() >= 0.1
+    assert bucket.blocked_for() == pytest.approx(0.1, abs=0.02)
+
+
+def test_limiter_waits_for_the_slower_of_key_and_family_buckets():
+    limiter = RateLimiter(key_limit=(100, 1.0), family_limits={"/ver1/bots": (1, 0.1)})
+    assert limiter._reserve("key", "/ver1/bots/1/show") == 0.0
+    assert limiter._reserve("key", "/ver1/bots/2/show") == pytest.approx(0.1, abs=0.01)
+    # Another family of the same key and the same family of another key are unaffected
+    assert limiter._reserve("key", "/ver1/accounts") == 0.0
+    assert limiter._reserve("other", "/ver1/bots/1/show") == 0.0
+
+
+def test_retry_after_header_penalizes_the_family():
+    limiter = RateLimiter()
+    limiter.update_from_headers("key", "/ver1/deals/1/show", {"Retry-After": "0.3"})
+    started = time.monotonic()
+    waited = limiter.acquire("key", "/ver1/deals")
+    assert waited >= 0.3
+    assert time.monotonic() - started >= 0.28
+    assert limiter.acquire("key", "/ver1/bots") == 0.0
+
+
+def test_rate_limit_headers_replace_the_configured_budget():
+    limiter = RateLimiter()
+    limiter.update_from_headers("key", "/ver1/bots", {"X-RateLimit-Limit": "30", "X-RateLimit-Remaining": "5"})
+    stats = limiter.stats()[f"/ver1/bots@{key_id('key')}"]
+    assert stats["capacity"] == 30
+    assert stats["rate"] == pytest.approx(30 / 60)
+    assert stats["tokens"] == pytest.approx(5, abs=0.01)
+
+
+def test_stats_do_not_expose_the_api_key():
+    limiter = RateLimiter()
+    limiter.acquire("abcdef-secret-key", "/ver1/bots")
+    assert not any("abcdef" in name for name in limiter.stats())
+    assert key_id("abcdef-secret-key") != key_id("abcdef-other-key")
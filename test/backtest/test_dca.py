@@ -0,0 +1,113 @@
+import math
+
+import numpy as np
+import pytest
+
+from bot.backtest.dca import DCAConfig, simulate_dca
+
+
+def random_bars(seed, n=3000):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n)))
+    open_ = np.concatenate(([100.0], close[:-1]))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0.0, 0.003, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0.0, 0.003, n)))
+    return np.arange(n) * 60.0, high, low, close
+
+
+def naive_dca(config, high, low, close, entries=None):
+    """Bar-by-bar reference: one deal at a time, filling safety orders one price level at a time"""
+    deviations = np.cumsum([
+        config.safety_order_step_percentage / 100.0 * config.martingale_step_coefficient ** k
+        for k in range(config.max_safety_orders)
+    ])
+    volumes = [config.safety_order_volume * config.martingale_volume_coefficient ** k
+               for k in range(config.max_safety_orders)]
+    fee, n = config.fee, len(close)
+    deals = wins = max_filled = 0
+    pnl = 0.0
+
+    start = 0
+    while start < n:
+        if entries is not None:
+            later = [i for i in range(start, n) if entries[i]]
+            if not later:
+                break
+            start = later[0]
+        entry = close[start]
+        qty, cost, filled = config.base_order_volume / entry, config.base_order_volume, 0
+        exit_bar = None
+        for bar in range(start + 1, n):
+            while filled < len(volumes) and low[bar] <= entry * (1 - deviations[filled]):
+                qty += volumes[filled] / (entry * (1 - deviations[filled]))
+                cost += volumes[filled]
+                filled += 1
+            average = cost / qty
+            stop = average * (1 - config.stop_loss_percentage / 100.0) if config.stop_loss_percentage else -math.inf
+            target = average * (1 + config.take_profit / 100.0)
+            if low[bar] <= stop:
+                price = stop
+            elif high[bar] >= target:
+                price = target
+            else:
+                continue
+            deal_pnl = qty * price * (1 - fee) - cost * (1 + fee)
+            pnl += deal_pnl
+            deals += 1
+            wins += deal_pnl > 0
+            exit_bar = bar
+            break
+        max_filled = max(max_filled, filled)
+        if exit_bar is None or exit_bar >= n - 1:
+            break
+        start = exit_bar
+    return deals, wins, pnl, max_filled
+
+
+CONFIGS = [
+    dict(base_order_volume=10, safety_order_volume=10, max_safety_orders=5, safety_order_step_percentage=1.0,
+         martingale_volume_coefficient=1.5, martingale_step_coefficient=1.2, take_profit=1.5),
+    dict(base_order_volume=20, safety_order_volume=15, max_safety_orders=3, safety_order_step_percentage=2.0,
+         take_profit=3.0, stop_loss_percentage=4.0),
+    dict(base_order_volume=10, safety_order_volume=40, max_safety_orders=8, safety_order_step_percentage=0.5,
+         martingale_volume_coefficient=1.1, take_profit=0.8, stop_loss_percentage=6.0, fee=0.0),
+]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("params", CONFIGS)
+def test_simulate_dca_matches_the_bar_by_bar_reference(params, seed):
+    config = DCAConfig(**params)
+    timestamps, high, low, close = random_bars(seed)
+    result = simulate_dca(config, timestamps, high, low, close)
+    deals, wins, pnl, max_filled = naive_dca(config, high, low, close)
+
+    assert result.deals == deals > 0
+    assert result.wins == wins
+    assert result.pnl == pytest.approx(pnl, rel=1e-9, abs=1e-9)
+    assert result.max_safety_orders_used == max_filled
+    assert result.required_capital == pytest.approx(config.base_order_volume + config.safety_orders()[1].sum())
+
+
+def test_simulate_dca_only_opens_deals_on_entry_signals():
+    config = DCAConfig(**CONFIGS[1])
+    timestamps, high, low, close = random_bars(7)
+    entries = np.random.default_rng(7).random(len(close)) < 0.01
+    result = simulate_dca(config, timestamps, high, low, close, entries)
+    deals, wins, pnl, _ = naive_dca(config, high, low, close, entries)
+
+    assert (result.deals, result.wins) == (deals, wins)
+    assert result.pnl == pytest.approx(pnl, rel=1e-9, abs=1e-9)
+
+
+def test_long_deals_cross_scan_chunk_boundaries():
+    # A slow grind down and back up keeps one deal open for thousands of bars
+    close = np.concatenate((np.linspace(100, 93, 2000), np.linspace(93, 100, 2000)))
+    high, low = close * 1.0005, close * 0.9995
+    config = DCAConfig(**CONFIGS[0])
+    result = simulate_dca(config, np.arange(len(close)) * 60.0, high, low, close)
+    deals, wins, pnl, max_filled = naive_dca(config, high, low, close)
+
+    assert result.max_deal_duration > 64 * 60
+    assert (result.deals, result.wins, result.max_safety_orders_used) == (deals, wins, max_filled)
+    assert result.pnl == pytest.approx(pnl, rel=1e-9)
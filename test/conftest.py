@@ -0,0 +1,5 @@
+import os
+
+# bot.config refuses to import without credentials; the tests never reach 3Commas
+os.environ.setdefault("THREE_COMMAS_API_KEY", "test-key")
+os.environ.setdefault("THREE_COMMAS_API_SECRET", "test-secret")
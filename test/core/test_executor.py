@@ -0,0 +1,237 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from bot.api_client.client import UnconfirmedRequestError
+from bot.core.executor import CANCELLED, DONE, FAILED, IN_FLIGHT, PENDING, OrderExecutor
+
+
+class FakeClient:
+    """Records every request; requests wait on `gate` while it is cleared"""
+
+    def __init__(self):
+        self.calls = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.next_id = 100
+        self.failures = []  # exceptions raised by the next requests, in order
+        self.deals = []     # what the deal list returns
+
+    async def get(self, endpoint, params):
+        self.calls.append(("GET", endpoint, params))
+        return self.deals
+
+    async def _send(self, method, endpoint, payload):
+        self.calls.append((method, endpoint, payload))
+        await self.gate.wait()
+        if self.failures:
+            raise self.failures.pop(0)
+        self.next_id += 1
+        return {"id": self.next_id}
+
+    async def post(self, endpoint, payload):
+        return await self._send("POST", endpoint, payload)
+
+    async def patch(self, endpoint, payload):
+        return await self._send("PATCH", endpoint, payload)
+
+
+def test_duplicate_submit_while_in_flight_is_collapsed():
+    async def scenario():
+        client = FakeClient()
+        client.gate.clear()
+        executor = OrderExecutor(client)
+        first = executor.submit("start_deal", 1, bot_id=42, pair="USDT_BTC")
+        second = executor.submit("start_deal", 1, bot_id=42, pair="USDT_BTC")
+        other = executor.submit("start_deal", 1, bot_id=42, pair="USDT_ETH")
+        client.gate.set()
+        await executor.drain()
+        return client, executor, first, second, other
+
+    client, executor, first, second, other = asyncio.run(scenario())
+    assert second is first
+    assert other is not first
+    assert len(client.calls) == 2
+    assert executor.counters["deduplicated"] == 1
+    assert first.state == DONE and other.state == DONE
+
+
+def test_implicit_key_is_reused_after_the_dedup_window():
+    async def scenario():
+        client = FakeClient()
+        executor = OrderExecutor(client, dedup_window=0.0)
+        first = executor.submit("enable_bot", 1, bot_id=42)
+        await executor.drain()
+        second = executor.submit("enable_bot", 1, bot_id=42)
+        await executor.drain()
+        return client, first, second
+
+    client, first, second = asyncio.run(scenario())
+    assert second is not first
+    assert second.key == first.key
+    assert len(client.calls) == 2
+
+
+def test_explicit_key_runs_at_most_once():
+    async def scenario():
+        client = FakeClient()
+        executor = OrderExecutor(client, dedup_window=0.0)
+        first = executor.submit("enable_bot", 1, bot_id=42, idempotency_key="signal-1")
+        await executor.drain()
+        second = executor.submit("enable_bot", 1, bot_id=42, idempotency_key="signal-1")
+        await executor.drain()
+        return client, first, second
+
+    client, first, second = asyncio.run(scenario())
+    assert second is first
+    assert len(client.calls) == 1
+
+
+def test_cancel_drops_an_order_waiting_for_its_account_slot():
+    async def scenario():
+        client = FakeClient()
+        client.gate.clear()
+        executor = OrderExecutor(client, max_per_account=1)
+        sent = executor.submit("enable_bot", 1, bot_id=1)
+        queued = executor.submit("enable_bot", 1, bot_id=2)
+        await asyncio.sleep(0)
+        states = (sent.state, queued.state)
+        cancelled = executor.cancel(queued.key), executor.cancel(sent.key)
+        client.gate.set()
+        await executor.drain()
+        return client, executor, sent, queued, states, cancelled
+
+    client, executor, sent, queued, states, cancelled = asyncio.run(scenario())
+    assert states == (IN_FLIGHT, PENDING)
+    assert cancelled == (True, False)
+    assert queued.state == CANCELLED
+    assert sent.state == DONE
+    assert [endpoint for _, endpoint, _ in client.calls] == ["/ver1/bots/1/enable"]
+    assert executor.counters["cancelled"] == 1
+
+
+def test_replace_undoes_a_sent_order_and_submits_under_a_new_key():
+    async def scenario():
+        client = FakeClient()
+        executor = OrderExecutor(client)
+        old = executor.submit("start_deal", 1, bot_id=42, pair="USDT_BTC")
+        await executor.drain()
+        new = await executor.replace(old.key, pair="USDT_ETH")
+        await executor.drain()
+        return client, executor, old, new
+
+    client, executor, old, new = asyncio.run(scenario())
+    assert [endpoint for _, endpoint, _ in client.calls] == [
+        "/ver1/bots/42/start_new_deal",
+        f"/ver1/deals/{old.result['id']}/cancel",
+        "/ver1/bots/42/start_new_deal",
+    ]
+    assert client.calls[-1][2]["pair"] == "USDT_ETH"
+    assert new.key != old.key
+    assert old.replaced_by == new.key
+    assert new.state == DONE
+    assert executor.counters["replaced"] == 1
+
+
+def test_replace_of_a_pending_order_only_cancels_it():
+    async def scenario():
+        client = FakeClient()
+        client.gate.clear()
+        executor = OrderExecutor(client, max_per_account=1)
+        executor.submit("enable_bot", 1, bot_id=1)
+        pending = executor.submit("start_deal", 1, bot_id=2)
+        await asyncio.sleep(0)
+        replacing = asyncio.create_task(executor.replace(pending.key, bot_id=3))
+        await asyncio.sleep(0)
+        client.gate.set()
+        new = await replacing
+        await executor.drain()
+        return client, pending, new
+
+    client, pending, new = asyncio.run(scenario())
+    assert pending.state == CANCELLED
+    assert new.state == DONE
+    assert [endpoint for _, endpoint, _ in client.calls] == [
+        "/ver1/bots/1/enable",
+        "/ver1/bots/3/start_new_deal",
+    ]
+
+
+def test_replace_refuses_to_reuse_the_old_key():
+    async def scenario():
+        executor = OrderExecutor(FakeClient())
+        old = executor.submit("enable_bot", 1, bot_id=1, idempotency_key="k")
+        await executor.drain()
+        with pytest.raises(ValueError):
+            await executor.replace(old.key, idempotency_key="k")
+
+    asyncio.run(scenario())
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def test_resubmitting_an_unconfirmed_start_deal_adopts_the_deal_it_opened():
+    async def scenario():
+        client = FakeClient()
+        client.failures.append(UnconfirmedRequestError("timed out", status_code=504))
+        executor = OrderExecutor(client)
+        first = executor.submit("start_deal", 1, bot_id=42, pair="USDT_BTC", idempotency_key="signal-1")
+        await executor.drain()
+        client.deals = [
+            {"id": 7, "bot_id": 42, "pair": "USDT_ETH", "created_at": now_iso()},
+            {"id": 8, "bot_id": 42, "pair": "USDT_BTC", "created_at": now_iso()},
+        ]
+        second = executor.submit("start_deal", 1, bot_id=42, pair="USDT_BTC", idempotency_key="signal-1")
+        await executor.drain()
+        return client, executor, first, second
+
+    client, executor, first, second = asyncio.run(scenario())
+    assert first.state == FAILED and first.unconfirmed
+    assert second.state == DONE
+    assert second.result["id"] == 8
+    assert [method for method, _, _ in client.calls] == ["POST", "GET"]
+    assert executor.counters["reconciled"] == 1
+
+
+def test_resubmitting_sends_again_when_no_deal_was_opened():
+    async def scenario():
+        client = FakeClient()
+        client.failures.append(UnconfirmedRequestError("timed out", status_code=504))
+        executor = OrderExecutor(client)
+        executor.submit("start_deal", 1, bot_id=42, pair="USDT_BTC", idempotency_key="signal-1")
+        await executor.drain()
+        client.deals = [{"id": 3, "bot_id": 42, "pair": "USDT_BTC", "created_at": "2020-01-01T00:00:00.000Z"}]
+        second = executor.submit("start_deal", 1, bot_id=42, pair="USDT_BTC", idempotency_key="signal-1")
+        await executor.drain()
+        return client, second
+
+    client, second = asyncio.run(scenario())
+    assert [method for method, _, _ in client.calls] == ["POST", "GET", "POST"]
+    assert second.state == DONE and second.result["id"] == 101
+
+
+def test_a_rejected_start_deal_is_resent_without_a_lookup():
+    async def scenario():
+        client = FakeClient()
+        client.failures.append(UnconfirmedRequestError("bot is disabled", status_code=422))
+        executor = OrderExecutor(client)
+        first = executor.submit("start_deal", 1, bot_id=42, idempotency_key="signal-1")
+        await executor.drain()
+        executor.submit("start_deal", 1, bot_id=42, idempotency_key="signal-1")
+        await executor.drain()
+        return client, first
+
+    client, first = asyncio.run(scenario())
+    assert not first.unconfirmed
+    assert [method for method, _, _ in client.calls] == ["POST", "POST"]
+
+
+def test_actions_need_their_target_id():
+    executor = OrderExecutor(FakeClient())
+    with pytest.raises(ValueError):
+        executor.submit("start_deal", 1, deal_id=5)
+    with pytest.raises(ValueError):
+        executor.submit("cancel_deal", 1, bot_id=42)
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from bot.core.scheduler import CronTrigger, IntervalTrigger, Scheduler
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+def test_cron_fields_parse_lists_ranges_and_steps():
+    trigger = CronTrigger("*/15 9-17 1,15 * 1-5")
+    assert trigger.minutes == {0, 15, 30, 45}
+    assert trigger.hours == set(range(9, 18))
+    assert trigger.days == {1, 15}
+    assert trigger.months == set(range(1, 13))
+    assert trigger.weekdays == {1, 2, 3, 4, 5}
+    assert CronTrigger("0 0 * * 7").weekdays == {0}
+    assert CronTrigger("@daily").hours == {0}
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "5-1 * * * *"])
+def test_cron_rejects_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronTrigger(expression)
+
+
+def test_cron_next_fire():
+    saturday_noon = utc(2024, 1, 6, 12, 0)
+    assert CronTrigger("*/15 9-17 * * 1-5").next_fire(None, saturday_noon) == utc(2024, 1, 8, 9, 0)
+    assert CronTrigger("@hourly").next_fire(utc(2024, 1, 6, 12, 0, 30), 0) == utc(2024, 1, 6, 13, 0)
+    assert CronTrigger("0 0 1 * *").next_fire(utc(2024, 1, 31, 23, 59), 0) == utc(2024, 2, 1)
+    assert CronTrigger("0 12 29 2 *").next_fire(utc(2024, 3, 1), 0) == utc(2028, 2, 29, 12, 0)
+
+
+def test_cron_matches_either_restricted_day_field():
+    # The 13th of the month or any Friday
+    trigger = CronTrigger("0 0 13 * 5")
+    assert trigger.next_fire(utc(2024, 9, 1), 0) == utc(2024, 9, 6)      # Friday the 6th
+    assert trigger.next_fire(utc(2024, 9, 10), 0) == utc(2024, 9, 13)    # Friday the 13th
+    assert trigger.next_fire(utc(2024, 10, 11, 1), 0) == utc(2024, 10, 13)  # a Sunday
+
+
+def run_for(scheduler, seconds):
+    async def scenario():
+        runner = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(seconds)
+        scheduler.stop()
+        await runner
+
+    asyncio.run(scenario())
+
+
+def test_late_fire_times_are_counted_as_missed_not_replayed():
+    runs = []
+
+    async def job():
+        runs.append(time.time())
+
+    scheduler = Scheduler()
+    # The first fire time is 10.5s ago; the ones it slept through are dropped
+    job_ = scheduler.add_job(job, IntervalTrigger(1.0, start=time.time() - 10.5), name="late", misfire_grace=1.0)
+    run_for(scheduler, 0.1)
+
+    assert len(runs) == 1
+    assert job_.missed == 9
+    assert job_.next_run > time.time()
+
+
+def test_a_running_job_skips_its_next_fire_time():
+    active = peak = 0
+
+    async def slow():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.12)
+        active -= 1
+
+    scheduler = Scheduler()
+    job = scheduler.every(0.05, slow, misfire_grace=1.0)
+    run_for(scheduler, 0.4)
+
+    assert peak == 1
+    assert job.runs >= 2
+    assert job.overlapped >= 2
+
+
+def test_stop_cancels_and_awaits_running_jobs():
+    cancelled = []
+
+    async def forever():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    scheduler = Scheduler()
+    job = scheduler.at(time.time(), forever)
+    run_for(scheduler, 0.05)
+
+    assert cancelled == [True]
+    assert not job.running
+    assert job.next_run is None
+
+
+def test_failures_are_recorded_and_the_job_keeps_its_schedule():
+    def broken():
+        raise RuntimeError("boom")
+
+    scheduler = Scheduler()
+    job = scheduler.every(0.03, broken)
+    run_for(scheduler, 0.2)
+
+    assert job.failures == job.runs >= 2
+    assert job.last_error == "boom"
+
+
+def test_lateness_is_measured_from_the_jittered_fire_time():
+    async def noop():
+        pass
+
+    scheduler = Scheduler()
+    job = scheduler.every(0.05, noop, jitter=0.3, misfire_grace=1.0)
+    run_for(scheduler, 0.8)
+
+    assert job.runs >= 2
+    assert job.lateness.max < 0.05
+
+
+def test_a_job_cancelled_before_it_starts_is_not_left_running():
+    async def scenario():
+        scheduler = Scheduler()
+        job = scheduler.at(time.time() + 60, lambda: None)
+        scheduler._dispatch(job, time.time(), time.time())
+        (task,) = scheduler._running
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return scheduler, job
+
+    scheduler, job = asyncio.run(scenario())
+    assert not job.running
+    assert job.runs == 0
+    assert not scheduler._running
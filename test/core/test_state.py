@@ -0,0 +1,92 @@
+import pytest
+
+from bot.core.state import StateStore
+
+
+def deal(id, account_id=1, bot_id=10, pair="USDT_BTC", **fields):
+    return {"id": id, "account_id": account_id, "bot_id": bot_id, "pair": pair, **fields}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with StateStore(str(tmp_path / "state.db")) as store:
+        yield store
+
+
+def test_upsert_and_indexed_queries(store):
+    store.upsert_many("deals", [deal(1), deal(2, pair="USDT_ETH"), deal(3, account_id=2)])
+    store.upsert("deals", deal(2, pair="USDT_BTC", finished=True))
+
+    assert {d.id for d in store.query("deals", pair="USDT_BTC")} == {1, 2, 3}
+    assert {d.id for d in store.query("deals", account_id=1, pair="USDT_BTC")} == {1, 2}
+    assert store.query("deals", pair="USDT_ETH") == []
+    with pytest.raises(ValueError):
+        store.query("deals", status="created")
+
+
+def test_failed_batch_rolls_back_disk_and_memory(store):
+    store.upsert("deals", deal(1))
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.upsert("deals", deal(2))
+            store.delete("deals", 1)
+            raise RuntimeError("sync failed half way")
+
+    assert [d.id for d in store.all("deals")] == [1]
+    assert store.query("deals", bot_id=10)[0].id == 1
+    store.load()
+    assert [d.id for d in store.all("deals")] == [1]
+
+
+def test_nested_batches_join_the_outer_transaction(store):
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            with store.batch():
+                store.upsert("deals", deal(1))
+            raise RuntimeError("outer failed")
+    assert store.all("deals") == []
+
+
+def test_replace_all_only_touches_its_scope(store):
+    store.upsert_many("deals", [deal(1), deal(2), deal(3, account_id=2)])
+    kept = store.replace_all("deals", [deal(2, status="completed"), deal(4)], account_id=1)
+
+    assert [d.id for d in kept] == [2, 4]
+    assert {d.id for d in store.query("deals", account_id=1)} == {2, 4}
+    assert {d.id for d in store.query("deals", account_id=2)} == {3}
+    assert store.get("deals", 2).status == "completed"
+    assert store.get("deals", 1) is None
+
+
+def test_reload_restores_records_and_indexes(tmp_path):
+    path = str(tmp_path / "state.db")
+    with StateStore(path) as store:
+        store.upsert("bots", {"id": 10, "account_id": 1, "pairs": ["USDT_BTC", "USDT_ETH"], "extra": "kept"})
+        store.upsert("deals", deal(1))
+        store.upsert("balances", {"account_id": 1, "currency": "USDT", "amount": 250.0})
+
+    with StateStore(path) as store:
+        assert store.stats() == {"bots": 1, "deals": 1, "trades": 0, "balances": 1}
+        assert [b.id for b in store.query("bots", pair="USDT_ETH")] == [10]
+        assert store.get("bots", 10).extra == "kept"
+        assert store.query("deals", bot_id=10)[0].pair == "USDT_BTC"
+        assert store.balances(1)["USDT"].amount == 250.0
+
+
+def test_snapshot_is_a_readable_copy(store, tmp_path):
+    store.upsert("deals", deal(1))
+    copy_path = str(tmp_path / "copy.db")
+    store.snapshot(copy_path)
+    with StateStore(copy_path) as copy:
+        assert [d.id for d in copy.all("deals")] == [1]
+
+
+def test_api_shaped_records(store):
+    store.upsert("deals", deal(1, **{"finished?": True}))
+    store.upsert("trades", {"id": 987654321, "account_id": 1, "pair": "USDT_BTC", "side": "buy",
+                            "price": 60000.0, "amount": 0.01})
+    store.load()
+
+    assert store.get("deals", 1).finished
+    assert store.active_deals() == []
+    assert store.get("trades", 987654321).id == 987654321
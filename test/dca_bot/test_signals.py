@@ -0,0 +1,38 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from bot.dca_bot import signals
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(signals, "SIGNAL_SECRETS", ["s3cret"])
+    monkeypatch.setattr(signals, "SIGNAL_MAX_LAG", 60.0)
+    monkeypatch.setattr(signals, "signal_bus", signals.SignalBus(dedup_window=60.0))
+    app = FastAPI()
+    app.include_router(signals.router)
+    return TestClient(app)
+
+
+def post(client, age, **fields):
+    body = {"secret": "s3cret", "action": "buy", "pair": "USDT_BTC", "timestamp": time.time() - age, **fields}
+    return client.post("/signals", json=body)
+
+
+def test_signals_older_than_the_configured_lag_are_refused(client):
+    assert post(client, 10).status_code == 202
+    assert post(client, 120).status_code == 422
+
+
+def test_the_sender_can_only_tighten_the_lag(client):
+    assert post(client, 120, max_lag=3600).status_code == 422
+    assert post(client, 10, max_lag=5).status_code == 422
+    assert post(client, 10, max_lag=0).status_code == 422
+    assert post(client, 2, max_lag=5).status_code == 202
+
+
+def test_wrong_secret_is_refused(client):
+    assert post(client, 0, secret="guess").status_code == 403
@@ -0,0 +1,44 @@
+import asyncio
+
+from bot.exchange.market_data import CCXTSource
+
+
+def trade(id, timestamp, price=100.0):
+    return {"id": id, "timestamp": timestamp, "price": price, "amount": 1.0, "side": "buy"}
+
+
+class PollingExchange:
+    """REST-only exchange whose fetch_trades returns overlapping windows like a real `since` poll"""
+
+    has = {}
+
+    def __init__(self, trades):
+        self.trades = trades
+        self.since = []
+
+    async def fetch_trades(self, symbol, since=None):
+        self.since.append(since)
+        return [t for t in self.trades if since is None or t["timestamp"] >= since]
+
+
+def test_polled_trades_are_published_once():
+    exchange = PollingExchange([trade("a", 1000), trade("b", 2000), trade("c", 2000)])
+    source = CCXTSource("test", ["BTC/USDT"], channels=("trades",), poll_interval=0)
+
+    async def scenario():
+        queue = asyncio.Queue()
+        task = asyncio.create_task(source._channel(exchange, "trades", "BTC/USDT", queue))
+        first = await queue.get()
+        exchange.trades += [trade("d", 2000), trade("e", 3000)]
+        second = await queue.get()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return first, second, queue.qsize()
+
+    first, second, left = asyncio.run(scenario())
+    assert [t["id"] for t in first.data] == ["a", "b", "c"]
+    assert [t["id"] for t in second.data] == ["d", "e"]
+    assert left == 0
+    assert exchange.since[:2] == [None, 2000]
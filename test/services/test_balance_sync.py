@@ -0,0 +1,41 @@
+import threading
+import time
+
+from bot.services.balance_sync import DAY, BalanceChartSync
+
+
+class ChartService:
+    """Stands in for AccountsService; every call takes a while so readers overlap"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_account_balance_chart_data(self, account_id, date_from=None, date_to=None):
+        self.calls.append((account_id, date_from))
+        time.sleep(0.05)
+        return [{"date": "2024-01-01", "usd": "100.5"}, {"date": "2024-01-02", "usd": "101"}]
+
+
+def test_concurrent_readers_of_a_stale_account_share_one_sync(tmp_path):
+    service = ChartService()
+    sync = BalanceChartSync(service, tmp_path)
+    readers = [threading.Thread(target=sync.columns, args=(1,)) for _ in range(5)]
+    for thread in readers:
+        thread.start()
+    for thread in readers:
+        thread.join(5)
+
+    assert len(service.calls) == 1
+    assert sync.get_account_balance_chart_data(1) == [
+        {"date": 1704067200, "usd": 100.5}, {"date": 1704067200 + DAY, "usd": 101.0},
+    ]
+
+
+def test_a_stale_account_only_fetches_the_tail(tmp_path):
+    service = ChartService()
+    BalanceChartSync(service, tmp_path).sync(1)
+    reloaded = BalanceChartSync(service, tmp_path, max_age=0.0)
+    reloaded.ensure_fresh(1)
+
+    assert [date_from for _, date_from in service.calls] == ["2023-01-01", "2024-01-01"]
+    assert len(reloaded.columns(1)["date"]) == 2
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from bot.backtest.grid import GridConfig, ohlc_path, simulate_grid
+from bot.strategies.grid import GridEngine, grid_levels, level_crossings
+
+
+def random_ticks(seed, n=5000, start=100.0, volatility=0.004):
+    rng = np.random.default_rng(seed)
+    return start * np.exp(np.cumsum(rng.normal(0.0, volatility, n)))
+
+
+def naive_grid(engine, prices):
+    """Tick-by-tick reference: every cell buys at its lower line and sells one line up"""
+    levels, fee = engine.levels, engine.fee
+    qty = engine.quantities()
+    start = prices[0]
+    holding = levels[1:] > start
+    held_at = np.full(len(qty), start)
+    buy_fees = float((qty[holding] * start).sum() * fee)
+    profit, sells = 0.0, 0
+    for previous, price in zip(prices[:-1], prices[1:]):
+        for cell in range(len(qty)):
+            low, high = levels[cell], levels[cell + 1]
+            if holding[cell] and previous <= high < price:
+                profit += qty[cell] * (high * (1 - fee) - held_at[cell])
+                holding[cell] = False
+                sells += 1
+            elif not holding[cell] and previous > low >= price:
+                buy_fees += qty[cell] * low * fee
+                held_at[cell] = low
+                holding[cell] = True
+    unrealized = float((qty[holding] * (prices[-1] * (1 - fee) - held_at[holding])).sum())
+    return sells, profit - buy_fees, unrealized, holding
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("grid", [
+    dict(lower_price=90, upper_price=110, grids_quantity=21, quantity_per_grid=0.5),
+    dict(lower_price=80, upper_price=125, grids_quantity=15, quantity_per_grid=50, grid_type="geometric",
+         order_currency_type="quote"),
+    dict(lower_price=98, upper_price=102, grids_quantity=5, quantity_per_grid=1, fee=0.0),
+])
+def test_simulate_matches_the_tick_by_tick_reference(grid, seed):
+    engine = GridEngine(**grid)
+    prices = random_ticks(seed)
+    result = engine.simulate(prices)
+    sells, realized, unrealized, holding = naive_grid(engine, prices)
+
+    assert result.round_trips == sells > 0
+    assert result.realized_pnl == pytest.approx(realized, rel=1e-9, abs=1e-9)
+    assert result.unrealized_pnl == pytest.approx(unrealized, rel=1e-9, abs=1e-9)
+    assert result.holding.tolist() == holding.tolist()
+    assert result.shifts == 0
+
+
+def test_prices_on_a_line_count_as_below_it():
+    engine = GridEngine(lower_price=100, upper_price=102, grids_quantity=3, quantity_per_grid=1, fee=0.0)
+    touched = engine.simulate(np.array([101.5, 102.0, 101.5]))
+    crossed = engine.simulate(np.array([101.5, 102.0, 102.5]))
+    assert touched.round_trips == 0
+    assert crossed.round_trips == 1
+    assert crossed.fills.tick[-1] == 2
+
+
+def test_level_crossings_of_a_gap_move():
+    levels = np.array([1.0, 2.0, 3.0, 4.0])
+    line, direction, tick = level_crossings(levels, np.array([0.5, 3.5, 1.5]))
+    assert line.tolist() == [0, 1, 2, 2, 1]
+    assert direction.tolist() == [1, 1, 1, -1, -1]
+    assert tick.tolist() == [1, 1, 1, 2, 2]
+
+
+def test_grid_levels():
+    assert grid_levels(100, 200, 5).tolist() == [100, 125, 150, 175, 200]
+    assert grid_levels(100, 400, 3, "geometric") == pytest.approx([100, 200, 400])
+    with pytest.raises(ValueError):
+        grid_levels(200, 100, 5)
+
+
+def test_required_balances_split_at_the_start_price():
+    engine = GridEngine(lower_price=100, upper_price=140, grids_quantity=5, quantity_per_grid=2)
+    balances = engine.required_balances(115)
+    assert balances["base_amount"] == 6      # cells 110-120, 120-130, 130-140 hold base
+    assert balances["quote_amount"] == 200   # one buy at 100
+    assert balances["total_quote"] == 200 + 6 * 115
+
+
+def test_simulate_grid_over_ohlc_bars():
+    rng = np.random.default_rng(4)
+    close = random_ticks(4, n=500)
+    open_ = np.concatenate(([100.0], close[:-1]))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.002, 500)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.002, 500)))
+    config = GridConfig(lower_price=90, upper_price=110, grids_quantity=11, quantity_per_grid=1)
+    path = ohlc_path(open_, high, low, close)
+    result = simulate_grid(config, path)
+    sells, realized, unrealized, _ = naive_grid(config.engine(), path)
+
+    assert len(path) == 4 * len(close)
+    assert result.round_trips == sells
+    assert result.pnl == pytest.approx(realized, rel=1e-9, abs=1e-9)
+    assert result.unrealized_pnl == pytest.approx(unrealized, rel=1e-9, abs=1e-9)
+    assert 0.0 < result.time_in_range <= 1.0
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bot.core.engine import MarketEvent
+from bot.strategies.indicators import IndicatorBank, compute_indicators
+from bot.strategies.scalping import RSIEMAScalpingStrategy
+
+INDICATORS = ["rsi", "ema", "atr", "bb_middle", "bb_upper", "bb_lower", "vwap"]
+
+
+def random_ohlcv(seed, n=600):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    high = close * (1 + np.abs(rng.normal(0.0, 0.004, n)))
+    low = close * (1 - np.abs(rng.normal(0.0, 0.004, n)))
+    volume = rng.uniform(1.0, 50.0, n)
+    return pd.DataFrame({"close": close, "high": high, "low": low, "volume": volume})
+
+
+def test_incremental_indicators_match_ta():
+    frames = [random_ohlcv(seed) for seed in range(4)]
+    bank = IndicatorBank(len(frames))
+    streamed = {name: np.full((len(frames[0]), len(frames)), np.nan) for name in INDICATORS}
+    for t in range(len(frames[0])):
+        rows = [frame.iloc[t] for frame in frames]
+        bank.update(
+            [row["close"] for row in rows], [row["high"] for row in rows],
+            [row["low"] for row in rows], [row["volume"] for row in rows],
+        )
+        for name in INDICATORS:
+            streamed[name][t] = getattr(bank, name)
+
+    for pair, frame in enumerate(frames):
+        expected = compute_indicators(frame)
+        for name in INDICATORS:
+            np.testing.assert_allclose(streamed[name][:, pair], expected[name], rtol=1e-9, atol=1e-9, err_msg=name)
+
+
+def test_tick_by_tick_signals_match_the_batch_evaluation():
+    frames = {f"PAIR{seed}/USDT": random_ohlcv(seed, n=1500)[["close"]] for seed in range(3)}
+    strategy = RSIEMAScalpingStrategy(frames, options={"rsi_buy_threshold": 48, "rsi_sell_threshold": 52})
+    closes = np.column_stack([frame["close"].to_numpy() for frame in frames.values()])
+    streamed = np.array([strategy.update(prices) for prices in closes])
+
+    for pair, frame in enumerate(frames.values()):
+        batch = strategy.evaluate_batch(frame).to_numpy()
+        assert (streamed[:, pair] == batch).all()
+    assert set(np.unique(streamed)) == {-1, 0, 1}
+
+
+@pytest.mark.parametrize("symbol", ["BTC/USDT", "ETH/USDT"])
+def test_market_events_only_advance_their_own_pair(symbol):
+    strategy = RSIEMAScalpingStrategy(["BTC/USDT", "ETH/USDT"])
+    assert strategy.on_market_event(MarketEvent(symbol, 100.0, 1.0, 0.0, "trade")) == "hold"
+    assert strategy.on_market_event(MarketEvent("SOL/USDT", 100.0, 1.0, 0.0, "trade")) is None
+    index = strategy.symbols.index(symbol)
+    assert strategy.bank.count.tolist() == [int(i == index) for i in range(2)]